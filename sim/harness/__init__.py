@@ -0,0 +1,17 @@
+##
+# @file __init__.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Shared simulation harness for hwdbg testbenches
+#
+# @details The modules of this package are shared between the cocotb
+#          testbenches under 'sim/hwdbg' (the Makefiles export the 'sim'
+#          directory in the PYTHONPATH)
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
@@ -0,0 +1,103 @@
+##
+# @file bram.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Behavioral model of the Block RAM (BRAM) for the communication testbenches
+#
+# @details The model has the same one clock delay as 'InitRegMemFromFile' (when
+#          the block RAM delay is emulated), meaning that the data of the address
+#          presented in a clock cycle is available in the next clock cycle
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import cocotb
+from cocotb.triggers import RisingEdge
+
+from harness import handles
+from harness import packet
+
+
+class BramModel:
+    """Serve the BRAM port (io_rdWrAddr, io_rdData, io_wrEna, io_wrData) of a module"""
+
+    def __init__(self, dut, size_in_words, prefix="io_"):
+        hw = handles.registry(dut)
+
+        self.clock = hw.get("clock")
+        self.rd_wr_addr = hw.get(prefix + "rdWrAddr")
+        self.rd_data = hw.get(prefix + "rdData") if prefix + "rdData" in hw.children() else None
+        self.wr_ena = hw.get(prefix + "wrEna") if prefix + "wrEna" in hw.children() else None
+        self.wr_data = hw.get(prefix + "wrData") if prefix + "wrData" in hw.children() else None
+
+        self.word_size = packet.layout().word_size
+        self.mem = [0] * size_in_words
+        self.cycle = 0
+        self.reads = 0
+        self.writes = []
+        self.out_of_range = []
+        self._task = None
+
+    def load(self, byte_address, words):
+        """Store words into the memory (starting from a byte address)"""
+
+        index = byte_address // self.word_size
+        self.mem[index:index + len(words)] = [word & 0xffffffff for word in words]
+
+    def read_words(self, byte_address, count):
+        """Read words from the memory (starting from a byte address)"""
+
+        index = byte_address // self.word_size
+        return self.mem[index:index + count]
+
+    def start(self):
+        """Start serving the BRAM port"""
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._serve())
+
+    def stop(self):
+        """Stop serving the BRAM port"""
+
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    async def _serve(self):
+        while True:
+
+            #
+            # The values are sampled before the registers of the module are updated
+            #
+            await RisingEdge(self.clock)
+            self.cycle = self.cycle + 1
+
+            address = handles.read_int(self.rd_wr_addr, None)
+            if address is None:
+                continue
+
+            index = address // self.word_size
+
+            #
+            # Accessing beyond the memory (e.g., a packet larger than the BRAM)
+            #
+            if index >= len(self.mem):
+                wrote = self.wr_ena is not None and handles.read_int(self.wr_ena) == 1
+                self.out_of_range.append((self.cycle, address, wrote))
+                if self.rd_data is not None:
+                    self.rd_data.value = 0
+                continue
+
+            if self.wr_ena is not None and handles.read_int(self.wr_ena) == 1:
+                data = handles.read_int(self.wr_data)
+                self.writes.append((self.cycle, address, self.mem[index], data))
+                self.mem[index] = data
+
+            if self.rd_data is not None:
+                self.reads = self.reads + 1
+                self.rd_data.value = self.mem[index]
@@ -0,0 +1,280 @@
+##
+# @file capture.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Run-length compressed capture of the output pins
+#
+# @details The output pin bank (io_outputPin_N) is sampled on each rising edge
+#          of the clock as one packed integer (bit N is io_outputPin_N), only the
+#          changes are appended to the capture file as (run length, value)
+#          records. Each INDEX_INTERVAL records, the (cycle, offset, value) of the
+#          record is appended to the index ('<capture>.idx'), so any range of
+#          cycles is read back by seeking to the nearest index entry
+#
+#            pins = capture.start(dut, "pins.cap"); ...; pins.stop()
+#            python3 -m harness.capture pins.cap --start 1000000 --end 1000100
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import sys
+
+from harness import handles
+
+#
+# Header of the capture file (magic, version, number of pins)
+#
+CAPTURE_MAGIC = b"HWDBGCAP"
+CAPTURE_VERSION = 1
+HEADER_FORMAT = "<8sII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+#
+# Entries of the index (cycle of the record, offset of the record, value)
+#
+INDEX_SUFFIX = ".idx"
+INDEX_INTERVAL = 1024
+
+#
+# Size of the buffer of the records before writing them to the file
+#
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def encode_varint(value):
+    encoded = bytearray()
+    while value >= 0x80:
+        encoded.append((value & 0x7f) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset = offset + 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift = shift + 7
+
+
+class CaptureWriter:
+    """Append the changes of a packed value to a capture file and its index"""
+
+    def __init__(self, path, number_of_pins):
+        self.path = path
+        self.number_of_pins = number_of_pins
+        self.value_size = max(1, (number_of_pins + 7) // 8)
+
+        self._file = open(path, "wb")
+        self._index = open(path + INDEX_SUFFIX, "wb")
+        self._file.write(struct.pack(HEADER_FORMAT, CAPTURE_MAGIC, CAPTURE_VERSION, number_of_pins))
+        self._offset = HEADER_SIZE
+        self._buffer = bytearray()
+
+        self.cycle = 0
+        self.records = 0
+        self._value = None
+        self._run_start = 0
+
+        self._index_entry = struct.Struct("<QQ" + str(self.value_size) + "s")
+
+    def sample(self, value):
+        """Add the value of the next cycle"""
+
+        if value != self._value:
+            if self._value is not None:
+                self._append(self._run_start, self.cycle - self._run_start, self._value)
+            self._value = value
+            self._run_start = self.cycle
+
+        self.cycle = self.cycle + 1
+
+    def _append(self, run_start, run_length, value):
+        if self.records % INDEX_INTERVAL == 0:
+            self._index.write(self._index_entry.pack(run_start, self._offset + len(self._buffer),
+                                                     value.to_bytes(self.value_size, "little")))
+
+        self._buffer += encode_varint(run_length)
+        self._buffer += value.to_bytes(self.value_size, "little")
+        self.records = self.records + 1
+
+        if len(self._buffer) >= WRITE_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._offset = self._offset + len(self._buffer)
+        self._buffer = bytearray()
+
+    def close(self):
+        """Write the last run and the end of the capture (the last index entry)"""
+
+        if self._value is not None:
+            self._append(self._run_start, self.cycle - self._run_start, self._value)
+            self._value = None
+
+        self.flush()
+        self._index.write(self._index_entry.pack(self.cycle, self._offset, b"\0" * self.value_size))
+        self._file.close()
+        self._index.close()
+
+
+class CaptureReader:
+    """Read the runs of a capture file (through its index)"""
+
+    def __init__(self, path):
+
+        #
+        # The records are mapped (not read), only the pages of the read ranges are loaded
+        #
+        self._file = open(path, "rb")
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.number_of_pins = struct.unpack_from(HEADER_FORMAT, self.data, 0)
+        if magic != CAPTURE_MAGIC or version != CAPTURE_VERSION:
+            raise ValueError("not a capture file (or a different version): " + path)
+
+        self.value_size = max(1, (self.number_of_pins + 7) // 8)
+        entry = struct.Struct("<QQ" + str(self.value_size) + "s")
+
+        with open(path + INDEX_SUFFIX, "rb") as file:
+            index = file.read()
+
+        entries = [entry.unpack_from(index, offset) for offset in range(0, len(index), entry.size)]
+        if not entries:
+            raise ValueError("the capture is not closed: " + path)
+
+        #
+        # The last entry is the end of the capture
+        #
+        self.end_cycle = entries[-1][0]
+        self.index_cycles = [cycle for cycle, _, _ in entries[:-1]]
+        self.index_offsets = [offset for _, offset, _ in entries[:-1]]
+
+    def runs(self, start=0, end=None):
+        """Yield the runs (first cycle, length, value) that overlap [start, end)"""
+
+        end = self.end_cycle if end is None else min(end, self.end_cycle)
+        position = bisect.bisect_right(self.index_cycles, start) - 1
+
+        if position < 0:
+            return
+
+        cycle = self.index_cycles[position]
+        offset = self.index_offsets[position]
+
+        while cycle < end and offset < len(self.data):
+            run_length, offset = decode_varint(self.data, offset)
+            value = int.from_bytes(self.data[offset:offset + self.value_size], "little")
+            offset = offset + self.value_size
+
+            if cycle + run_length > start:
+                first = max(cycle, start)
+                yield first, min(cycle + run_length, end) - first, value
+
+            cycle = cycle + run_length
+
+    def value_at(self, cycle):
+        """Packed value of the pins at a cycle"""
+
+        for _, _, value in self.runs(cycle, cycle + 1):
+            return value
+        raise IndexError("cycle " + str(cycle) + " is not captured")
+
+    def values(self, start=0, end=None):
+        """Packed values of each cycle of a range"""
+
+        for _, length, value in self.runs(start, end):
+            for _ in range(length):
+                yield value
+
+    def close(self):
+        self.data.close()
+        self._file.close()
+
+
+class PinCapture:
+    """Sample the output pins of a DUT into a capture file on each rising edge"""
+
+    def __init__(self, dut, path, prefix="io_outputPin"):
+        self.dut = dut
+        self.pins = handles.registry(dut).indexed(prefix)
+        self.writer = CaptureWriter(path, len(self.pins))
+        self._task = None
+
+    def pack(self):
+        value = 0
+        for index, pin in enumerate(self.pins):
+            value |= (handles.read_int(pin) & 1) << index
+        return value
+
+    async def _run(self):
+        from cocotb.triggers import RisingEdge
+
+        while True:
+            await RisingEdge(self.dut.clock)
+            self.writer.sample(self.pack())
+
+    def start(self):
+        import cocotb
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stop the sampling and close the capture file"""
+
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+            self.writer.close()
+
+
+def start(dut, path, prefix="io_outputPin"):
+    """Start capturing the output pins"""
+
+    return PinCapture(dut, path, prefix).start()
+
+
+def start_from_environment(dut):
+    """Start capturing the output pins into 'HWDBG_CAPTURE_PINS' (if set)"""
+
+    path = os.environ.get("HWDBG_CAPTURE_PINS")
+    return start(dut, path) if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the runs of a capture of the output pins")
+    parser.add_argument("capture", help="path of the capture file")
+    parser.add_argument("--start", type=int, default=0, help="first cycle")
+    parser.add_argument("--end", type=int, default=None, help="end cycle (exclusive)")
+    args = parser.parse_args()
+
+    reader = CaptureReader(args.capture)
+    digits = (reader.number_of_pins + 3) // 4
+
+    print("[*] %d pins, %d cycles, %d bytes" % (reader.number_of_pins, reader.end_cycle, len(reader.data)))
+    for cycle, length, value in reader.runs(args.start, args.end):
+        print("%12d  +%-10d %0*x" % (cycle, length, digits, value))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
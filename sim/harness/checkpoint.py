@@ -0,0 +1,133 @@
+##
+# @file checkpoint.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Checkpoint and restore of the state of the DUT (e.g., after the reset)
+#
+# @details A checkpoint keeps the values of all of the registers of the design
+#          (state machines, 'stageRegs', the register-array BRAM, ...) and the
+#          driven inputs, so later scenarios of the same simulation restore the
+#          warmed-up state in one bulk deposit instead of resetting the design
+#
+#          Set 'HWDBG_CHECKPOINT=0' to always run the warm-up
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+
+from cocotb.triggers import ReadWrite, Timer
+from cocotb.utils import get_sim_time
+
+from harness import handles
+
+#
+# Checkpoints of the current simulation session (by name)
+#
+_session_checkpoints = {}
+
+
+class Checkpoint:
+    """Values of the registers and the driven inputs of a DUT at a clock phase"""
+
+    def __init__(self, registers, inputs, phase_ns, period_ns):
+        self.registers = registers
+        self.inputs = inputs
+        self.phase_ns = phase_ns
+        self.period_ns = period_ns
+
+    def __len__(self):
+        return len(self.registers) + len(self.inputs)
+
+
+def enabled():
+    """Check whether restoring the checkpoints is enabled"""
+
+    return os.environ.get("HWDBG_CHECKPOINT", "1") != "0"
+
+
+def register_paths(dut):
+    """Dotted paths of the modifiable signals of the design (discovered once)
+
+    The nets are included as well (the handles of cocotb only tell the
+    modifiable signals apart from the constants), they are restored with the
+    values that their drivers produce from the restored registers anyway
+    """
+
+    hw = handles.registry(dut)
+    return [path for path in hw.find("*") if handles.is_modifiable(hw.get(path))]
+
+
+def capture(dut, inputs=(), period_ns=10):
+    """Capture the registers (and the driven top-level inputs) of the DUT
+
+    The values that contain X or Z bits are not captured. The pending writes of
+    the testbench are not visible yet, so 'await ReadWrite()' before capturing
+    right after driving the inputs
+    """
+
+    hw = handles.registry(dut)
+
+    registers = {}
+    for path in register_paths(dut):
+        value = hw.get(path).value
+        if value.is_resolvable:
+            registers[path] = value.integer
+
+    driven = {}
+    for path in inputs:
+        value = hw.get(path).value
+        if value.is_resolvable:
+            driven[path] = value.integer
+
+    return Checkpoint(registers, driven, get_sim_time("ns") % period_ns, period_ns)
+
+
+async def restore(dut, checkpoint):
+    """Restore a checkpoint at the same phase of the clock that it's captured"""
+
+    hw = handles.registry(dut)
+
+    delay = (checkpoint.phase_ns - get_sim_time("ns")) % checkpoint.period_ns
+    if delay != 0:
+        await Timer(delay, units="ns")
+
+    #
+    # All of the values are deposited in the same time step
+    #
+    for path, value in checkpoint.registers.items():
+        hw.get(path).setimmediatevalue(value)
+
+    for path, value in checkpoint.inputs.items():
+        hw.get(path).setimmediatevalue(value)
+
+
+async def warm_start(dut, name, warm_up, inputs=(), period_ns=10):
+    """Run the 'warm_up' coroutine function once per session and restore its result afterwards
+
+    Returns True if the state is restored from a checkpoint
+    """
+
+    key = (id(dut), name)
+    checkpoint = _session_checkpoints.get(key)
+
+    if checkpoint is not None and enabled():
+        await restore(dut, checkpoint)
+        dut._log.info("Restored checkpoint '%s' (%d values)", name, len(checkpoint))
+        return True
+
+    await warm_up()
+
+    #
+    # The writes that the warm-up leaves unawaited (e.g., the release of the
+    # reset) are applied in the ReadWrite phase of the same time step
+    #
+    await ReadWrite()
+
+    _session_checkpoints[key] = capture(dut, inputs, period_ns)
+    return False
@@ -0,0 +1,412 @@
+##
+# @file compile_tb.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Compiled-stimulus mode of DebuggerModuleTestingBRAM (no Python in the per-cycle loop)
+#
+# @details A scenario (a BRAM image, a schedule of the input pins, the cycles of
+#          the requests and the expected latency of the interrupts) is compiled
+#          into a self-contained SystemVerilog testbench around
+#          DebuggerModuleTestingBRAM. The stimulus is loaded by '$readmemh', the
+#          testbench runs at the native speed of the simulator (Icarus) and
+#          writes a results file, which is checked by Python afterwards:
+#
+#            {
+#              "bram_image": "src/test/bram/send_version.hex.txt",
+#              "pins": [[0, "0x0000ffff"], [500, "0x0000aaaa"]],
+#              "requests": [20, 220, 420],
+#              "expected_latency": [1, 150],
+#              "cycles": 1000
+#            }
+#
+#            python3 -m harness.compile_tb scenario.json
+#
+#          The cycles are the rising edges of the clock (the same as the cycle
+#          stamps of the cocotb testbenches), the reset is released after the
+#          cycle 9, so the requests should start after it
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from harness import journal, manifest, regress, runner, traffic
+
+#
+# Names of the testbench, its stimulus files and its results file
+#
+TESTBENCH_MODULE = "DebuggerModuleTestingBRAM_tb"
+TESTBENCH_FILE = TESTBENCH_MODULE + ".sv"
+BRAM_IMAGE_FILE = "bram_image.hex"
+PIN_CYCLES_FILE = "pin_cycles.hex"
+PIN_VALUES_FILE = "pin_values.hex"
+REQUEST_CYCLES_FILE = "request_cycles.hex"
+RESULTS_FILE = "results.txt"
+
+#
+# Default build directory of the compiled testbench
+#
+COMPILE_BUILD_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "compile_build")
+
+#
+# Maximum number of the entries of each schedule (the end is marked by END_OF_SCHEDULE)
+#
+MAXIMUM_SCHEDULE_ENTRIES = 65536
+END_OF_SCHEDULE = 0xffffffff
+
+#
+# Number of the reset cycles (the same as the cocotb testbenches)
+#
+RESET_CYCLES = 10
+
+TESTBENCH_TEMPLATE = """\
+// Generated by harness/compile_tb.py (do not edit)
+`timescale 1ns / 1ps
+
+module @TESTBENCH@;
+
+  localparam NUMBER_OF_PINS = @NUMBER_OF_PINS@;
+  localparam NUMBER_OF_WORDS = @NUMBER_OF_WORDS@;
+  localparam DATA_WIDTH = @DATA_WIDTH@;
+  localparam MAXIMUM_SCHEDULE_ENTRIES = @MAXIMUM_SCHEDULE_ENTRIES@;
+
+  reg clock = 1'b0;
+  reg reset = 1'b1;
+  reg en = 1'b0;
+  reg plInSignal = 1'b0;
+  reg [NUMBER_OF_PINS-1:0] pins = {NUMBER_OF_PINS{1'b0}};
+
+  wire [NUMBER_OF_PINS-1:0] outputPins;
+  wire psOutInterrupt;
+
+  //
+  // Stimulus (loaded by $readmemh)
+  //
+  reg [DATA_WIDTH-1:0] bram_image [0:NUMBER_OF_WORDS-1];
+  reg [31:0] pin_cycles [0:MAXIMUM_SCHEDULE_ENTRIES-1];
+  reg [NUMBER_OF_PINS-1:0] pin_values [0:MAXIMUM_SCHEDULE_ENTRIES-1];
+  reg [31:0] request_cycles [0:MAXIMUM_SCHEDULE_ENTRIES-1];
+
+  integer index;
+  integer pin_index = 0;
+  integer request_index = 0;
+  integer cycle;
+  integer maximum_cycles;
+  integer results;
+  reg last_interrupt = 1'b0;
+  reg [NUMBER_OF_PINS-1:0] last_outputPins;
+
+  DebuggerModuleTestingBRAM dut (
+    .clock(clock),
+    .reset(reset),
+    .io_en(en),
+@PIN_CONNECTIONS@
+    .io_plInSignal(plInSignal),
+    .io_psOutInterrupt(psOutInterrupt)
+  );
+
+  //
+  // The clock starts low, the rising edge of the cycle N is at N * 10 + 5
+  //
+  always #5 clock = ~clock;
+
+  initial begin
+    for (index = 0; index < MAXIMUM_SCHEDULE_ENTRIES; index = index + 1) begin
+      pin_cycles[index] = 32'h@END_OF_SCHEDULE@;
+      request_cycles[index] = 32'h@END_OF_SCHEDULE@;
+    end
+
+    $readmemh("@BRAM_IMAGE_FILE@", bram_image);
+    $readmemh("@PIN_CYCLES_FILE@", pin_cycles);
+    $readmemh("@PIN_VALUES_FILE@", pin_values);
+    $readmemh("@REQUEST_CYCLES_FILE@", request_cycles);
+
+    if (!$value$plusargs("cycles=%d", maximum_cycles))
+      maximum_cycles = 10000;
+
+    results = $fopen("@RESULTS_FILE@", "w");
+
+    repeat (@RESET_CYCLES@) @(negedge clock);
+    reset = 1'b0;
+
+    //
+    // The reset loads the initialization file of the design into the BRAM,
+    // then it's replaced by the image of the scenario
+    //
+@BRAM_LOADS@
+
+    en = 1'b1;
+  end
+
+  //
+  // The inputs of the next rising edge are applied on the falling edge
+  //
+  always @(negedge clock) begin
+    cycle = $time / 10;
+
+    while (pin_cycles[pin_index] <= cycle) begin
+      pins = pin_values[pin_index];
+      pin_index = pin_index + 1;
+    end
+
+    if (request_cycles[request_index] <= cycle) begin
+      plInSignal = 1'b1;
+      $fwrite(results, "REQUEST %0d\\n", cycle);
+      request_index = request_index + 1;
+    end else begin
+      plInSignal = 1'b0;
+    end
+  end
+
+  //
+  // The outputs are sampled on the rising edge (before the registers are updated)
+  //
+  always @(posedge clock) begin
+    cycle = $time / 10;
+
+    if (psOutInterrupt === 1'b1 && last_interrupt !== 1'b1)
+      $fwrite(results, "INTERRUPT %0d\\n", cycle);
+    last_interrupt = psOutInterrupt;
+
+    if (outputPins !== last_outputPins) begin
+      $fwrite(results, "OUTPUT %0d %h\\n", cycle, outputPins);
+      last_outputPins = outputPins;
+    end
+
+    if (cycle >= maximum_cycles) begin
+@BRAM_DUMPS@
+      $fwrite(results, "END %0d\\n", cycle);
+      $fclose(results);
+      $finish;
+    end
+  end
+
+endmodule
+"""
+
+
+def generate_testbench(layout):
+    """Source of the testbench wrapper of the generated design"""
+
+    number_of_pins = layout.configurations["NUMBER_OF_PINS"]
+    number_of_words = layout.memory_size // layout.word_size
+    memory = "dut.dataOut_initRegMemFromFileModule.mem_"
+
+    connections = ["    .io_inputPin_%d(pins[%d])," % (pin, pin) for pin in range(number_of_pins)] + \
+                  ["    .io_outputPin_%d(outputPins[%d])," % (pin, pin) for pin in range(number_of_pins)]
+    loads = ["    %s%d = bram_image[%d];" % (memory, word, word) for word in range(number_of_words)]
+    dumps = ['      $fwrite(results, "BRAM %d %%h\\n", %s%d);' % (word, memory, word) for word in range(number_of_words)]
+
+    replacements = {
+        "@TESTBENCH@": TESTBENCH_MODULE,
+        "@NUMBER_OF_PINS@": str(number_of_pins),
+        "@NUMBER_OF_WORDS@": str(number_of_words),
+        "@DATA_WIDTH@": str(layout.configurations["BLOCK_RAM_DATA_WIDTH"]),
+        "@MAXIMUM_SCHEDULE_ENTRIES@": str(MAXIMUM_SCHEDULE_ENTRIES),
+        "@END_OF_SCHEDULE@": "%08x" % END_OF_SCHEDULE,
+        "@BRAM_IMAGE_FILE@": BRAM_IMAGE_FILE,
+        "@PIN_CYCLES_FILE@": PIN_CYCLES_FILE,
+        "@PIN_VALUES_FILE@": PIN_VALUES_FILE,
+        "@REQUEST_CYCLES_FILE@": REQUEST_CYCLES_FILE,
+        "@RESULTS_FILE@": RESULTS_FILE,
+        "@RESET_CYCLES@": str(RESET_CYCLES),
+        "@PIN_CONNECTIONS@": "\n".join(connections),
+        "@BRAM_LOADS@": "\n".join(loads),
+        "@BRAM_DUMPS@": "\n".join(dumps),
+    }
+
+    source = TESTBENCH_TEMPLATE
+    for token, value in replacements.items():
+        source = source.replace(token, value)
+
+    return source
+
+
+def parse_value(value):
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+
+def write_hex(path, values, digits):
+    with open(path, "w") as file:
+        for value in values:
+            file.write("%0*x\n" % (digits, value))
+
+
+def write_stimulus(scenario, layout, directory):
+    """Write the stimulus files of a scenario (loaded by the testbench)"""
+
+    number_of_words = layout.memory_size // layout.word_size
+    number_of_pins = layout.configurations["NUMBER_OF_PINS"]
+
+    image_path = scenario.get("bram_image")
+    if image_path is None:
+        image = journal.initial_image(layout)
+    else:
+        if not os.path.isabs(image_path):
+            image_path = os.path.join(runner.ROOT_DIRECTORY, image_path)
+        image = journal.read_image(image_path, number_of_words)
+
+    pins = sorted((parse_value(cycle), parse_value(value)) for cycle, value in scenario.get("pins", []))
+    requests = sorted(parse_value(cycle) for cycle in scenario.get("requests", []))
+
+    if len(pins) >= MAXIMUM_SCHEDULE_ENTRIES or len(requests) >= MAXIMUM_SCHEDULE_ENTRIES:
+        raise ValueError("the schedules are limited to %d entries" % (MAXIMUM_SCHEDULE_ENTRIES - 1))
+
+    if requests and requests[0] <= RESET_CYCLES:
+        raise ValueError("the requests should start after the reset (cycle %d)" % RESET_CYCLES)
+
+    write_hex(os.path.join(directory, BRAM_IMAGE_FILE), image, layout.word_size * 2)
+    write_hex(os.path.join(directory, PIN_CYCLES_FILE), [cycle for cycle, _ in pins] + [END_OF_SCHEDULE], 8)
+    write_hex(os.path.join(directory, PIN_VALUES_FILE),
+              [value & ((1 << number_of_pins) - 1) for _, value in pins] + [0], (number_of_pins + 3) // 4)
+    write_hex(os.path.join(directory, REQUEST_CYCLES_FILE), requests + [END_OF_SCHEDULE], 8)
+
+
+def build(layout, generated_directory, directory):
+    """Compile the testbench and the generated design (once per design)"""
+
+    testbench_path = os.path.join(directory, TESTBENCH_FILE)
+    executable = os.path.join(directory, TESTBENCH_MODULE + ".vvp")
+    source = generate_testbench(layout)
+
+    sources = regress.verilog_sources("DebuggerModuleTestingBRAM", generated_directory)
+
+    #
+    # Rebuild only if the testbench or the generated files are changed
+    #
+    if os.path.exists(executable) and os.path.exists(testbench_path):
+        with open(testbench_path, "r") as file:
+            unchanged = file.read() == source
+        if unchanged and all(os.path.getmtime(path) <= os.path.getmtime(executable) for path in sources):
+            return executable
+
+    with open(testbench_path, "w") as file:
+        file.write(source)
+
+    command = ["iverilog", "-g2012", "-s", TESTBENCH_MODULE, "-o", executable, testbench_path] + sources
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    if result.returncode != 0:
+        raise RuntimeError("compiling the testbench failed:\n" + result.stdout.decode(errors="replace"))
+
+    return executable
+
+
+def run(executable, directory, cycles):
+    """Run the compiled testbench, returns the wall time"""
+
+    start = time.monotonic()
+    result = subprocess.run(["vvp", "-n", executable, "+cycles=" + str(cycles)], cwd=directory,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    wall_time = time.monotonic() - start
+
+    with open(os.path.join(directory, "output.log"), "wb") as file:
+        file.write(result.stdout)
+
+    if result.returncode != 0:
+        raise RuntimeError("running the testbench failed, see: " + os.path.join(directory, "output.log"))
+
+    return wall_time
+
+
+def read_results(path):
+    """Read the results file of the testbench"""
+
+    results = {"requests": [], "interrupts": [], "outputs": [], "bram": {}, "end": None}
+
+    with open(path, "r") as file:
+        for line in file:
+            fields = line.split()
+
+            if not fields:
+                continue
+            elif fields[0] == "REQUEST":
+                results["requests"].append(int(fields[1]))
+            elif fields[0] == "INTERRUPT":
+                results["interrupts"].append(int(fields[1]))
+            elif fields[0] == "OUTPUT":
+                results["outputs"].append((int(fields[1]), fields[2]))
+            elif fields[0] == "BRAM":
+                results["bram"][int(fields[1])] = int(fields[2], 16) if "x" not in fields[2].lower() else None
+            elif fields[0] == "END":
+                results["end"] = int(fields[1])
+
+    return results
+
+
+def check(scenario, results):
+    """Check the results of a scenario, returns (latencies, errors)"""
+
+    errors = []
+    latencies = []
+
+    if results["end"] is None:
+        errors.append("the testbench did not finish")
+
+    requests = results["requests"]
+    interrupts = results["interrupts"]
+    expected = scenario.get("expected_latency")
+
+    if len(requests) != len(scenario.get("requests", [])):
+        errors.append("%d of %d requests are sent" % (len(requests), len(scenario.get("requests", []))))
+
+    for index, request in enumerate(requests):
+        next_request = requests[index + 1] if index + 1 < len(requests) else None
+        interrupt = next((cycle for cycle in interrupts
+                          if cycle > request and (next_request is None or cycle <= next_request)), None)
+
+        if interrupt is None:
+            errors.append("request at cycle %d: no interrupt" % request)
+            continue
+
+        latency = interrupt - request
+        latencies.append(latency)
+
+        if expected is not None and not expected[0] <= latency <= expected[1]:
+            errors.append("request at cycle %d: latency %d is not in [%d, %d]" % (request, latency, expected[0], expected[1]))
+
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a scenario into a SystemVerilog testbench of DebuggerModuleTestingBRAM and run it")
+    parser.add_argument("scenario", help="path of the scenario (JSON)")
+    parser.add_argument("--generated", default=runner.DEFAULT_GENERATED_DIRECTORY, help="directory of the generated files")
+    parser.add_argument("--build", default=COMPILE_BUILD_DIRECTORY, help="build directory of the testbench")
+    args = parser.parse_args()
+
+    with open(args.scenario, "r") as file:
+        scenario = json.load(file)
+
+    layout = manifest.load(args.generated)
+    os.makedirs(args.build, exist_ok=True)
+
+    executable = build(layout, os.path.abspath(args.generated), args.build)
+    write_stimulus(scenario, layout, args.build)
+
+    cycles = int(scenario.get("cycles", 10000))
+    wall_time = run(executable, args.build, cycles)
+
+    latencies, errors = check(scenario, read_results(os.path.join(args.build, RESULTS_FILE)))
+
+    print("[*] %d cycles in %.3f s (%.0f cycles/s)" % (cycles, wall_time, cycles / wall_time if wall_time else 0))
+    print(traffic.format_summary("interrupt latency (cycles)", traffic.summarize(latencies)))
+
+    for error in errors:
+        print("[x] " + error)
+
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
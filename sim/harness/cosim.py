@@ -0,0 +1,331 @@
+##
+# @file cosim.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Memory-mapped mailbox between the simulated PL and a local PS process
+#
+# @details The mailbox file contains a header and an image of the BRAM. The PS
+#          (e.g., a hwdbg client) writes a request packet into the PS to PL area
+#          and increments the request doorbell (io_plInSignal). The bridge (a
+#          coroutine of the testbench) copies the area into the simulated BRAM,
+#          pulses io_plInSignal, and once io_psOutInterrupt is raised, copies the
+#          PL to PS area back, increments the response doorbell and notifies the
+#          PS through a named pipe ('<mailbox>.notify'), like an eventfd
+#
+#          The testbench side:   bridge = cosim.Bridge(dut, path); await bridge.run()
+#          The PS side:          python3 -m harness.cosim <mailbox> --count 100
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import errno
+import mmap
+import os
+import select
+import struct
+import sys
+import time
+
+from harness import handles
+
+#
+# Layout of the header of the mailbox
+#
+MAILBOX_MAGIC = b"HWDBGMBX"
+MAILBOX_VERSION = 1
+HEADER_FORMAT = "<8sIIIIQQQQ"
+HEADER_SIZE = 64
+
+#
+# Offsets of the fields of the header (after the magic and the geometry)
+#
+OFFSET_REQUEST_DOORBELL = 24
+OFFSET_RESPONSE_DOORBELL = 32
+OFFSET_STOP = 40
+OFFSET_LATENCY_CYCLES = 48
+
+#
+# Suffix of the named pipe of the notifications
+#
+NOTIFY_SUFFIX = ".notify"
+
+#
+# Wall time (in seconds) that the bridge waits for a request before stopping
+#
+DEFAULT_IDLE_SECONDS = 60
+
+#
+# Clock cycles that the bridge waits for the interrupt of a request
+#
+DEFAULT_LIMIT_CYCLES = 1000
+
+
+class BridgeTimeout(AssertionError):
+    """The simulated PL did not answer a request of the mailbox"""
+
+
+class Mailbox:
+    """The memory-mapped mailbox file (shared by the bridge and the PS)"""
+
+    def __init__(self, path, create=False, memory_size=0, ps_to_pl_base=0, pl_to_ps_base=0, word_size=4):
+        self.path = path
+        self.notify_path = path + NOTIFY_SUFFIX
+
+        if create:
+            with open(path, "wb") as file:
+                file.write(struct.pack(HEADER_FORMAT, MAILBOX_MAGIC, MAILBOX_VERSION, memory_size,
+                                       ps_to_pl_base, pl_to_ps_base, 0, 0, 0, 0).ljust(HEADER_SIZE, b"\0"))
+                file.write(b"\0" * memory_size)
+
+            if not os.path.exists(self.notify_path):
+                os.mkfifo(self.notify_path)
+
+        self._file = open(path, "r+b")
+        self.mem = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, self.memory_size, self.ps_to_pl_base, self.pl_to_ps_base = \
+            struct.unpack_from("<8sIIII", self.mem, 0)
+
+        if magic != MAILBOX_MAGIC or version != MAILBOX_VERSION:
+            raise ValueError("not a hwdbg mailbox (or a different version): " + path)
+
+        self.word_size = word_size
+
+    def close(self):
+        self.mem.close()
+        self._file.close()
+
+    def counter(self, offset):
+        return struct.unpack_from("<Q", self.mem, offset)[0]
+
+    def set_counter(self, offset, value):
+        struct.pack_into("<Q", self.mem, offset, value)
+
+    def read_words(self, byte_address, count):
+        """Read words from the BRAM image"""
+
+        return list(struct.unpack_from("<%dI" % count, self.mem, HEADER_SIZE + byte_address))
+
+    def write_words(self, byte_address, words):
+        """Write words into the BRAM image"""
+
+        struct.pack_into("<%dI" % len(words), self.mem, HEADER_SIZE + byte_address,
+                         *[word & 0xffffffff for word in words])
+
+    def area_words(self, base):
+        """Number of the words of a PS to PL or PL to PS area"""
+
+        other_base = self.pl_to_ps_base if base == self.ps_to_pl_base else self.ps_to_pl_base
+        end = other_base if other_base > base else self.memory_size
+        return (end - base) // self.word_size
+
+    def notify(self):
+        """Wake up the PS (the notification is dropped if nobody is waiting)"""
+
+        try:
+            descriptor = os.open(self.notify_path, os.O_WRONLY | os.O_NONBLOCK)
+        except OSError as error:
+            if error.errno == errno.ENXIO:
+                return
+            raise
+
+        try:
+            os.write(descriptor, b"\1")
+        except BlockingIOError:
+            pass
+        finally:
+            os.close(descriptor)
+
+
+class Bridge:
+    """Serve the requests of the mailbox to the simulated PL (DebuggerModuleTestingBRAM)"""
+
+    def __init__(self, dut, path, idle_seconds=None, memory_path="dataOut_initRegMemFromFileModule", limit_cycles=None):
+        from harness import packet
+
+        layout = packet.layout()
+
+        self.dut = dut
+        self.mailbox = Mailbox(path, create=True, memory_size=layout.memory_size,
+                               ps_to_pl_base=layout.ps_to_pl_base,
+                               pl_to_ps_base=layout.pl_to_ps_base,
+                               word_size=layout.word_size)
+        self.idle_seconds = idle_seconds if idle_seconds is not None else \
+            float(os.environ.get("HWDBG_COSIM_IDLE_SECONDS", str(DEFAULT_IDLE_SECONDS)))
+        self.limit_cycles = limit_cycles if limit_cycles is not None else \
+            int(os.environ.get("HWDBG_COSIM_LIMIT_CYCLES", str(DEFAULT_LIMIT_CYCLES)))
+
+        self.cells = handles.registry(dut).indexed("mem", memory_path)
+        self.latencies = []
+
+    async def serve_request(self):
+        """Run one request of the mailbox on the simulated PL"""
+
+        #
+        # cocotb is only imported by the bridge (the PS process does not need it)
+        #
+        from cocotb.triggers import RisingEdge
+
+        mailbox = self.mailbox
+        clock = self.dut.clock
+
+        #
+        # Copy the request into the BRAM of the design
+        #
+        first_cell = mailbox.ps_to_pl_base // mailbox.word_size
+        for index, word in enumerate(mailbox.read_words(mailbox.ps_to_pl_base, mailbox.area_words(mailbox.ps_to_pl_base))):
+            self.cells[first_cell + index].value = word
+
+        self.dut.io_plInSignal.value = 1
+        await RisingEdge(clock)
+        self.dut.io_plInSignal.value = 0
+
+        cycles = 1
+        while handles.read_int(self.dut.io_psOutInterrupt) != 1:
+            if cycles >= self.limit_cycles:
+                raise BridgeTimeout("no interrupt of the PL after %d cycles (request %d of the mailbox)" % (
+                    cycles, mailbox.counter(OFFSET_REQUEST_DOORBELL)))
+
+            await RisingEdge(clock)
+            cycles = cycles + 1
+
+        #
+        # Apply the latest BRAM modifications, then copy the response
+        #
+        await RisingEdge(clock)
+
+        first_cell = mailbox.pl_to_ps_base // mailbox.word_size
+        words = [handles.read_int(self.cells[first_cell + index])
+                 for index in range(mailbox.area_words(mailbox.pl_to_ps_base))]
+        mailbox.write_words(mailbox.pl_to_ps_base, words)
+
+        self.latencies.append(cycles)
+        mailbox.set_counter(OFFSET_LATENCY_CYCLES, cycles)
+        mailbox.set_counter(OFFSET_RESPONSE_DOORBELL, mailbox.counter(OFFSET_RESPONSE_DOORBELL) + 1)
+        mailbox.notify()
+
+    async def run(self):
+        """Serve the requests until the PS stops the bridge (or it's idle for a while)"""
+
+        from cocotb.triggers import RisingEdge
+
+        mailbox = self.mailbox
+        served = mailbox.counter(OFFSET_REQUEST_DOORBELL)
+        last_request = time.monotonic()
+
+        while mailbox.counter(OFFSET_STOP) == 0:
+
+            if mailbox.counter(OFFSET_REQUEST_DOORBELL) != served:
+                served = served + 1
+                await self.serve_request()
+                last_request = time.monotonic()
+                continue
+
+            if time.monotonic() - last_request >= self.idle_seconds:
+                break
+
+            await RisingEdge(self.dut.clock)
+
+        return self.latencies
+
+
+class MailboxClient:
+    """The PS side of the mailbox"""
+
+    def __init__(self, path):
+        self.mailbox = Mailbox(path)
+
+        #
+        # Keep the pipe open for reading, so the notifications are not dropped
+        #
+        self._notify = os.open(self.mailbox.notify_path, os.O_RDONLY | os.O_NONBLOCK)
+
+    def close(self):
+        os.close(self._notify)
+        self.mailbox.close()
+
+    def request(self, words, timeout=10.0):
+        """Send a request packet and wait for the response, returns (words, latency in cycles)"""
+
+        mailbox = self.mailbox
+        expected = mailbox.counter(OFFSET_RESPONSE_DOORBELL) + 1
+
+        mailbox.write_words(mailbox.ps_to_pl_base, words)
+        mailbox.set_counter(OFFSET_REQUEST_DOORBELL, mailbox.counter(OFFSET_REQUEST_DOORBELL) + 1)
+
+        deadline = time.monotonic() + timeout
+        while mailbox.counter(OFFSET_RESPONSE_DOORBELL) < expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("no response from the simulated PL")
+
+            #
+            # The doorbell is checked again after each wake up (or a short
+            # timeout), so a notification that is sent before the wait is not lost
+            #
+            readable, _, _ = select.select([self._notify], [], [], min(remaining, 0.1))
+            if readable:
+                os.read(self._notify, 4096)
+
+        words = mailbox.read_words(mailbox.pl_to_ps_base, mailbox.area_words(mailbox.pl_to_ps_base))
+        return words, mailbox.counter(OFFSET_LATENCY_CYCLES)
+
+    def stop(self):
+        """Stop the bridge (the cosimulation test finishes)"""
+
+        self.mailbox.set_counter(OFFSET_STOP, 1)
+
+
+def main():
+    from harness import manifest, packet, traffic
+
+    parser = argparse.ArgumentParser(description="Send requests to the simulated PL through the mailbox")
+    parser.add_argument("mailbox", help="path of the mailbox (HWDBG_COSIM_MAILBOX of the testbench)")
+    parser.add_argument("--action", default="hwdbgActionSendVersion", help="requested action of the packets")
+    parser.add_argument("--count", type=int, default=1, help="number of the requests")
+    parser.add_argument("--stop", action="store_true", help="stop the bridge at the end")
+    parser.add_argument("--generated", help="directory of the generated files (default: HWDBG_GENERATED_DIR or 'generated')")
+    args = parser.parse_args()
+
+    #
+    # The actions are known once the layout of the generated directory is loaded
+    #
+    manifest.use_generated_directory(args.generated)
+
+    actions = packet.layout().actions
+
+    if args.action not in actions:
+        parser.error("invalid action: " + args.action + " (choose from " + ", ".join(sorted(actions)) + ")")
+
+    client = MailboxClient(args.mailbox)
+    request = packet.build_packet(actions[args.action])
+    cycles = []
+    wall_times = []
+
+    for _ in range(args.count):
+        start = time.monotonic()
+        words, latency = client.request(request)
+        wall_times.append(int((time.monotonic() - start) * 1e6))
+        cycles.append(latency)
+
+    response = packet.parse_packet(words)
+    print("[*] last response: type=%d requested_action=%d payload=%s" % (
+        response["type"], response["requested_action"], " ".join("%08x" % word for word in response["payload"][:8])))
+    print(traffic.format_summary("latency (cycles)", traffic.summarize(cycles)))
+    print(traffic.format_summary("latency (us)", traffic.summarize(wall_times)))
+
+    if args.stop:
+        client.stop()
+    client.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+##
+# @file drivers.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Drivers of the receiving and sending handshakes (the interpreter side)
+#
+# @details Both of the drivers are stepped once per clock cycle, between the
+#          rising edges of the clock (e.g., after a falling edge), so the
+#          driven values are sampled on the next rising edge
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+from harness import handles
+
+
+def stall_pattern(spec, rng=None):
+    """Stall callable (cycle -> bool) of a producer from its description
+
+    - none:                 never stalls
+    - every:N               stalls every N-th cycle
+    - burst:READY:STALL     ready for READY cycles, then stalls for STALL cycles
+    - random:P              stalls with the probability of P (drawn from 'rng')
+    """
+
+    kind, _, arguments = spec.partition(":")
+    values = arguments.split(":") if arguments else []
+
+    if kind == "none":
+        return None
+    elif kind == "every":
+        period = int(values[0])
+        return lambda cycle: cycle % period == 0
+    elif kind == "burst":
+        ready, stall = int(values[0]), int(values[1])
+        return lambda cycle: cycle % (ready + stall) >= ready
+    elif kind == "random":
+        probability = float(values[0])
+        return lambda cycle: rng.random() < probability
+
+    raise ValueError("unknown stall pattern: " + spec)
+
+
+class ReceiveConsumer:
+    """Read the action buffer of a received packet as fast as the handshake allows
+
+    The receiver advances on the rising edge of 'io_readNextData', so the signal
+    is toggled in every cycle (one new word per two cycles) and 'io_noNewDataReceiver'
+    is asserted once the requested number of words are received
+    """
+
+    def __init__(self, dut, prefix="io_"):
+        hw = handles.registry(dut)
+
+        self.requested_action_valid = hw.get(prefix + "requestedActionOfThePacketOutputValid")
+        self.requested_action = hw.get(prefix + "requestedActionOfThePacketOutput")
+        self.data_valid = hw.get(prefix + "dataValidOutput")
+        self.receiving_data = hw.get(prefix + "receivingData")
+        self.read_next_data = hw.get(prefix + "readNextData")
+        self.no_new_data = hw.get(prefix + "noNewDataReceiver")
+
+        self.active = False
+        self.words = []
+        self.action = None
+        self._words_to_read = 0
+        self._requested_words = 0
+        self._level = 0
+
+    def idle(self):
+        """Drive the inactive values of the handshake"""
+
+        self._level = 0
+        self.read_next_data.value = 0
+        self.no_new_data.value = 0
+
+    def begin(self, words_to_read):
+        """Start consuming a packet with 'words_to_read' words of action buffer"""
+
+        self.active = True
+        self.words = []
+        self.action = None
+        self._words_to_read = words_to_read
+        self._requested_words = 0
+
+    def end(self):
+        """Stop consuming (e.g., the receiver dropped an invalid packet)"""
+
+        self.active = False
+        self.idle()
+
+    def step(self):
+        """Drive the handshake of the current clock cycle"""
+
+        if not self.active:
+            self.idle()
+            return
+
+        if handles.read_int(self.data_valid) == 1:
+            self.words.append(handles.read_int(self.receiving_data))
+
+        if handles.read_int(self.requested_action_valid) != 1:
+            self.idle()
+            return
+
+        if self.action is None:
+            self.action = handles.read_int(self.requested_action)
+
+        if len(self.words) >= self._words_to_read:
+
+            #
+            # All of the words are received, finish the receiving
+            #
+            self.read_next_data.value = 0
+            self.no_new_data.value = 1
+            self.active = False
+
+        elif self._level == 1:
+            self._level = 0
+            self.read_next_data.value = 0
+
+        elif self._requested_words < self._words_to_read:
+
+            #
+            # Rising edge of the 'readNextData' (request the next word)
+            #
+            self._level = 1
+            self._requested_words = self._requested_words + 1
+            self.read_next_data.value = 1
+
+
+class SendProducer:
+    """Feed 'io_sendingData' in every cycle that the sender waits for a buffer
+
+    The words are taken from the 'source' iterator, and the 'stall' callable
+    (cycle -> bool) models the cycles that the producer is not ready
+    """
+
+    def __init__(self, dut, prefix="io_"):
+        hw = handles.registry(dut)
+
+        self.send_wait_for_buffer = hw.get(prefix + "sendWaitForBuffer")
+        self.data_valid = hw.get(prefix + "dataValidInput")
+        self.sending_data = hw.get(prefix + "sendingData")
+        self.no_new_data = hw.get(prefix + "noNewDataSender")
+        self.requested_action = hw.get(prefix + "requestedActionOfThePacketInput")
+
+        self.active = False
+        self.words = []
+        self.stall_cycles = 0
+        self.wait_cycles = 0
+        self._source = None
+        self._stall = None
+        self._words_to_send = None
+
+    def idle(self):
+        """Drive the inactive values of the handshake"""
+
+        self.data_valid.value = 0
+        self.no_new_data.value = 0
+
+    def begin(self, requested_action, source, words_to_send=None, stall=None):
+        """Start producing the action buffer of a packet (until the source or 'words_to_send' is exhausted)"""
+
+        self.active = True
+        self.words = []
+        self.stall_cycles = 0
+        self.wait_cycles = 0
+        self._source = iter(source)
+        self._stall = stall
+        self._words_to_send = words_to_send
+        self.requested_action.value = requested_action
+
+    def step(self, cycle):
+        """Drive the handshake of the current clock cycle"""
+
+        if not self.active:
+            self.idle()
+            return
+
+        if handles.read_int(self.send_wait_for_buffer) != 1:
+            self.idle()
+            return
+
+        self.wait_cycles = self.wait_cycles + 1
+
+        if self._words_to_send is not None and len(self.words) >= self._words_to_send:
+            word = None
+        elif self._stall is not None and self._stall(cycle):
+            self.stall_cycles = self.stall_cycles + 1
+            self.data_valid.value = 0
+            return
+        else:
+            word = next(self._source, None)
+
+        if word is None:
+
+            #
+            # No more data, finish the sending
+            #
+            self.data_valid.value = 0
+            self.no_new_data.value = 1
+            self.active = False
+            return
+
+        self.words.append(word)
+        self.sending_data.value = word
+        self.data_valid.value = 1
@@ -0,0 +1,204 @@
+##
+# @file eventlog.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Low-overhead event log of the testbenches
+#
+# @details The events (a cycle stamp, an event id and three payload words) are
+#          packed into a fixed-size ring buffer instead of being printed. The
+#          buffer is flushed to a file only when a test fails (or always, if
+#          'HWDBG_EVENTLOG=always'), and the file is printed offline:
+#
+#            EVENT_ROUND = eventlog.define("Enable receiving data on the chip ({0})")
+#            eventlog.log(EVENT_ROUND, test_number)
+#
+#            python3 -m harness.eventlog hwdbg/DebuggerPacketReceiver/eventlog_DebuggerPacketReceiver_test.bin
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import functools
+import json
+import os
+import struct
+import sys
+
+from harness import runner
+
+#
+# Header of the flushed file (magic, version, size of the definitions, number
+# of the records and the number of the dropped records)
+#
+EVENTLOG_MAGIC = b"HWDBGEVT"
+EVENTLOG_VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+
+#
+# A record (cycle, event id, payload words)
+#
+RECORD = struct.Struct("<QI3I")
+
+#
+# Number of the records of the ring buffer (the older records are overwritten)
+#
+DEFAULT_CAPACITY = int(os.environ.get("HWDBG_EVENTLOG_CAPACITY", "65536"))
+
+#
+# Period of the clock (for the cycle stamps)
+#
+CLOCK_PERIOD_NS = 10
+
+#
+# Texts of the events (event id -> format with the payload words as {0}, {1}, {2})
+#
+_definitions = []
+
+#
+# The event log of the current simulation session
+#
+_session_log = None
+
+
+def define(text):
+    """Define an event (once, e.g., at the import of a testbench), returns its id"""
+
+    if text in _definitions:
+        return _definitions.index(text)
+
+    _definitions.append(text)
+    return len(_definitions) - 1
+
+
+class EventLog:
+    """Fixed-size ring buffer of the events"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.count = 0
+
+    def log(self, cycle, event, a=0, b=0, c=0):
+        RECORD.pack_into(self.buffer, (self.count % self.capacity) * RECORD.size,
+                         cycle, event, a & 0xffffffff, b & 0xffffffff, c & 0xffffffff)
+        self.count = self.count + 1
+
+    def records(self):
+        """The records (oldest first) as bytes"""
+
+        if self.count <= self.capacity:
+            return bytes(self.buffer[:self.count * RECORD.size])
+
+        split = (self.count % self.capacity) * RECORD.size
+        return bytes(self.buffer[split:] + self.buffer[:split])
+
+    def flush(self, path):
+        """Write the definitions and the records to a file"""
+
+        definitions = json.dumps(_definitions).encode()
+        stored = min(self.count, self.capacity)
+
+        with open(path, "wb") as file:
+            file.write(HEADER.pack(EVENTLOG_MAGIC, EVENTLOG_VERSION, len(definitions), stored, self.count - stored))
+            file.write(definitions)
+            file.write(self.records())
+
+        return path
+
+
+def session_log():
+    """The event log of the current simulation session"""
+
+    global _session_log
+
+    if _session_log is None:
+        _session_log = EventLog()
+
+    return _session_log
+
+
+def current_cycle():
+    from cocotb.utils import get_sim_time
+
+    return int(get_sim_time("ns") // CLOCK_PERIOD_NS)
+
+
+def log(event, a=0, b=0, c=0):
+    """Log an event at the current cycle of the simulation"""
+
+    session_log().log(current_cycle(), event, a, b, c)
+
+
+def flush(name="eventlog"):
+    """Flush the event log of the session (to 'HWDBG_EVENTLOG_PATH' or '<name>.bin' in the output directory)"""
+
+    return session_log().flush(os.environ.get("HWDBG_EVENTLOG_PATH", runner.output_path(name + ".bin")))
+
+
+def flush_on_failure(test_function):
+    """Decorate a cocotb test to flush the event log once it fails"""
+
+    @functools.wraps(test_function)
+    async def wrapper(dut, *args, **kwargs):
+        name = "eventlog_" + test_function.__name__
+
+        try:
+            await test_function(dut, *args, **kwargs)
+        except BaseException:
+            dut._log.error("The event log is flushed to " + flush(name))
+            raise
+
+        if os.environ.get("HWDBG_EVENTLOG", "failure") == "always":
+            dut._log.info("The event log is flushed to " + flush(name))
+
+    return wrapper
+
+
+def read(path):
+    """Read a flushed file, returns (definitions, records, number of the dropped records)"""
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version, definitions_size, stored, dropped = HEADER.unpack_from(data, 0)
+    if magic != EVENTLOG_MAGIC or version != EVENTLOG_VERSION:
+        raise ValueError("not an event log (or a different version): " + path)
+
+    offset = HEADER.size
+    definitions = json.loads(data[offset:offset + definitions_size].decode())
+    offset = offset + definitions_size
+
+    records = [RECORD.unpack_from(data, offset + index * RECORD.size) for index in range(stored)]
+    return definitions, records, dropped
+
+
+def format_record(definitions, record):
+    cycle, event, a, b, c = record
+    text = definitions[event] if event < len(definitions) else "unknown event " + str(event)
+    return "%10d  %s" % (cycle, text.format(a, b, c))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print a flushed event log")
+    parser.add_argument("path", help="path of the event log")
+    parser.add_argument("--last", type=int, default=None, help="print only the last records")
+    args = parser.parse_args()
+
+    definitions, records, dropped = read(args.path)
+
+    if dropped:
+        print("[*] %d older records are overwritten" % dropped)
+
+    for record in records[-args.last:] if args.last else records:
+        print(format_record(definitions, record))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,374 @@
+##
+# @file faults.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Fault-injection campaign of the packet receiver and the interpreter
+#
+# @details The valid requests are mutated in bulk (bit flips, truncation, bad
+#          indicators, bad packet types and invalid actions), the outcome of
+#          each mutant is predicted by a reference model of the receiver and the
+#          interpreter:
+#
+#            dropped     the packet is ignored (the state machines return to sIdle)
+#            error       hwdbgResponseInvalidPacketOrError is sent (an interrupt)
+#            response    a regular response is sent (an interrupt)
+#
+#          The mutants are split into batches that are run by a process pool, each
+#          batch is one simulation of DebuggerModuleTestingBRAM_fault_test (the
+#          DUT is restored from a post-reset checkpoint before each mutant):
+#
+#            python3 -m harness.faults --count 5000 --jobs 8
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import os
+import random
+import sys
+
+from harness import manifest, runner, sweep, traffic
+
+#
+# Classes of the faults
+#
+FAULT_CLASSES = ["bit_flip", "truncation", "bad_indicator", "bad_type", "invalid_action"]
+
+#
+# Outcomes of a mutant (and a hung design that neither responds nor returns to sIdle)
+#
+OUTCOME_DROPPED = "dropped"
+OUTCOME_ERROR = "error"
+OUTCOME_RESPONSE = "response"
+OUTCOME_HANG = "hang"
+
+#
+# Actions of the valid (not mutated) requests, they are answered by a response
+#
+BASE_ACTIONS = ["hwdbgActionSendVersion", "hwdbgActionSendPinInformation"]
+
+#
+# Default number of the cycles for detecting the outcome of a mutant
+#
+DEFAULT_LIMIT_CYCLES = 200
+
+#
+# The suite and the test of the campaign
+#
+FAULT_SUITE = "DebuggerModuleTestingBRAM"
+FAULT_TESTCASE = "DebuggerModuleTestingBRAM_fault_test"
+
+#
+# Local directory of the batches and the simulator builds of the campaign
+#
+FAULTS_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "faults_build")
+
+#
+# Slot of the current process of the pool (selects its simulator build)
+#
+_pool_slot = 0
+
+
+class PacketModel:
+    """Reference model of the checks of the receiver and the interpreter"""
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.word_size = layout.word_size
+
+        self.checksum_word = layout.offsets["checksum"] // self.word_size
+        self.indicator_word = layout.offsets["indicator"] // self.word_size
+        self.type_word = layout.offsets["typeOfThePacket"] // self.word_size
+        self.action_word = layout.offsets["requestedActionOfThePacket"] // self.word_size
+        self.header_words = layout.offsets["startOfDataBuffer"] // self.word_size
+
+    def header(self, action):
+        """Words of a valid request (without a payload)"""
+
+        words = [0] * self.header_words
+        words[self.indicator_word] = self.layout.indicator & 0xffffffff
+        words[self.indicator_word + 1] = (self.layout.indicator >> 32) & 0xffffffff
+        words[self.type_word] = self.layout.packet_types["DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL"]
+        words[self.action_word] = self.layout.actions[action]
+        return words
+
+    def padded(self, words):
+        """The words that are written into the PS to PL area (truncated packets are zero-filled)"""
+
+        return list(words) + [0] * (self.header_words - len(words))
+
+    def expected(self, words):
+        """Expected outcome of a request or None if the model does not cover it"""
+
+        words = self.padded(words)
+
+        #
+        # The receiver only compares the first word of the indicator (its lower
+        # 32 bits), the second word is never checked by the RTL, so its
+        # mutants are answered like the valid requests
+        #
+        if words[self.indicator_word] != self.layout.indicator & 0xffffffff:
+            return OUTCOME_DROPPED
+
+        if words[self.type_word] != self.layout.packet_types["DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL"]:
+            return OUTCOME_DROPPED
+
+        action = words[self.action_word]
+        if action in (self.layout.actions[name] for name in BASE_ACTIONS):
+            return OUTCOME_RESPONSE
+
+        if action not in self.layout.action_names:
+            return OUTCOME_ERROR
+
+        #
+        # The other valid actions (e.g., configuring the script buffer) read a
+        # buffer, they are not covered by the model
+        #
+        return None
+
+
+def mutate(model, fault_class, words, rng):
+    """Mutate the words of a valid request, returns (words, description)"""
+
+    words = list(words)
+
+    if fault_class == "bit_flip":
+        index = rng.choice([model.indicator_word, model.indicator_word + 1, model.type_word, model.action_word])
+        bit = rng.randrange(model.word_size * 8)
+        words[index] ^= 1 << bit
+        return words, "flip bit %d of word %d" % (bit, index)
+
+    if fault_class == "truncation":
+        length = rng.randrange(model.header_words)
+        return words[:length], "truncate to %d words" % length
+
+    if fault_class == "bad_indicator":
+        index = model.indicator_word + rng.randrange(2)
+        value = rng.getrandbits(32)
+        while value == words[index]:
+            value = rng.getrandbits(32)
+        words[index] = value
+        return words, "indicator word %d = %08x" % (index, value)
+
+    if fault_class == "bad_type":
+        value = rng.choice([value for value in model.layout.packet_types.values() if value != words[model.type_word]]
+                           + [rng.getrandbits(32)])
+        words[model.type_word] = value
+        return words, "type = %x" % value
+
+    if fault_class == "invalid_action":
+        value = rng.getrandbits(32) if rng.random() < 0.5 else rng.randrange(len(model.layout.actions) + 1, 64)
+        while value in model.layout.action_names:
+            value = rng.getrandbits(32)
+        words[model.action_word] = value
+        return words, "action = %x" % value
+
+    raise ValueError("unknown fault class: " + fault_class)
+
+
+def make_mutants(model, count, seed, classes=FAULT_CLASSES):
+    """Generate the mutants of the campaign (the classes are interleaved)"""
+
+    rng = random.Random(seed)
+    mutants = []
+
+    for index in range(count):
+        fault_class = classes[index % len(classes)]
+        action = rng.choice(BASE_ACTIONS)
+        words, description = mutate(model, fault_class, model.header(action), rng)
+
+        mutants.append({
+            "id": index,
+            "class": fault_class,
+            "base_action": action,
+            "description": description,
+            "words": words,
+            "expected": model.expected(words),
+        })
+
+    return mutants
+
+
+async def run_mutant(dut, model, cells, mutant, limit_cycles):
+    """Run a mutant on the DUT (just restored), returns (outcome, latency in cycles, response action)"""
+
+    #
+    # cocotb is only imported by the testbench (not by the campaign)
+    #
+    from cocotb.triggers import RisingEdge
+
+    from harness import handles, idle
+
+    layout = model.layout
+    first_cell = layout.word_index(layout.ps_to_pl_base)
+    for index, word in enumerate(model.padded(mutant["words"])):
+        cells[first_cell + index].value = word
+
+    dut.io_plInSignal.value = 1
+    await RisingEdge(dut.clock)
+    dut.io_plInSignal.value = 0
+
+    monitor = idle.monitor(dut)
+    response_cell = cells[layout.word_index(layout.pl_to_ps_address("requestedActionOfThePacket"))]
+
+    for cycle in range(1, limit_cycles + 1):
+        await RisingEdge(dut.clock)
+
+        if handles.read_int(dut.io_psOutInterrupt) == 1:
+
+            #
+            # Apply the latest BRAM modifications
+            #
+            await RisingEdge(dut.clock)
+            response = handles.read_int(response_cell)
+            outcome = OUTCOME_ERROR if response == layout.responses["hwdbgResponseInvalidPacketOrError"] else OUTCOME_RESPONSE
+            return outcome, cycle, response
+
+        #
+        # The receiver leaves sIdle on the next cycle of io_plInSignal, so an
+        # idle design after that means the packet is dropped
+        #
+        if cycle > 1 and monitor.is_idle():
+            return OUTCOME_DROPPED, cycle, None
+
+    return OUTCOME_HANG, limit_cycles, None
+
+
+def assign_pool_slot(slots):
+    """Take a slot for the current process of the pool (its initializer)"""
+
+    global _pool_slot
+    _pool_slot = slots.get()
+
+
+def run_batch(batch_path, results_path, generated_directory, simulator, limit_cycles, build_tag):
+    """Simulate a batch of the mutants (in a process of the pool)"""
+
+    #
+    # Each slot of the pool reuses its own simulator build across the batches
+    # and the campaigns (of the same generated files)
+    #
+    build_directory = os.path.join(FAULTS_DIRECTORY, build_tag + "-slot" + str(_pool_slot))
+
+    #
+    # The results of a previous campaign are never taken for this batch
+    #
+    if os.path.exists(results_path):
+        os.remove(results_path)
+
+    result = runner.run_suite(FAULT_SUITE, build_directory, generated_directory, simulator, testcase=FAULT_TESTCASE,
+                              extra_env={
+                                  "HWDBG_FAULT_MUTANTS": os.path.abspath(batch_path),
+                                  "HWDBG_FAULT_RESULTS": os.path.abspath(results_path),
+                                  "HWDBG_FAULT_LIMIT_CYCLES": str(limit_cycles),
+                              })
+
+    if not result.passed or not os.path.exists(results_path):
+        raise RuntimeError("batch " + batch_path + " did not finish, see " + os.path.join(build_directory, "output.log"))
+
+    with open(results_path, "r") as file:
+        return json.load(file), result.wall_time
+
+
+def summarize(results):
+    """Per-class summary of the outcomes and the detection latencies"""
+
+    summary = {}
+
+    for result in results:
+        entry = summary.setdefault(result["class"], {"count": 0, "matched": 0, "escaped": 0, "hang": 0,
+                                                     "unmodeled": 0, "latencies": []})
+        entry["count"] = entry["count"] + 1
+
+        if result["outcome"] == OUTCOME_HANG:
+            entry["hang"] = entry["hang"] + 1
+        elif result["expected"] is None:
+            entry["unmodeled"] = entry["unmodeled"] + 1
+        elif result["outcome"] == result["expected"]:
+            entry["matched"] = entry["matched"] + 1
+        else:
+            entry["escaped"] = entry["escaped"] + 1
+
+        if result["outcome"] in (OUTCOME_DROPPED, OUTCOME_ERROR):
+            entry["latencies"].append(result["latency"])
+
+    return summary
+
+
+def format_summary(summary):
+    lines = []
+    for fault_class in FAULT_CLASSES:
+        if fault_class not in summary:
+            continue
+        entry = summary[fault_class]
+        lines.append("%-15s count=%d matched=%d escaped=%d hang=%d unmodeled=%d" % (
+            fault_class, entry["count"], entry["matched"], entry["escaped"], entry["hang"], entry["unmodeled"]))
+        lines.append("  " + traffic.format_summary("detection latency (cycles)", traffic.summarize(entry["latencies"])))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a fault-injection campaign of the packet receiver and the interpreter")
+    parser.add_argument("--count", type=int, default=1000, help="number of the mutants")
+    parser.add_argument("--seed", type=int, default=1, help="seed of the mutants")
+    parser.add_argument("--class", dest="classes", action="append", choices=FAULT_CLASSES, help="fault class (default: all)")
+    parser.add_argument("--batch", type=int, default=250, help="number of the mutants of each simulation")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of parallel simulations")
+    parser.add_argument("--limit-cycles", type=int, default=DEFAULT_LIMIT_CYCLES, help="cycles for detecting each outcome")
+    parser.add_argument("--simulator", default="icarus", help="cocotb simulator")
+    parser.add_argument("--generated", default=runner.DEFAULT_GENERATED_DIRECTORY, help="directory of the generated files")
+    parser.add_argument("--failures", type=int, default=10, help="number of the reported escaped (or hung) mutants")
+    args = parser.parse_args()
+
+    model = PacketModel(manifest.load(args.generated))
+    mutants = make_mutants(model, args.count, args.seed, args.classes or FAULT_CLASSES)
+
+    os.makedirs(FAULTS_DIRECTORY, exist_ok=True)
+    batches = []
+    for start in range(0, len(mutants), args.batch):
+        batch_path = os.path.join(FAULTS_DIRECTORY, "batch%d.json" % (start // args.batch))
+        with open(batch_path, "w") as file:
+            json.dump(mutants[start:start + args.batch], file)
+        batches.append(batch_path)
+
+    jobs = max(1, min(args.jobs, len(batches)))
+    print("[*] %d mutants in %d batches, %d parallel simulations" % (len(mutants), len(batches), jobs))
+
+    build_tag = sweep.hash_files([args.generated])[:12]
+    slots = multiprocessing.Queue()
+    for slot in range(jobs):
+        slots.put(slot)
+
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, initializer=assign_pool_slot, initargs=(slots,)) as executor:
+        futures = [
+            executor.submit(run_batch, batch_path, batch_path[:-len(".json")] + ".results.json",
+                            args.generated, args.simulator, args.limit_cycles, build_tag)
+            for batch_path in batches
+        ]
+        for future in futures:
+            batch_results, _ = future.result()
+            results.extend(batch_results)
+
+    summary = summarize(results)
+    print(format_summary(summary))
+
+    failures = [result for result in results if result["outcome"] == OUTCOME_HANG or
+                (result["expected"] is not None and result["outcome"] != result["expected"])]
+    for result in failures[:args.failures]:
+        print("[!] mutant %d (%s, %s): expected %s, got %s" % (
+            result["id"], result["class"], result["description"], result["expected"], result["outcome"]))
+
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,226 @@
+##
+# @file handles.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Lazy and cached registry of the DUT hierarchy handles
+#
+# @details Discovering the hierarchy of the design (e.g., by 'dir()') or
+#          resolving a handle by its name is costly on designs with wide
+#          pin banks and large memories, so each handle and each list of
+#          children is only discovered once per simulation session
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import fnmatch
+import importlib.metadata
+import re
+
+#
+# The major version of cocotb that the harness is written for (the handle
+# classes are different in the other versions)
+#
+SUPPORTED_COCOTB_MAJOR_VERSION = 1
+
+#
+# Names of the handle classes (cocotb.handle) of the levels of the hierarchy
+# and of the signals whose values can be deposited
+#
+HIERARCHY_CLASS_NAMES = ("HierarchyObject", "HierarchyArrayObject")
+MODIFIABLE_CLASS_NAMES = ("ModifiableObject",)
+
+
+def installed_cocotb_version():
+    """Version of the installed cocotb (or None), without importing it outside of a simulation"""
+
+    try:
+        return importlib.metadata.version("cocotb")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+#
+# The version is checked once (at the import), the handle classes are only
+# imported by the checks (within a simulation)
+#
+COCOTB_VERSION = installed_cocotb_version()
+COCOTB_SUPPORTED = COCOTB_VERSION is None or int(COCOTB_VERSION.split(".")[0]) == SUPPORTED_COCOTB_MAJOR_VERSION
+
+#
+# The registry of the current simulation session
+#
+_session_registry = None
+
+
+def extract_number(name):
+    """Extract the index of a name like 'io_outputPin_17' or 'mem_12'"""
+
+    return int(name.rsplit('_', 1)[1])
+
+
+def read_int(handle, default=0):
+    """Read the value of a signal as an integer ('default' if it contains X or Z bits)"""
+
+    value = handle.value
+
+    if not value.is_resolvable:
+        return default
+
+    return value.integer
+
+
+def handle_classes(names):
+    """The handle classes of cocotb.handle (rejects the unsupported versions of cocotb)"""
+
+    if not COCOTB_SUPPORTED:
+        raise RuntimeError("the harness requires cocotb %d.x (found %s)" % (SUPPORTED_COCOTB_MAJOR_VERSION, COCOTB_VERSION))
+
+    import cocotb.handle
+
+    return tuple(getattr(cocotb.handle, name) for name in names)
+
+
+def is_hierarchy_handle(handle):
+    """Check whether a handle is a level of the hierarchy (a module or a generate block)"""
+
+    return isinstance(handle, handle_classes(HIERARCHY_CLASS_NAMES))
+
+
+def is_modifiable(handle):
+    """Check whether a handle is a signal whose value can be deposited (a register or a net, not a constant)"""
+
+    return isinstance(handle, handle_classes(MODIFIABLE_CLASS_NAMES))
+
+
+def join_path(path, name):
+    """Join a dotted hierarchy path with a child name"""
+
+    if path == "":
+        return name
+    return path + "." + name
+
+
+class HandleRegistry:
+    """Cache of the handles, children and indexed lists of a DUT"""
+
+    def __init__(self, root):
+        self.root = root
+        self._handles = {"": root}
+        self._children = {}
+        self._indexed = {}
+        self._matches = {}
+        self._found = {}
+
+    def get(self, path):
+        """Get the handle of a dotted path (e.g., 'dataOut_initRegMemFromFileModule.mem_0')"""
+
+        handle = self._handles.get(path)
+
+        if handle is None:
+            parent, _, name = path.rpartition(".")
+            handle = getattr(self.get(parent), name)
+            self._handles[path] = handle
+
+        return handle
+
+    def is_hierarchy(self, path):
+        """Check whether the handle of the path contains sub-handles"""
+
+        return is_hierarchy_handle(self.get(path))
+
+    def children(self, path=""):
+        """Get the sorted names of the sub-handles of a path (discovered once)"""
+
+        names = self._children.get(path)
+
+        if names is None:
+            handle = self.get(path)
+
+            if is_hierarchy_handle(handle):
+                #
+                # dir() discovers the whole level at once, instead of resolving
+                # the names one by one, the sub-handles are its names that are
+                # not the attributes of the handle object itself
+                #
+                names = sorted(set(dir(handle)) - set(object.__dir__(handle)))
+            else:
+                names = []
+
+            self._children[path] = names
+
+        return names
+
+    def indexed_names(self, prefix, path=""):
+        """Get the names of 'prefix_N' children of a path, ordered by N"""
+
+        key = (path, prefix)
+        names = self._indexed.get(key)
+
+        if names is None:
+            pattern = re.compile(re.escape(prefix) + r"_(\d+)$")
+            matches = []
+
+            for name in self.children(path):
+                result = pattern.match(name)
+                if result:
+                    matches.append((int(result.group(1)), name))
+
+            names = [name for _, name in sorted(matches)]
+            self._indexed[key] = names
+
+        return names
+
+    def indexed(self, prefix, path=""):
+        """Get the handles of 'prefix_N' children of a path, ordered by N"""
+
+        return [self.get(join_path(path, name)) for name in self.indexed_names(prefix, path)]
+
+    def match(self, pattern, path=""):
+        """Get the names of the children of a path matching a shell-style pattern"""
+
+        key = (path, pattern)
+        names = self._matches.get(key)
+
+        if names is None:
+            names = fnmatch.filter(self.children(path), pattern)
+            self._matches[key] = names
+
+        return names
+
+    def find(self, pattern, path=""):
+        """Recursively find the dotted paths (under a path) whose name matches a pattern"""
+
+        key = (path, pattern)
+        paths = self._found.get(key)
+
+        if paths is None:
+            paths = []
+
+            for name in self.children(path):
+                child = join_path(path, name)
+
+                if fnmatch.fnmatchcase(name, pattern):
+                    paths.append(child)
+
+                if self.is_hierarchy(child):
+                    paths.extend(self.find(pattern, child))
+
+            self._found[key] = paths
+
+        return paths
+
+
+def registry(dut):
+    """Get the handle registry shared by all harness components of the session"""
+
+    global _session_registry
+
+    if _session_registry is None or _session_registry.root is not dut:
+        _session_registry = HandleRegistry(dut)
+
+    return _session_registry
@@ -0,0 +1,108 @@
+##
+# @file idle.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Fast-forward of the simulation while the DUT is idle
+#
+# @details The state registers of the state machines (synchronizer, receiver,
+#          sender, interpreter, ...) and the PS/PL lines are watched, once all
+#          of them are idle (and no stimulus is pending), the rest of the waiting
+#          cycles are advanced in one time step instead of waking up the testbench
+#          in every cycle
+#
+#          Set 'HWDBG_IDLE_FAST_FORWARD=0' to always step cycle by cycle
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+
+from cocotb.triggers import Timer
+
+from harness import handles
+
+#
+# Encoding of the 'sIdle' state (the first state of the ChiselEnums)
+#
+STATE_IDLE = 0
+
+#
+# The PS/PL lines that should be low while the DUT is idle
+#
+IDLE_LINES = ["io_plInSignal", "io_beginSendingBuffer", "io_psOutInterrupt"]
+
+#
+# Monitors of the current simulation session
+#
+_session_monitor = None
+
+
+def enabled():
+    """Check whether the fast-forward is enabled"""
+
+    return os.environ.get("HWDBG_IDLE_FAST_FORWARD", "1") != "0"
+
+
+class IdleMonitor:
+    """Detect whether all of the state machines of the DUT are idle"""
+
+    def __init__(self, dut):
+        self.dut = dut
+        hw = handles.registry(dut)
+
+        self.states = [hw.get(path) for path in hw.find("state")]
+        self.lines = [hw.get(name) for name in IDLE_LINES if name in hw.children()]
+
+        #
+        # Number of the cycles that are advanced in bulk
+        #
+        self.fast_forwarded_cycles = 0
+
+    def is_idle(self):
+        """Check whether all of the state registers and the lines are idle"""
+
+        for state in self.states:
+            if handles.read_int(state, -1) != STATE_IDLE:
+                return False
+
+        for line in self.lines:
+            if handles.read_int(line, -1) != 0:
+                return False
+
+        return True
+
+
+def monitor(dut):
+    """Get the idle monitor of the session"""
+
+    global _session_monitor
+
+    if _session_monitor is None or _session_monitor.dut is not dut:
+        _session_monitor = IdleMonitor(dut)
+
+    return _session_monitor
+
+
+async def wait_cycles(dut, cycles, period_ns=10, pending=None):
+    """Wait for a number of clock cycles, the idle cycles are advanced in one step
+
+    'pending' is an optional callable that returns True while a stimulus is still
+    pending (so the cycles should not be skipped)
+    """
+
+    idle_monitor = monitor(dut)
+
+    while cycles > 0:
+
+        if enabled() and idle_monitor.is_idle() and (pending is None or not pending()):
+            idle_monitor.fast_forwarded_cycles = idle_monitor.fast_forwarded_cycles + cycles
+            await Timer(cycles * period_ns, units="ns")
+            return
+
+        await Timer(period_ns, units="ns")
+        cycles = cycles - 1
@@ -0,0 +1,282 @@
+##
+# @file journal.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Write journal of the BRAM of DebuggerModuleTestingBRAM
+#
+# @details A monitor samples the port of the memory (InitRegMemFromFile) on each
+#          rising edge and appends each committed write (cycle, word, old value,
+#          new value) to an append-only journal. The content of the BRAM at any
+#          cycle is the initial image (the BRAM initialization file of the
+#          design) plus the writes of the journal up to that cycle, so the
+#          inspections and the final dumps cost O(writes) instead of reading
+#          every memory cell of the simulator
+#
+#            bram_journal = journal.start(dut, "bram.jrn"); ...; bram_journal.stop()
+#            python3 -m harness.journal bram.jrn --cycle 120 --changes
+#
+#          Only the writes of the design are journaled (not the cells that are
+#          written directly by a testbench)
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import os
+import struct
+import sys
+
+from harness import handles, manifest, runner
+
+#
+# Header of the journal (magic, version, size of the values, number of words)
+#
+JOURNAL_MAGIC = b"HWDBGJRN"
+JOURNAL_VERSION = 1
+HEADER = struct.Struct("<8sIII")
+
+#
+# Size of the buffer of the records before writing them to the file
+#
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def record_format(value_size):
+    """A record (cycle, word index, old value, new value)"""
+
+    return struct.Struct("<QI" + ("II" if value_size <= 4 else "QQ"))
+
+
+def read_image(path, number_of_words):
+    """Initial image of the BRAM from a hex file (with the syntax of InitRegMemFromFileTools.readmemh)"""
+
+    words = []
+
+    with open(path, "r") as file:
+        for line in file:
+            token = line.split("//")[0].strip()
+            if token != "":
+                words.append(int(token.split(";")[0].strip(), 16))
+
+    return (words + [0] * number_of_words)[:number_of_words]
+
+
+def initial_image(layout=None):
+    """Initial image of the BRAM of the generated design (BRAM_INITIALIZATION_FILE_PATH of the manifest)"""
+
+    layout = layout if layout is not None else manifest.load()
+    path = layout.configurations["BRAM_INITIALIZATION_FILE_PATH"]
+
+    #
+    # The path is relative to the root of the project (where the design is generated)
+    #
+    if not os.path.isabs(path):
+        path = os.path.join(runner.ROOT_DIRECTORY, path)
+
+    return read_image(path, layout.memory_size // layout.word_size)
+
+
+class JournalWriter:
+    """Append the writes of the BRAM to a journal"""
+
+    def __init__(self, path, number_of_words, value_size=4):
+        self.path = path
+        self.number_of_words = number_of_words
+        self.record = record_format(value_size)
+
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, value_size, number_of_words))
+        self._buffer = bytearray()
+        self.writes = 0
+
+    def append(self, cycle, word, old, new):
+        self._buffer += self.record.pack(cycle, word, old, new)
+        self.writes = self.writes + 1
+
+        if len(self._buffer) >= WRITE_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._file.flush()
+        self._buffer = bytearray()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def read(path):
+    """Read a journal, returns (number of words, records)"""
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version, value_size, number_of_words = HEADER.unpack_from(data, 0)
+    if magic != JOURNAL_MAGIC or version != JOURNAL_VERSION:
+        raise ValueError("not a BRAM journal (or a different version): " + path)
+
+    record = record_format(value_size)
+    end = HEADER.size + (len(data) - HEADER.size) // record.size * record.size
+
+    return number_of_words, [item for item in record.iter_unpack(data[HEADER.size:end])]
+
+
+def changes(records, cycle=None):
+    """Words that are written up to (and including) a cycle, as word index -> value"""
+
+    words = {}
+
+    for record_cycle, word, _, new in records:
+        if cycle is not None and record_cycle > cycle:
+            break
+        words[word] = new
+
+    return words
+
+
+def reconstruct(image, records, cycle=None):
+    """Content of the BRAM at a cycle (the initial image plus the writes of the journal)"""
+
+    words = list(image)
+
+    for word, value in changes(records, cycle).items():
+        words[word] = value
+
+    return words
+
+
+class BramJournal:
+    """Journal the writes of the BRAM of a DebuggerModuleTestingBRAM on each rising edge"""
+
+    def __init__(self, dut, path, memory_path="dataOut_initRegMemFromFileModule", layout=None):
+        hw = handles.registry(dut)
+        layout = layout if layout is not None else manifest.load()
+
+        self.dut = dut
+        self.layout = layout
+        self.enable = hw.get(memory_path + ".io_enable")
+        self.write = hw.get(memory_path + ".io_write")
+        self.addr = hw.get(memory_path + ".io_addr")
+        self.data_in = hw.get(memory_path + ".io_dataIn")
+        self.cells = hw.indexed("mem", memory_path)
+
+        #
+        # With the emulated block RAM delay, the request of a cycle is committed
+        # in the next cycle (see InitRegMemFromFile)
+        #
+        self.delay = layout.configurations["ENABLE_BLOCK_RAM_DELAY"]
+
+        self.writer = JournalWriter(path, len(self.cells), layout.word_size)
+        self.records = []
+        self._task = None
+
+    def _request(self):
+        """The write request on the port (word index, data) or None"""
+
+        if handles.read_int(self.write) != 1:
+            return None
+
+        word = handles.read_int(self.addr) >> 2
+        return (word, handles.read_int(self.data_in)) if word < len(self.cells) else None
+
+    def _commit(self, cycle, request):
+        word, new = request
+
+        #
+        # The cell is read before the registers are updated (the old value)
+        #
+        old = handles.read_int(self.cells[word])
+
+        self.writer.append(cycle, word, old, new)
+        self.records.append((cycle, word, old, new))
+
+    async def _run(self):
+        from cocotb.triggers import RisingEdge
+        from cocotb.utils import get_sim_time
+
+        pending = None
+
+        while True:
+            await RisingEdge(self.dut.clock)
+
+            cycle = int(get_sim_time("ns") // runner.CLOCK_PERIOD_NS)
+            enabled = handles.read_int(self.enable) == 1
+            request = self._request()
+
+            if self.delay:
+                request, pending = pending, request
+
+            if enabled and request is not None:
+                self._commit(cycle, request)
+
+    def start(self):
+        import cocotb
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stop the monitor and close the journal"""
+
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+            self.writer.close()
+
+    def image(self, cycle=None):
+        """Content of the BRAM at a cycle (default: the last journaled write)"""
+
+        return reconstruct(initial_image(self.layout), self.records, cycle)
+
+
+def start(dut, path, memory_path="dataOut_initRegMemFromFileModule"):
+    """Start journaling the writes of the BRAM"""
+
+    return BramJournal(dut, path, memory_path).start()
+
+
+def start_from_environment(dut):
+    """Start journaling the writes of the BRAM into 'HWDBG_BRAM_JOURNAL' (if set)"""
+
+    path = os.environ.get("HWDBG_BRAM_JOURNAL")
+    return start(dut, path) if path else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the writes of a BRAM journal or the BRAM content at a cycle")
+    parser.add_argument("journal", help="path of the journal")
+    parser.add_argument("--cycle", type=int, default=None, help="cycle of the content (default: the end of the journal)")
+    parser.add_argument("--image", default=None, help="initial image (default: BRAM_INITIALIZATION_FILE_PATH of the manifest)")
+    parser.add_argument("--changes", action="store_true", help="print only the words that are written")
+    parser.add_argument("--writes", action="store_true", help="print the writes instead of the content")
+    args = parser.parse_args()
+
+    number_of_words, records = read(args.journal)
+
+    if args.writes:
+        for cycle, word, old, new in records:
+            if args.cycle is None or cycle <= args.cycle:
+                print("%10d  mem_%-4d %08x -> %08x" % (cycle, word, old, new))
+        return 0
+
+    if args.changes:
+        for word, value in sorted(changes(records, args.cycle).items()):
+            print("mem_%-4d %08x" % (word, value))
+        return 0
+
+    image = read_image(args.image, number_of_words) if args.image else initial_image()
+    for word, value in enumerate(reconstruct(image, records, args.cycle)):
+        print("mem_%-4d %08x" % (word, value))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+##
+# @file manifest.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Layout manifest of the generated design
+#
+# @details The manifest ('hwdbg_layout.json') is written next to the generated
+#          (System)Verilog files by the Chisel generators (LayoutManifest), it's
+#          loaded once and its lookup tables are precomputed
+#
+#          The directory is taken from 'HWDBG_GENERATED_DIR' (exported by the
+#          Makefiles of the testbenches), or the "generated" directory of the
+#          repository
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import json
+import os
+
+#
+# Name of the manifest file (LayoutManifest.MANIFEST_FILE_NAME)
+#
+MANIFEST_FILE_NAME = "hwdbg_layout.json"
+
+#
+# Default directory of the generated files
+#
+DEFAULT_GENERATED_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "generated")
+
+#
+# Loaded layouts (by directory)
+#
+_layouts = {}
+
+
+class Layout:
+    """Precomputed lookup tables of the manifest"""
+
+    def __init__(self, content, path):
+        self.path = path
+        self.content = content
+
+        self.version = dict(content["version"])
+        self.configurations = dict(content["configurations"])
+        self.port_pins_map = {int(port): pins for port, pins in content["PORT_PINS_MAP"].items()}
+
+        #
+        # Offsets and widths (in bits) of the fields of DEBUGGER_REMOTE_PACKET
+        #
+        self.offsets = dict(content["DebuggerRemotePacket"]["Offset"])
+        self.widths = dict(content["DebuggerRemotePacket"]["Width"])
+        self.indicator = content["INDICATOR_OF_HYPERDBG_PACKET"]
+
+        #
+        # Enums (name -> value) and their reverse tables (value -> name)
+        #
+        self.packet_types = dict(content["DebuggerRemotePacketType"])
+        self.actions = dict(content["HwdbgActionEnums"])
+        self.responses = dict(content["HwdbgResponseEnums"])
+        self.errors = dict(content["HwdbgErrorEnums"])
+
+        self.packet_type_names = {value: name for name, value in self.packet_types.items()}
+        self.action_names = {value: name for name, value in self.actions.items()}
+        self.response_names = {value: name for name, value in self.responses.items()}
+        self.error_names = {value: name for name, value in self.errors.items()}
+
+        #
+        # BRAM geometry
+        #
+        self.word_size = self.configurations["BLOCK_RAM_DATA_WIDTH"] // 8
+        self.memory_size = self.configurations["DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE"]
+        self.ps_to_pl_base = self.configurations["BASE_ADDRESS_OF_PS_TO_PL_COMMUNICATION"]
+        self.pl_to_ps_base = self.configurations["BASE_ADDRESS_OF_PL_TO_PS_COMMUNICATION"]
+
+    def ps_to_pl_address(self, field):
+        """Address of a field of the PS to PL packet"""
+
+        return self.ps_to_pl_base + self.offsets[field]
+
+    def pl_to_ps_address(self, field):
+        """Address of a field of the PL to PS packet"""
+
+        return self.pl_to_ps_base + self.offsets[field]
+
+    def word_index(self, address):
+        """Index of the BRAM word (e.g., 'mem_N') of an address"""
+
+        return address // self.word_size
+
+
+def generated_directory():
+    """Directory of the generated files of the current run"""
+
+    return os.environ.get("HWDBG_GENERATED_DIR", DEFAULT_GENERATED_DIRECTORY)
+
+
+def use_generated_directory(directory):
+    """Select the directory of the generated files of a command line (before its layout is used)"""
+
+    if directory is not None:
+        os.environ["HWDBG_GENERATED_DIR"] = os.path.abspath(directory)
+
+
+def load(directory=None):
+    """Load (once) the manifest of a directory of generated files"""
+
+    directory = os.path.abspath(directory if directory is not None else generated_directory())
+    layout = _layouts.get(directory)
+
+    if layout is None:
+        path = os.path.join(directory, MANIFEST_FILE_NAME)
+
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                "layout manifest not found: " + path + " (generate the design by 'sbt \"runMain hwdbg.MainWithInitializedBRAM\"')")
+
+        with open(path, "r") as file:
+            layout = Layout(json.load(file), path)
+
+        _layouts[directory] = layout
+
+    return layout
@@ -0,0 +1,185 @@
+##
+# @file multi.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief PS drivers of the cores of the multi-instance testing module
+#
+# @details DebuggerModuleTestingBRAMMulti contains N independent cores (core_N,
+#          each a DebuggerModuleTestingBRAM with its own BRAM) and their ports
+#          are io_cores_N_*. Each core is driven by its own PS driver (a cocotb
+#          coroutine), so the requests of all of the cores are pending at the
+#          same time and the latency is measured per core
+#
+#            drivers = multi.drivers(dut)
+#            await multi.run_concurrently(drivers, requests_of_each_core)
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+from harness import handles, packet, traffic
+
+#
+# Expected response of each action (the actions that do not read a buffer)
+#
+EXPECTED_RESPONSES = {
+    "hwdbgActionSendVersion": "hwdbgResponseVersion",
+    "hwdbgActionSendPinInformation": "hwdbgResponsePinInformation",
+}
+
+#
+# Maximum number of the clock cycles of a request (before it's reported as a hang)
+#
+DEFAULT_LIMIT_CYCLES = 1000
+
+
+def core_names(dut):
+    """Names of the core instances (core_N), ordered by N"""
+
+    return handles.registry(dut).indexed_names("core")
+
+
+class CoreDriver:
+    """PS driver of one core (writes the requests into its BRAM and waits for its interrupt)"""
+
+    def __init__(self, dut, index, memory_path="dataOut_initRegMemFromFileModule"):
+        hw = handles.registry(dut)
+
+        self.dut = dut
+        self.index = index
+        self.prefix = "io_cores_" + str(index) + "_"
+
+        self.en = hw.get(self.prefix + "en")
+        self.pl_in_signal = hw.get(self.prefix + "plInSignal")
+        self.ps_out_interrupt = hw.get(self.prefix + "psOutInterrupt")
+        self.input_pins = hw.indexed(self.prefix + "inputPin")
+        self.output_pins = hw.indexed(self.prefix + "outputPin")
+
+        self.cells = hw.indexed("mem", "core_" + str(index) + "." + memory_path)
+        self.latencies = []
+        self.action_latencies = {}
+        self.hangs = 0
+
+    def idle(self, input_pin_values=(0,)):
+        """Drive the inputs of the core before the reset"""
+
+        self.en.value = 0
+        self.pl_in_signal.value = 0
+
+        for index, input_pin in enumerate(self.input_pins):
+            input_pin.value = input_pin_values[index % len(input_pin_values)]
+
+    def enable(self):
+        self.en.value = 1
+
+    async def request(self, words, limit_cycles=DEFAULT_LIMIT_CYCLES):
+        """Send a request packet, returns the response packet (or None if the core hangs)"""
+
+        from cocotb.triggers import RisingEdge
+
+        clock = self.dut.clock
+
+        #
+        # Copy the request into the PS to PL area of the BRAM of the core
+        #
+        layout = packet.layout()
+
+        first_cell = layout.word_index(layout.ps_to_pl_base)
+        for index, word in enumerate(words):
+            self.cells[first_cell + index].value = word
+
+        self.pl_in_signal.value = 1
+        await RisingEdge(clock)
+        self.pl_in_signal.value = 0
+
+        cycles = 1
+        while handles.read_int(self.ps_out_interrupt) != 1:
+            if cycles >= limit_cycles:
+                self.hangs = self.hangs + 1
+                return None
+
+            await RisingEdge(clock)
+            cycles = cycles + 1
+
+        #
+        # Apply the latest BRAM modifications, then read the response
+        #
+        await RisingEdge(clock)
+
+        first_cell = layout.word_index(layout.pl_to_ps_base)
+        last_cell = layout.word_index(layout.memory_size)
+        response = [handles.read_int(cell) for cell in self.cells[first_cell:last_cell]]
+
+        self.latencies.append(cycles)
+        return packet.parse_packet(response)
+
+    async def run(self, requests, gap_cycles=0):
+        """Send the requests (action names) in order, returns the (action, response) pairs"""
+
+        from cocotb.triggers import ClockCycles
+
+        results = []
+
+        for action in requests:
+            response = await self.request(packet.build_packet(packet.layout().actions[action]))
+            results.append((action, response))
+
+            if response is not None:
+                self.action_latencies.setdefault(action, []).append(self.latencies[-1])
+
+            if gap_cycles:
+                await ClockCycles(self.dut.clock, gap_cycles)
+
+        return results
+
+
+def drivers(dut):
+    """The drivers of all of the cores of the design"""
+
+    return [CoreDriver(dut, handles.extract_number(name)) for name in core_names(dut)]
+
+
+def check_response(action, response):
+    """Check the response of a request, returns the error (or None)"""
+
+    if response is None:
+        return "no interrupt (the core hangs)"
+
+    layout = packet.layout()
+
+    if response["type"] != layout.packet_types["DEBUGGEE_TO_DEBUGGER_HARDWARE_LEVEL"]:
+        return "unexpected packet type " + str(response["type"])
+
+    expected = layout.responses[EXPECTED_RESPONSES[action]]
+    if response["requested_action"] != expected:
+        return "unexpected response %d (expected %d)" % (response["requested_action"], expected)
+
+    return None
+
+
+async def run_concurrently(core_drivers, requests_of_each_core, gap_cycles=0):
+    """Run the requests of all of the cores at the same time, returns the results of each core"""
+
+    import cocotb
+
+    tasks = [cocotb.start_soon(driver.run(requests, gap_cycles))
+             for driver, requests in zip(core_drivers, requests_of_each_core)]
+
+    return [await task for task in tasks]
+
+
+def format_report(core_drivers):
+    """Latency of each core (and of all of the cores) in lines"""
+
+    lines = [traffic.format_summary("core_%d latency (cycles)" % driver.index, traffic.summarize(driver.latencies))
+             + (" hangs=%d" % driver.hangs if driver.hangs else "")
+             for driver in core_drivers]
+
+    every_latency = [latency for driver in core_drivers for latency in driver.latencies]
+    lines.append(traffic.format_summary("all cores latency (cycles)", traffic.summarize(every_latency)))
+
+    return lines
@@ -0,0 +1,86 @@
+##
+# @file packet.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Layout of the HyperDbg remote packets (DEBUGGER_REMOTE_PACKET) in the BRAM
+#
+# @details The values are loaded from the layout manifest of the generated design
+#          (see manifest.py) on their first use
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+from harness import manifest
+
+
+def layout():
+    """The layout of the generated design (manifest.Layout)
+
+    It's loaded on the first use (and cached by the manifest), so the directory
+    of the generated files can be selected after the import, e.g., by the
+    --generated option of the command lines
+    """
+
+    return manifest.load()
+
+
+def build_packet(requested_action, payload=(), packet_type=None, indicator=None, checksum=0):
+    """Build the words of a packet (starting from the checksum) as they are stored in the BRAM
+
+    The packet type and the indicator are the ones of a debugger to debuggee packet by default
+    """
+
+    current = layout()
+    offsets = current.offsets
+
+    if packet_type is None:
+        packet_type = current.packet_types["DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL"]
+    if indicator is None:
+        indicator = current.indicator
+
+    words = [0] * current.word_index(offsets["startOfDataBuffer"])
+
+    words[current.word_index(offsets["checksum"])] = checksum & 0xffffffff
+    words[current.word_index(offsets["indicator"])] = indicator & 0xffffffff
+    words[current.word_index(offsets["indicator"]) + 1] = (indicator >> 32) & 0xffffffff
+    words[current.word_index(offsets["typeOfThePacket"])] = packet_type
+    words[current.word_index(offsets["requestedActionOfThePacket"])] = requested_action
+
+    return words + [word & 0xffffffff for word in payload]
+
+
+def parse_packet(words):
+    """Interpret the words of a packet (starting from the checksum)"""
+
+    current = layout()
+    offsets = current.offsets
+    indicator = current.word_index(offsets["indicator"])
+
+    return {
+        "checksum": words[current.word_index(offsets["checksum"])],
+        "indicator": words[indicator] | (words[indicator + 1] << 32),
+        "type": words[current.word_index(offsets["typeOfThePacket"])],
+        "requested_action": words[current.word_index(offsets["requestedActionOfThePacket"])],
+        "payload": list(words[current.word_index(offsets["startOfDataBuffer"]):]),
+    }
+
+
+def field_name(offset):
+    """Name of the field of a packet at an offset (relative to the base of the packet)"""
+
+    offsets = layout().offsets
+
+    if offset < offsets["indicator"]:
+        return "Checksum"
+    elif offset < offsets["typeOfThePacket"]:
+        return "Indicator"
+    elif offset < offsets["requestedActionOfThePacket"]:
+        return "TypeOfThePacket"
+    elif offset < offsets["startOfDataBuffer"]:
+        return "RequestedActionOfThePacket"
+    return "Data"
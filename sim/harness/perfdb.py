@@ -0,0 +1,411 @@
+##
+# @file perfdb.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Historical store of the performance metrics of the simulations
+#
+# @details Every run of a suite (by the regression runner) is appended to a local
+#          SQLite database with its commit, the configurations of the generated
+#          design, the simulator, the wall time, the simulated cycles and the
+#          simulated ns per second of each test, and the metrics that are
+#          reported by the testbenches themselves (e.g., the cycles of each
+#          action). The report command prints the trend of each metric across
+#          the runs and flags the step changes, so the slow drifts of the RTL
+#          latency or of the simulation speed are caught early
+#
+#            python3 -m harness.regress                      (appends the runs)
+#            python3 -m harness.perfdb runs --last 20
+#            python3 -m harness.perfdb report --metric "*cycles*" --plot trends.png
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+
+from harness import manifest, runner, sweep
+
+#
+# Default location of the database (overridden by 'HWDBG_PERFDB')
+#
+DEFAULT_DATABASE = os.path.join(runner.SIM_DIRECTORY, "perfdb.sqlite")
+
+#
+# Defaults of the detection of the step changes (number of the runs before and
+# after each run, and the minimum relative change of their means)
+#
+DEFAULT_WINDOW = 5
+DEFAULT_THRESHOLD = 0.05
+
+#
+# Number of the hex digits of the hash of the configurations (in the reports)
+#
+CONFIGURATIONS_HASH_DIGITS = 8
+
+#
+# Characters of the trend lines
+#
+SPARK_CHARACTERS = " .:-=+*#%@"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    commit_hash TEXT,
+    dirty INTEGER,
+    suite TEXT NOT NULL,
+    simulator TEXT,
+    seed INTEGER,
+    configurations TEXT,
+    passed INTEGER,
+    wall_time REAL
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    name TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS metrics_of_name ON metrics(name, run_id);
+"""
+
+
+def database_path():
+    return os.environ.get("HWDBG_PERFDB", DEFAULT_DATABASE)
+
+
+def connect(path=None):
+    """Open (and create if needed) the database"""
+
+    connection = sqlite3.connect(path or database_path(), timeout=30)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def metric(name, value):
+    """Report a metric of a testbench (appended to 'HWDBG_PERF_METRICS' if it's set by the runner)"""
+
+    path = os.environ.get("HWDBG_PERF_METRICS")
+    if not path:
+        return
+
+    with open(path, "a") as file:
+        file.write(json.dumps({"name": name, "value": value}) + "\n")
+
+
+def read_metrics(path):
+    """The metrics that are reported by the testbenches of a run as (name, value) pairs"""
+
+    metrics = []
+
+    if not os.path.exists(path):
+        return metrics
+
+    with open(path, "r") as file:
+        for line in file:
+            if line.strip():
+                item = json.loads(line)
+                metrics.append((item["name"], float(item["value"])))
+
+    return metrics
+
+
+def git_commit():
+    """The current commit of the project and whether the tree is modified, or (None, None)"""
+
+    try:
+        commit = subprocess.run(["git", "-C", runner.ROOT_DIRECTORY, "rev-parse", "HEAD"],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout.decode().strip()
+        status = subprocess.run(["git", "-C", runner.ROOT_DIRECTORY, "status", "--porcelain", "--untracked-files=no"],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout.decode()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+    return commit, int(status.strip() != "")
+
+
+def suite_metrics(result, build_directory):
+    """Metrics of a run of a suite (the timing of each test and the metrics of the testbenches)"""
+
+    metrics = []
+
+    for test in result.tests:
+        if test.skipped:
+            continue
+
+        metrics.append((test.name + ".sim_cycles", float(test.sim_cycles)))
+        metrics.append((test.name + ".wall_time", test.wall_time))
+
+        if test.wall_time > 0:
+            metrics.append((test.name + ".sim_ns_per_second", test.sim_time_ns / test.wall_time))
+
+    metrics.append(("suite.wall_time", result.wall_time))
+
+    return metrics + read_metrics(os.path.join(build_directory, runner.PERF_METRICS_FILE_NAME))
+
+
+def record(result, build_directory, simulator, seed=None, generated_directory=runner.DEFAULT_GENERATED_DIRECTORY, path=None):
+    """Append a run of a suite to the database, returns the identifier of the run"""
+
+    commit, dirty = git_commit()
+
+    try:
+        configurations = manifest.load(generated_directory).configurations
+    except FileNotFoundError:
+        configurations = {}
+
+    connection = connect(path)
+
+    with connection:
+        cursor = connection.execute(
+            "INSERT INTO runs (date, commit_hash, dirty, suite, simulator, seed, configurations, passed, wall_time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (time.strftime("%Y-%m-%d %H:%M:%S"), commit, dirty, result.suite, simulator, seed,
+             json.dumps(configurations, sort_keys=True), int(result.passed), result.wall_time)
+        )
+        run_id = cursor.lastrowid
+
+        connection.executemany(
+            "INSERT INTO metrics (run_id, name, value) VALUES (?, ?, ?)",
+            [(run_id, name, value) for name, value in suite_metrics(result, build_directory)]
+        )
+
+    connection.close()
+    return run_id
+
+
+def configurations_hash(configurations):
+    """Short hash of the configurations of a run (as they are stored, JSON with sorted keys)"""
+
+    return hashlib.sha256((configurations or "{}").encode()).hexdigest()[:CONFIGURATIONS_HASH_DIGITS]
+
+
+def runs(connection, suite=None, last=None):
+    """The runs (newest first) as (id, date, commit, dirty, suite, configurations hash, simulator, seed, passed, wall time)"""
+
+    query = "SELECT id, date, commit_hash, dirty, suite, configurations, simulator, seed, passed, wall_time FROM runs"
+    parameters = []
+
+    if suite is not None:
+        query = query + " WHERE suite = ?"
+        parameters.append(suite)
+
+    query = query + " ORDER BY id DESC"
+
+    if last is not None:
+        query = query + " LIMIT ?"
+        parameters.append(last)
+
+    return [row[:5] + (configurations_hash(row[5]),) + row[6:] for row in connection.execute(query, parameters)]
+
+
+def series(connection, suite=None, simulator=None, pattern="*", last=None, seed=None, configurations=None):
+    """Values of the metrics across the (passed) runs, as (suite, metric, configurations hash, seed) -> [(run id, date, commit, value)]
+
+    The runs of different configurations (or seeds) are different series, so a
+    change of the design or of the stimulus is not reported as a step change
+    """
+
+    query = ("SELECT runs.suite, metrics.name, runs.configurations, runs.seed, runs.id, runs.date, runs.commit_hash, metrics.value "
+             "FROM metrics JOIN runs ON metrics.run_id = runs.id WHERE runs.passed = 1")
+    parameters = []
+
+    if suite is not None:
+        query = query + " AND runs.suite = ?"
+        parameters.append(suite)
+
+    if simulator is not None:
+        query = query + " AND runs.simulator = ?"
+        parameters.append(simulator)
+
+    if seed is not None:
+        query = query + " AND runs.seed = ?"
+        parameters.append(seed)
+
+    result = {}
+
+    for suite_name, name, run_configurations, run_seed, run_id, date, commit, value in \
+            connection.execute(query + " ORDER BY runs.id", parameters):
+        configuration = configurations_hash(run_configurations)
+
+        if fnmatch.fnmatch(name, pattern) and (configurations is None or configuration.startswith(configurations)):
+            result.setdefault((suite_name, name, configuration, run_seed), []).append((run_id, date, commit, value))
+
+    if last is not None:
+        result = {key: points[-last:] for key, points in result.items()}
+
+    return result
+
+
+def step_changes(values, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+    """Find the step changes of a series, returns (index, mean before, mean after, relative change)
+
+    The mean of (up to) 'window' values before each point is compared with the
+    mean of the point and the values after it. The difference of the means
+    peaks at the first point of a step, so only the point with the largest
+    difference of its neighborhood is reported for each step (the relative
+    change, which is infinite after a zero mean, is only compared with the
+    threshold)
+    """
+
+    changes = []
+    differences = []
+
+    for index in range(1, len(values)):
+        before = statistics.fmean(values[max(0, index - window):index])
+        after = statistics.fmean(values[index:index + window])
+
+        if before == after:
+            changes.append(0.0)
+        elif before == 0:
+            changes.append(float("inf"))
+        else:
+            changes.append((after - before) / abs(before))
+
+        differences.append(abs(after - before))
+
+    steps = []
+
+    for index, change in enumerate(changes):
+        difference = differences[index]
+        previous = differences[max(0, index - window + 1):index]
+        following = differences[index + 1:index + window]
+
+        if abs(change) >= threshold and all(difference > item for item in previous) and \
+                all(difference >= item for item in following):
+            point = index + 1
+            steps.append((point,
+                          statistics.fmean(values[max(0, point - window):point]),
+                          statistics.fmean(values[point:point + window]),
+                          change))
+
+    return steps
+
+
+def sparkline(values):
+    """A one-line trend of a series"""
+
+    if not values:
+        return ""
+
+    low = min(values)
+    high = max(values)
+
+    if high == low:
+        return SPARK_CHARACTERS[len(SPARK_CHARACTERS) // 2] * len(values)
+
+    return "".join(SPARK_CHARACTERS[int((value - low) / (high - low) * (len(SPARK_CHARACTERS) - 1))] for value in values)
+
+
+def trend_order(item):
+    """Order of the series in the reports (the unseeded runs first)"""
+
+    suite, name, configuration, seed = item[0]
+    return suite, name, configuration, -1 if seed is None else seed
+
+
+def plot(trends, path):
+    """Plot the series of the metrics (one subplot per metric) into an image"""
+
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as pyplot
+
+    figure, axes = pyplot.subplots(len(trends), 1, figsize=(10, 2.5 * len(trends)), squeeze=False)
+
+    for axis, ((suite, name, configuration, seed), points) in zip(axes[:, 0], sorted(trends.items(), key=trend_order)):
+        axis.plot([point[0] for point in points], [point[3] for point in points], marker=".")
+        axis.set_title("%s: %s (configurations %s, seed %s)" % (suite, name, configuration, seed), fontsize=9)
+        axis.set_xlabel("run")
+
+    figure.tight_layout()
+    figure.savefig(path)
+
+
+def report(trends, window=DEFAULT_WINDOW, threshold=DEFAULT_THRESHOLD):
+    """Lines of the report of the trends and their step changes"""
+
+    rows = []
+    lines = []
+
+    for (suite, name, configuration, seed), points in sorted(trends.items(), key=trend_order):
+        values = [point[3] for point in points]
+        steps = step_changes(values, window, threshold)
+
+        rows.append([suite, name, configuration, seed, len(values), "%.6g" % values[0], "%.6g" % values[-1], sparkline(values),
+                     len(steps)])
+
+        for index, before, after, change in steps:
+            run_id, date, commit, _ = points[index]
+            lines.append("[!] %s: %s (configurations %s, seed %s) changed %+.1f%% (%.6g -> %.6g) at run %d (%s, commit %s)" % (
+                suite, name, configuration, seed, 100.0 * change, before, after, run_id, date, (commit or "unknown")[:12]))
+
+    table = sweep.format_table(["suite", "metric", "config", "seed", "runs", "first", "last", "trend", "steps"], rows)
+    return [table] + lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the historical performance metrics of the simulations")
+    parser.add_argument("--database", default=None, help="path of the database (default: HWDBG_PERFDB or sim/perfdb.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs_parser = commands.add_parser("runs", help="list the recorded runs")
+    runs_parser.add_argument("--suite", default=None, help="only the runs of a suite")
+    runs_parser.add_argument("--last", type=int, default=20, help="number of the listed runs")
+
+    report_parser = commands.add_parser("report", help="print the trends of the metrics and flag their step changes")
+    report_parser.add_argument("--suite", default=None, help="only the runs of a suite")
+    report_parser.add_argument("--simulator", default=None, help="only the runs of a simulator")
+    report_parser.add_argument("--seed", type=int, default=None, help="only the runs of a seed")
+    report_parser.add_argument("--configurations", default=None, help="only the runs of a configurations hash (or its prefix)")
+    report_parser.add_argument("--metric", default="*", help="pattern of the names of the metrics (e.g., '*cycles*')")
+    report_parser.add_argument("--last", type=int, default=None, help="only the last runs of each metric")
+    report_parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="runs before and after each step")
+    report_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="minimum relative change of a step")
+    report_parser.add_argument("--plot", default=None, help="plot the trends into an image (requires matplotlib)")
+    report_parser.add_argument("--fail-on-step", action="store_true", help="exit with an error if a step change is found")
+
+    args = parser.parse_args()
+    connection = connect(args.database)
+
+    if args.command == "runs":
+        rows = [[run_id, date, (commit or "unknown")[:12] + ("+" if dirty else ""), suite, configuration, simulator, seed,
+                 "PASS" if passed else "FAIL", "%.2f" % wall_time]
+                for run_id, date, commit, dirty, suite, configuration, simulator, seed, passed, wall_time in
+                runs(connection, args.suite, args.last)]
+        print(sweep.format_table(["run", "date", "commit", "suite", "config", "simulator", "seed", "status", "wall (s)"], rows))
+        return 0
+
+    trends = series(connection, args.suite, args.simulator, args.metric, args.last, args.seed, args.configurations)
+
+    if not trends:
+        print("[*] no metric is recorded in " + (args.database or database_path()))
+        return 0
+
+    lines = report(trends, args.window, args.threshold)
+    print("\n".join(lines))
+
+    if args.plot:
+        try:
+            plot(trends, args.plot)
+            print("[*] the trends are plotted into " + args.plot)
+        except ImportError:
+            print("[!] matplotlib is required to plot the trends (pip install matplotlib)")
+
+    return 1 if args.fail_on_step and len(lines) > 1 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
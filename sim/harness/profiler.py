@@ -0,0 +1,229 @@
+##
+# @file profiler.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Stage utilization profiler of the script execution engine
+#
+# @details Each pin sample moves through all of the stage registers of
+#          ScriptExecutionEngine, but a stage is only evaluated (by its
+#          ScriptEngineEval) when 'i.U === stageRegs(i).targetStage', otherwise
+#          the sample is passed to the next stage. The profiler samples the
+#          target stage of every stage register on each rising edge into a
+#          NumPy buffer and accumulates, per script (a named section of the run),
+#          how often each stage is evaluated or skipped, the histogram of the
+#          target stages and the last evaluated stage, i.e., the number of the
+#          stages (and the pin to output latency) that the script needs
+#
+#            stages = profiler.start(dut); stages.section("send_version"); ...
+#            for line in profiler.format_report(stages.stop()): dut._log.info(line)
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+import re
+
+import numpy as np
+
+from harness import handles, manifest
+
+#
+# Number of the sampled cycles that are buffered before they are accumulated
+#
+CHUNK_CYCLES = 4096
+
+#
+# Name of the stage registers of the target stage (flattened by firtool)
+#
+TARGET_STAGE_PATTERN = "stageRegs_*_targetStage"
+
+#
+# Target stage of the cycles where the register is not resolvable (X or Z)
+#
+UNRESOLVED = -1
+
+
+def stage_index(path):
+    return int(re.search(r"stageRegs_(\d+)_targetStage$", path).group(1))
+
+
+class StageCounters:
+    """Accumulated counters of a section (a script) of the run"""
+
+    def __init__(self, stages, maximum_number_of_stages):
+        self.stages = stages
+        self.maximum_number_of_stages = maximum_number_of_stages
+        self.cycles = 0
+        self.valid = np.zeros(len(stages), dtype=np.int64)
+        self.evaluated = np.zeros(len(stages), dtype=np.int64)
+        self.targets = np.zeros((len(stages), maximum_number_of_stages), dtype=np.int64)
+
+        #
+        # Only the middle stages are evaluated (the first stage receives the
+        # input pins and the last stage drives the output pins)
+        #
+        self.stage_numbers = np.asarray(stages)
+        self.evaluable = (self.stage_numbers >= 1) & (self.stage_numbers <= maximum_number_of_stages - 2)
+
+    def accumulate(self, samples):
+        """Accumulate a buffer of samples (cycles x stages)"""
+
+        valid = samples != UNRESOLVED
+
+        self.cycles = self.cycles + samples.shape[0]
+        self.valid += valid.sum(axis=0)
+        self.evaluated += ((samples == self.stage_numbers) & self.evaluable).sum(axis=0)
+
+        for column in range(samples.shape[1]):
+            values = samples[valid[:, column], column]
+            values = values[values < self.targets.shape[1]]
+            self.targets[column] += np.bincount(values, minlength=self.targets.shape[1])
+
+    def report(self):
+        """Per-stage occupancy and the sizing of the pipeline of the section"""
+
+        valid = np.maximum(self.valid, 1)
+        evaluated_stages = [stage for stage, count in zip(self.stages, self.evaluated) if count]
+        last_evaluated = max(evaluated_stages) if evaluated_stages else None
+
+        return {
+            "cycles": self.cycles,
+            "stages": list(self.stages),
+            "valid": self.valid.tolist(),
+            "evaluated": self.evaluated.tolist(),
+            "occupancy": (self.evaluated / valid).tolist(),
+            "skipped_ratio": ((self.valid - self.evaluated) / valid).tolist(),
+            "targets": self.targets.tolist(),
+            "last_evaluated_stage": last_evaluated,
+
+            #
+            # The result of the last evaluated stage is stored in the next stage,
+            # then it's passed to the output (one register per cycle)
+            #
+            "required_stages": last_evaluated + 2 if last_evaluated is not None else 1,
+
+            #
+            # The configured depth (not a measured latency), to compare the
+            # required stages against
+            #
+            "configured_pipeline_depth": self.maximum_number_of_stages,
+        }
+
+
+class StageProfiler:
+    """Sample the target stages of ScriptExecutionEngine on each rising edge"""
+
+    def __init__(self, dut, maximum_number_of_stages=None):
+        hw = handles.registry(dut)
+        paths = sorted(hw.find(TARGET_STAGE_PATTERN), key=stage_index)
+
+        if not paths:
+            raise LookupError("no stage register (" + TARGET_STAGE_PATTERN + ") is found in the design")
+
+        #
+        # The constant or unused registers (e.g., the target stage of the first
+        # stage) may be removed by firtool, only the remaining ones are sampled
+        #
+        self.dut = dut
+        self.stages = [stage_index(path) for path in paths]
+        self.registers = [hw.get(path) for path in paths]
+        self.maximum_number_of_stages = maximum_number_of_stages if maximum_number_of_stages is not None else \
+            manifest.load().configurations["MAXIMUM_NUMBER_OF_STAGES"]
+
+        self._buffer = np.empty((CHUNK_CYCLES, len(self.registers)), dtype=np.int64)
+        self._rows = 0
+        self._section = "run"
+        self.sections = {}
+        self._task = None
+
+    def _counters(self):
+        counters = self.sections.get(self._section)
+
+        if counters is None:
+            counters = StageCounters(self.stages, self.maximum_number_of_stages)
+            self.sections[self._section] = counters
+
+        return counters
+
+    def _accumulate(self):
+        if self._rows:
+            self._counters().accumulate(self._buffer[:self._rows])
+            self._rows = 0
+
+    def section(self, name):
+        """Start accumulating the next cycles into another section (e.g., another script)"""
+
+        self._accumulate()
+        self._section = name
+
+    def sample(self):
+        row = self._buffer[self._rows]
+
+        for column, register in enumerate(self.registers):
+            row[column] = handles.read_int(register, UNRESOLVED)
+
+        self._rows = self._rows + 1
+        if self._rows == CHUNK_CYCLES:
+            self._accumulate()
+
+    async def _run(self):
+        from cocotb.triggers import RisingEdge
+
+        while True:
+            await RisingEdge(self.dut.clock)
+            self.sample()
+
+    def start(self):
+        import cocotb
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stop the sampling, returns the report of each section"""
+
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+        self._accumulate()
+        return {name: counters.report() for name, counters in self.sections.items()}
+
+
+def start(dut, maximum_number_of_stages=None):
+    """Start profiling the stages of the script execution engine"""
+
+    return StageProfiler(dut, maximum_number_of_stages).start()
+
+
+def start_from_environment(dut):
+    """Start profiling the stages if 'HWDBG_STAGE_PROFILE' is set"""
+
+    return start(dut) if os.environ.get("HWDBG_STAGE_PROFILE", "0") != "0" else None
+
+
+def format_report(reports):
+    """Lines of the reports of the sections"""
+
+    lines = []
+
+    for name, report in reports.items():
+        lines.append("[%s] %d cycles, last evaluated stage: %s, required stages: %d (of the configured %d)" % (
+            name, report["cycles"], report["last_evaluated_stage"], report["required_stages"],
+            report["configured_pipeline_depth"]))
+
+        for index, stage in enumerate(report["stages"]):
+            targets = report["targets"][index]
+            frequent = sorted(range(len(targets)), key=lambda target: -targets[target])[:3]
+
+            lines.append("  stage %3d: occupancy %6.2f%%  skipped %6.2f%%  targets %s" % (
+                stage, 100.0 * report["occupancy"][index], 100.0 * report["skipped_ratio"][index],
+                " ".join("%d:%d" % (target, targets[target]) for target in frequent if targets[target])))
+
+    return lines
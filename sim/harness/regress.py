@@ -0,0 +1,322 @@
+##
+# @file regress.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Regression runner with a cache of the passed results
+#
+# @details Each entry (suite, seed) is keyed on the hash of its generated Verilog
+#          files (and the layout manifest), the testbench sources and the harness
+#          modules that it imports, the design configurations, the BRAM images, the simulator, the seed and
+#          the 'HWDBG_*' environment variables. The passed entries are replayed
+#          from the cache, so only the affected entries are simulated again:
+#
+#            python3 -m harness.regress --seed 1 2 3
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import ast
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import socket
+import sys
+import time
+
+from harness import manifest, perfdb, runner, sweep
+
+#
+# Directories of the cache and the builds of the entries
+#
+REGRESS_CACHE_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "regress_cache")
+REGRESS_BUILD_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "regress_build")
+
+#
+# Sources shared by all of the entries (the harness modules are hashed per
+# suite, only the ones that its testbench imports)
+#
+HARNESS_PACKAGE = "harness"
+HARNESS_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "harness")
+CONFIGURATION_SOURCES = os.path.join(runner.ROOT_DIRECTORY, "src", "main", "scala", "hwdbg", "configs")
+BRAM_IMAGES_DIRECTORY = os.path.join(runner.ROOT_DIRECTORY, "src", "test", "bram")
+
+#
+# Extensions of the testbench sources (in the directory of each suite)
+#
+TESTBENCH_EXTENSIONS = (".py", ".sh", "Makefile")
+
+#
+# The default seed (the results of an unseeded run can not be replayed)
+#
+DEFAULT_SEED = 1
+
+
+class Entry:
+    """One simulator invocation of the regression (a suite with a seed)"""
+
+    def __init__(self, suite, seed, key):
+        self.suite = suite
+        self.seed = seed
+        self.key = key
+
+    @property
+    def name(self):
+        return self.suite + "-seed" + str(self.seed)
+
+
+def verilog_sources(suite, generated_directory):
+    """The generated files of a suite (VERILOG_SOURCES of its Makefile)"""
+
+    makefile = os.path.join(runner.SUITES[suite], "Makefile")
+
+    with open(makefile, "r") as file:
+        names = re.findall(r"^VERILOG_SOURCES\s*\+?=\s*\$\(GENERATED_DIR\)/(\S+)", file.read(), re.MULTILINE)
+
+    #
+    # A suite without sources would be keyed on nothing of the design
+    #
+    if not names:
+        raise ValueError("no generated file is found in VERILOG_SOURCES of the suite " + suite + " (" + makefile + ")")
+
+    return [os.path.join(generated_directory, name) for name in names]
+
+
+def testbench_sources(suite):
+    """The testbench files of a suite"""
+
+    directory = runner.SUITES[suite]
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory)) if name.endswith(TESTBENCH_EXTENSIONS)]
+
+
+def imported_harness_modules(path):
+    """Names of the harness modules that a Python source imports"""
+
+    with open(path, "r") as file:
+        tree = ast.parse(file.read(), path)
+
+    names = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            if node.module == HARNESS_PACKAGE:
+                names.update(alias.name for alias in node.names)
+            elif node.module.startswith(HARNESS_PACKAGE + "."):
+                names.add(node.module.split(".")[1])
+
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                if alias.name.startswith(HARNESS_PACKAGE + "."):
+                    names.add(alias.name.split(".")[1])
+
+    return names
+
+
+def harness_sources(suite):
+    """The harness modules that the testbench of a suite imports (directly or through other modules)"""
+
+    sources = {os.path.join(HARNESS_DIRECTORY, "__init__.py")}
+    pending = [path for path in testbench_sources(suite) if path.endswith(".py")]
+
+    while pending:
+        for name in imported_harness_modules(pending.pop()):
+            path = os.path.join(HARNESS_DIRECTORY, name + ".py")
+            if os.path.exists(path) and path not in sources:
+                sources.add(path)
+                pending.append(path)
+
+    return sorted(sources)
+
+
+def hwdbg_environment(extra_env=None):
+    """The 'HWDBG_*' environment variables (they configure the testbenches)"""
+
+    environment = dict(os.environ)
+    environment.update(extra_env or {})
+
+    return {name: value for name, value in sorted(environment.items()) if name.startswith("HWDBG_") and name != "HWDBG_GENERATED_DIR"}
+
+
+def shared_sources_hash():
+    """Hash of the sources shared by all of the entries"""
+
+    return sweep.hash_files([CONFIGURATION_SOURCES, BRAM_IMAGES_DIRECTORY])
+
+
+def entry_key(suite, seed, simulator, generated_directory, shared_hash, testcase=None, extra_env=None):
+    """Key of an entry in the cache (a whole suite, or a single test of it)"""
+
+    generated_files = verilog_sources(suite, generated_directory)
+    generated_files.append(os.path.join(generated_directory, manifest.MANIFEST_FILE_NAME))
+
+    description = json.dumps({
+        "suite": suite,
+        "seed": seed,
+        "simulator": simulator,
+        "generated": sweep.hash_files(generated_files),
+        "testbench": sweep.hash_files(testbench_sources(suite)),
+        "harness": sweep.hash_files(harness_sources(suite)),
+        "shared": shared_hash,
+        "testcase": testcase,
+        "environment": hwdbg_environment(extra_env),
+    }, sort_keys=True)
+
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def plan(suites, seeds, simulator, generated_directory):
+    """Create the entries of the regression"""
+
+    shared_hash = shared_sources_hash()
+
+    return [
+        Entry(suite, seed, entry_key(suite, seed, simulator, generated_directory, shared_hash))
+        for suite in suites
+        for seed in seeds
+    ]
+
+
+def cache_path(key):
+    return os.path.join(REGRESS_CACHE_DIRECTORY, key + ".json")
+
+
+def lookup(key):
+    """Get the cached (passed) result of a key or None"""
+
+    path = cache_path(key)
+
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def result_record(result):
+    """Serializable record of the result of a suite"""
+
+    return {
+        "wall_time": result.wall_time,
+        "tests": [
+            {"name": test.name, "passed": test.passed, "skipped": test.skipped,
+             "sim_time_ns": test.sim_time_ns, "wall_time": test.wall_time}
+            for test in result.tests
+        ],
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+
+def store(key, result):
+    """Cache the result of a key (only the passed results are cached)"""
+
+    if not result.passed:
+        return
+
+    record = result_record(result)
+    record["suite"] = result.suite
+
+    os.makedirs(REGRESS_CACHE_DIRECTORY, exist_ok=True)
+    write_json(cache_path(key), record)
+
+
+def write_json(path, content):
+    """Write a JSON file atomically (parallel runs never read a partial file)"""
+
+    temporary_path = path + "." + socket.gethostname() + "." + str(os.getpid()) + ".tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(content, file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def run_entry(entry, simulator, generated_directory, perf_database=None):
+    """Simulate an entry, cache its result and append its metrics to the performance database"""
+
+    build_directory = os.path.join(REGRESS_BUILD_DIRECTORY, entry.name)
+
+    result = runner.run_suite(
+        entry.suite,
+        build_directory,
+        generated_directory,
+        simulator,
+        entry.seed,
+    )
+    store(entry.key, result)
+
+    if perf_database is not None:
+        perfdb.record(result, build_directory, simulator, entry.seed, generated_directory, perf_database)
+
+    return result
+
+
+def summary_row(entry, status, tests, sim_cycles, wall_time):
+    passed_tests = sum(1 for test in tests if test["passed"])
+    return [entry.suite, entry.seed, status, str(passed_tests) + "/" + str(len(tests)), sim_cycles, "%.2f" % wall_time]
+
+
+def result_row(entry, result):
+    tests = [{"passed": test.passed} for test in result.tests]
+    return summary_row(entry, "PASS" if result.passed else "FAIL", tests, result.sim_cycles, result.wall_time)
+
+
+def cached_row(entry, record):
+    sim_cycles = sum(int(test["sim_time_ns"] // runner.CLOCK_PERIOD_NS) for test in record["tests"])
+    return summary_row(entry, "CACHED", record["tests"], sim_cycles, 0.0)
+
+
+HEADER = ["suite", "seed", "status", "tests", "sim cycles", "wall (s)"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the cocotb suites, the unchanged passed entries are replayed from the cache")
+    parser.add_argument("--suite", action="append", choices=sorted(runner.SUITES), help="suite to run (default: all)")
+    parser.add_argument("--seed", type=int, nargs="+", default=[DEFAULT_SEED], help="random seeds of the testbenches")
+    parser.add_argument("--simulator", default="icarus", help="cocotb simulator")
+    parser.add_argument("--generated", default=runner.DEFAULT_GENERATED_DIRECTORY, help="directory of the generated files")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of parallel simulations")
+    parser.add_argument("--no-cache", action="store_true", help="simulate all of the entries")
+    parser.add_argument("--perfdb", default=perfdb.database_path(), help="performance database of the simulated entries")
+    parser.add_argument("--no-perfdb", action="store_true", help="do not record the metrics of the simulated entries")
+    args = parser.parse_args()
+
+    suites = args.suite or sorted(runner.SUITES)
+
+    try:
+        entries = plan(suites, args.seed, args.simulator, args.generated)
+    except ValueError as error:
+        print("[!] " + str(error))
+        return 1
+
+    rows = []
+    pending = []
+
+    for entry in entries:
+        record = None if args.no_cache else lookup(entry.key)
+        if record is not None:
+            rows.append(cached_row(entry, record))
+        else:
+            pending.append(entry)
+
+    print("[*] %d entries, %d cached, %d to simulate" % (len(entries), len(entries) - len(pending), len(pending)))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {executor.submit(run_entry, entry, args.simulator, args.generated,
+                                   None if args.no_perfdb else args.perfdb): entry for entry in pending}
+
+        for future in concurrent.futures.as_completed(futures):
+            rows.append(result_row(futures[future], future.result()))
+
+    rows.sort(key=lambda row: (row[0], row[1]))
+    print(sweep.format_table(HEADER, rows))
+
+    return 0 if all(row[2] in ("PASS", "CACHED") for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
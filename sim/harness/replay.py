@@ -0,0 +1,93 @@
+##
+# @file replay.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Replay of a recorded stimulus (see stimulus.py)
+#
+# @details A cocotb test module: the recorded input values of each cycle are
+#          driven into the DUT before its rising edge (the idle cycles between the
+#          records are skipped by a single timer), without any testbench logic,
+#          and the outputs are compared with the recorded outputs
+#
+#            make MODULE=harness.replay HWDBG_STIMULUS=stimulus_DebuggerPacketReceiver_test.stim
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import itertools
+import os
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_time
+
+from harness import handles, stimulus
+
+#
+# Number of the reported mismatches of the outputs
+#
+MAXIMUM_REPORTED_MISMATCHES = 10
+
+
+async def replay(dut, path):
+    """Replay a stimulus stream, returns the mismatches of the outputs (cycle, port, recorded, replayed)"""
+
+    clock_period_ns, ports, records = stimulus.read(path)
+    hw = handles.registry(dut)
+    port_handles = [hw.get(name) for name, _ in ports]
+    mismatches = []
+
+    cocotb.start_soon(Clock(dut.clock, clock_period_ns, units="ns").start(start_high=False))
+
+    for cycle, group in itertools.groupby(records, key=lambda record: record[0]):
+
+        #
+        # The inputs are applied at the start of the cycle (before its rising edge)
+        #
+        delay = cycle * clock_period_ns - int(get_sim_time("ns"))
+        if delay > 0:
+            await Timer(delay, units="ns")
+
+        checks = []
+        for _, port, value in group:
+            if ports[port][1] == stimulus.KIND_INPUT:
+                if value is not None:
+                    port_handles[port].value = value
+            else:
+                checks.append((port, value))
+
+        if checks:
+
+            #
+            # The outputs are sampled right before the rising edge (as recorded)
+            #
+            await Timer(clock_period_ns // 2 - 1, units="ns")
+
+            for port, value in checks:
+                replayed = handles.read_int(port_handles[port], None)
+                if replayed != value:
+                    mismatches.append((cycle, ports[port][0], value, replayed))
+
+    return mismatches
+
+
+@cocotb.test(skip="HWDBG_STIMULUS" not in os.environ)
+async def replay_test(dut):
+    """Replay the stimulus of 'HWDBG_STIMULUS'"""
+
+    path = os.environ["HWDBG_STIMULUS"]
+    mismatches = await replay(dut, path)
+
+    def text(value):
+        return "x" if value is None else hex(value)
+
+    for cycle, name, recorded, replayed in mismatches[:MAXIMUM_REPORTED_MISMATCHES]:
+        dut._log.error("cycle %d %s: recorded %s, replayed %s" % (cycle, name, text(recorded), text(replayed)))
+
+    assert not mismatches, "%d outputs of %s are not reproduced" % (len(mismatches), path)
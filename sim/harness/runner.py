@@ -0,0 +1,168 @@
+##
+# @file runner.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Running the cocotb suites of hwdbg and collecting their results
+#
+# @details
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+import subprocess
+import time
+import xml.etree.ElementTree as ElementTree
+
+#
+# Directories of the project
+#
+SIM_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIRECTORY = os.path.dirname(SIM_DIRECTORY)
+DEFAULT_GENERATED_DIRECTORY = os.path.join(ROOT_DIRECTORY, "generated")
+
+#
+# Period of the clock used by all of the testbenches
+#
+CLOCK_PERIOD_NS = 10
+
+#
+# File of the metrics that are reported by the testbenches (see perfdb.py)
+#
+PERF_METRICS_FILE_NAME = "perf_metrics.jsonl"
+
+#
+# Directory of the files that are written by the testbenches (set by run_suite
+# to the build directory, since the simulators of a suite share its directory)
+#
+OUTPUT_DIRECTORY_VARIABLE = "HWDBG_OUTPUT_DIR"
+
+#
+# The cocotb suites (name of the top module -> directory of the Makefile)
+#
+SUITES = {
+    "DebuggerModuleTestingBRAM": os.path.join(SIM_DIRECTORY, "hwdbg", "DebuggerModuleTestingBRAM"),
+    "DebuggerModuleTestingBRAMMulti": os.path.join(SIM_DIRECTORY, "hwdbg", "DebuggerModuleTestingBRAMMulti"),
+    "DebuggerPacketReceiver": os.path.join(SIM_DIRECTORY, "hwdbg", "communication", "DebuggerPacketReceiver"),
+    "DebuggerPacketSender": os.path.join(SIM_DIRECTORY, "hwdbg", "communication", "DebuggerPacketSender"),
+    "SendReceiveSynchronizer": os.path.join(SIM_DIRECTORY, "hwdbg", "communication", "SendReceiveSynchronizer"),
+}
+
+
+class TestResult:
+    """Result of a single cocotb test"""
+
+    def __init__(self, name, passed, skipped, sim_time_ns, wall_time):
+        self.name = name
+        self.passed = passed
+        self.skipped = skipped
+        self.sim_time_ns = sim_time_ns
+        self.wall_time = wall_time
+
+    @property
+    def sim_cycles(self):
+        return int(self.sim_time_ns // CLOCK_PERIOD_NS)
+
+
+class SuiteResult:
+    """Result of running one suite (one simulator invocation)"""
+
+    def __init__(self, suite, returncode, wall_time, tests, output):
+        self.suite = suite
+        self.returncode = returncode
+        self.wall_time = wall_time
+        self.tests = tests
+        self.output = output
+
+    @property
+    def passed(self):
+        return self.returncode == 0 and len(self.tests) != 0 and all(test.passed for test in self.tests)
+
+    @property
+    def sim_cycles(self):
+        return sum(test.sim_cycles for test in self.tests)
+
+
+def parse_results(results_file):
+    """Parse the JUnit (results.xml) file written by cocotb"""
+
+    tests = []
+
+    if not os.path.exists(results_file):
+        return tests
+
+    for testcase in ElementTree.parse(results_file).getroot().iter("testcase"):
+        tests.append(TestResult(
+            testcase.get("name"),
+            testcase.find("failure") is None and testcase.find("error") is None,
+            testcase.find("skipped") is not None,
+            float(testcase.get("sim_time_ns", 0)),
+            float(testcase.get("time", 0)),
+        ))
+
+    return tests
+
+
+def output_path(name):
+    """Path of a file that is written by a testbench (in 'HWDBG_OUTPUT_DIR', or the current directory)"""
+
+    return os.path.join(os.environ.get(OUTPUT_DIRECTORY_VARIABLE, ""), name)
+
+
+def run_suite(suite, build_directory, generated_directory=DEFAULT_GENERATED_DIRECTORY,
+              simulator="icarus", seed=None, testcase=None, waves=False, extra_env=None):
+    """Build (if needed) and run a suite with its own build directory and results file"""
+
+    os.makedirs(build_directory, exist_ok=True)
+    results_file = os.path.join(build_directory, "results.xml")
+
+    #
+    # Remove the results of the previous run
+    #
+    metrics_file = os.path.join(build_directory, PERF_METRICS_FILE_NAME)
+
+    for path in (results_file, metrics_file):
+        if os.path.exists(path):
+            os.remove(path)
+
+    command = [
+        "make", "-C", SUITES[suite],
+        "SIM=" + simulator,
+        "GENERATED_DIR=" + os.path.abspath(generated_directory),
+        "SIM_BUILD=" + os.path.join(os.path.abspath(build_directory), "sim_build"),
+    ]
+
+    if waves:
+        command.append("WAVES=1")
+
+    env = dict(os.environ)
+    env["COCOTB_RESULTS_FILE"] = os.path.abspath(results_file)
+    env["HWDBG_PERF_METRICS"] = os.path.abspath(metrics_file)
+    env[OUTPUT_DIRECTORY_VARIABLE] = os.path.abspath(build_directory)
+
+    if seed is not None:
+        env["RANDOM_SEED"] = str(seed)
+
+    if testcase is not None:
+        env["TESTCASE"] = testcase
+
+    if extra_env:
+        env.update(extra_env)
+
+    start = time.monotonic()
+    result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, env=env)
+    wall_time = time.monotonic() - start
+
+    #
+    # Keep the simulator output next to the results for later inspection
+    #
+    output = result.stdout.decode(errors="replace")
+    with open(os.path.join(build_directory, "output.log"), "w") as file:
+        file.write(output)
+
+    return SuiteResult(suite, result.returncode, wall_time, parse_results(results_file), output)
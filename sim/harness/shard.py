@@ -0,0 +1,425 @@
+##
+# @file shard.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Sharding the regression across hosts through a shared directory queue
+#
+# @details The regression is split into work units (a test of a suite, with a
+#          seed and a scenario), each unit is a JSON file in the 'pending'
+#          directory of the queue. The workers (on any host that mounts the
+#          queue) claim the units by renaming them into the 'claimed' directory
+#          (only one rename of a file succeeds), run them with a simulator build
+#          that is reused for all of the units of the same suite, and write the
+#          results into the 'results' directory. Then, the results are merged:
+#
+#            python3 -m harness.shard enqueue /shared/queue --seed 1 2 3
+#            python3 -m harness.shard work /shared/queue         # on each host
+#            python3 -m harness.shard merge /shared/queue
+#
+#          or on one host, with worker processes standing in for the hosts:
+#
+#            python3 -m harness.shard local /tmp/queue --workers 4 --seed 1 2
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import ast
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from harness import regress, runner, sweep, traffic
+
+#
+# Directories of the queue
+#
+PENDING_DIRECTORY = "pending"
+CLAIMED_DIRECTORY = "claimed"
+RESULTS_DIRECTORY = "results"
+
+#
+# Parameters of the whole regression (written by 'enqueue')
+#
+PLAN_FILE_NAME = "plan.json"
+
+#
+# Local directory of the simulator builds of the workers
+#
+SHARD_BUILD_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "shard_build")
+
+
+def queue_directories(queue):
+    return [os.path.join(queue, name) for name in (PENDING_DIRECTORY, CLAIMED_DIRECTORY, RESULTS_DIRECTORY)]
+
+
+def worker_name():
+    """Name of the current worker (unique across the hosts)"""
+
+    return socket.gethostname() + "-" + str(os.getpid())
+
+
+def is_cocotb_test(decorator):
+    """Whether a decorator is 'cocotb.test' (or 'cocotb.test(...)')"""
+
+    if isinstance(decorator, ast.Call):
+        decorator = decorator.func
+
+    return isinstance(decorator, ast.Attribute) and decorator.attr == "test" and \
+        isinstance(decorator.value, ast.Name) and decorator.value.id == "cocotb"
+
+
+def suite_tests(suite):
+    """Names of the cocotb tests of a suite (whatever the other decorators of the tests are)"""
+
+    names = []
+    for path in sorted(glob.glob(os.path.join(runner.SUITES[suite], "test_*.py"))):
+        with open(path, "r") as file:
+            tree = ast.parse(file.read(), path)
+
+        for node in tree.body:
+            if isinstance(node, (ast.AsyncFunctionDef, ast.FunctionDef)) and \
+                    any(is_cocotb_test(decorator) for decorator in node.decorator_list):
+                names.append(node.name)
+
+    return names
+
+
+#
+# Checks of the values of the known variables of the scenarios (a list of the
+# valid values or a conversion), so an invalid scenario fails when it's enqueued
+# instead of failing in every unit
+#
+SCENARIO_VARIABLES = {
+    "HWDBG_STRESS_PACKETS": int,
+    "HWDBG_STRESS_ARRIVAL": traffic.ARRIVAL_DISTRIBUTIONS,
+    "HWDBG_STRESS_MEAN_GAP": int,
+    "HWDBG_STRESS_PAYLOAD_WORDS": int,
+    "HWDBG_STRESS_SEND_RATIO": float,
+}
+
+
+def check_scenario_value(variable, value):
+    """Check the value of a variable of a scenario, returns the error (or None)"""
+
+    check = SCENARIO_VARIABLES.get(variable)
+
+    if isinstance(check, list):
+        if value not in check:
+            return "invalid value of " + variable + ": " + value + " (choose from " + ", ".join(check) + ")"
+    elif check is not None:
+        try:
+            check(value)
+        except ValueError:
+            return "invalid value of " + variable + ": " + value
+
+    return None
+
+
+def parse_scenario(text):
+    """Parse a scenario 'NAME:VAR=VALUE,VAR=VALUE' (the environment of the testbench)"""
+
+    name, _, assignments = text.partition(":")
+    environment = {}
+
+    for assignment in filter(None, assignments.split(",")):
+        variable, separator, value = assignment.partition("=")
+        if not separator:
+            raise argparse.ArgumentTypeError("invalid assignment in the scenario: " + assignment)
+
+        error = check_scenario_value(variable, value)
+        if error is not None:
+            raise argparse.ArgumentTypeError(error)
+
+        environment[variable] = value
+
+    return name, environment
+
+
+def unit_identifier(suite, testcase, seed, scenario):
+    return "%s.%s.seed%d.%s" % (suite, testcase, seed, scenario)
+
+
+def enqueue(queue, suites, seeds, scenarios, simulator, generated_directory):
+    """Split the regression into the work units of the queue"""
+
+    tests = {suite: suite_tests(suite) for suite in suites}
+
+    for suite, names in tests.items():
+        if not names:
+            raise ValueError("no cocotb test is found in the suite " + suite + " (" + runner.SUITES[suite] + ")")
+
+    for directory in queue_directories(queue):
+        os.makedirs(directory, exist_ok=True)
+
+    regress.write_json(os.path.join(queue, PLAN_FILE_NAME), {
+        "simulator": simulator,
+        "generated": os.path.abspath(generated_directory),
+        "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+
+    count = 0
+    for suite in suites:
+        for testcase in tests[suite]:
+            for seed in seeds:
+                for scenario, environment in scenarios:
+                    identifier = unit_identifier(suite, testcase, seed, scenario)
+                    regress.write_json(os.path.join(queue, PENDING_DIRECTORY, identifier + ".json"), {
+                        "id": identifier,
+                        "suite": suite,
+                        "testcase": testcase,
+                        "seed": seed,
+                        "scenario": scenario,
+                        "environment": environment,
+                    })
+                    count = count + 1
+
+    return count
+
+
+def claim(queue, worker):
+    """Claim a pending unit of the queue or return None once it's empty"""
+
+    pending_directory, claimed_directory, _ = queue_directories(queue)
+
+    for name in sorted(os.listdir(pending_directory)):
+        if not name.endswith(".json"):
+            continue
+
+        claimed_path = os.path.join(claimed_directory, name[:-len(".json")] + "." + worker + ".json")
+
+        #
+        # The rename is atomic, the other workers that try to claim the same
+        # unit fail (the file does not exist anymore)
+        #
+        try:
+            os.rename(os.path.join(pending_directory, name), claimed_path)
+        except FileNotFoundError:
+            continue
+
+        #
+        # The time of the claim (for finding the claims of the dead workers)
+        #
+        os.utime(claimed_path)
+
+        with open(claimed_path, "r") as file:
+            return claimed_path, json.load(file)
+
+    return None
+
+
+def run_unit(unit, plan, worker, build_tag, shared_hash, use_cache):
+    """Run a work unit (or replay it from the cache) and make its result record"""
+
+    key = regress.entry_key(unit["suite"], unit["seed"], plan["simulator"], plan["generated"], shared_hash,
+                            unit["testcase"], unit["environment"])
+    record = regress.lookup(key) if use_cache else None
+    cached = record is not None
+
+    if not cached:
+
+        #
+        # One build per suite (and design) on each worker slot, the simulator
+        # is rebuilt only when its sources are changed
+        #
+        build_directory = os.path.join(SHARD_BUILD_DIRECTORY, unit["suite"] + "-" + build_tag)
+        result = runner.run_suite(unit["suite"], build_directory, plan["generated"], plan["simulator"],
+                                  unit["seed"], unit["testcase"], extra_env=unit["environment"])
+        regress.store(key, result)
+
+        record = regress.result_record(result)
+        record["returncode"] = result.returncode
+        record["passed"] = result.passed
+
+    record.update(unit)
+    record["cached"] = cached
+    record["worker"] = worker
+    record.setdefault("passed", all(test["passed"] for test in record["tests"]))
+
+    return record
+
+
+def work(queue, slot=0, use_cache=True):
+    """Claim and run the units of the queue until it's empty
+
+    The workers of the same host should use different slots (the slot selects
+    the local simulator builds of the worker)
+    """
+
+    with open(os.path.join(queue, PLAN_FILE_NAME), "r") as file:
+        plan = json.load(file)
+
+    worker = worker_name()
+    shared_hash = regress.shared_sources_hash()
+    build_tag = sweep.hash_files([plan["generated"]])[:12] + "-slot" + str(slot)
+    count = 0
+
+    while True:
+        claimed = claim(queue, worker)
+        if claimed is None:
+            break
+
+        claimed_path, unit = claimed
+        record = run_unit(unit, plan, worker, build_tag, shared_hash, use_cache)
+
+        regress.write_json(os.path.join(queue, RESULTS_DIRECTORY, unit["id"] + ".json"), record)
+
+        #
+        # A long unit may be returned to the queue by 'requeue --stale' while it
+        # runs, then its claim does not exist anymore
+        #
+        try:
+            os.remove(claimed_path)
+        except FileNotFoundError:
+            pass
+        count = count + 1
+
+        print("[*] %s: %s %s" % (worker, unit["id"], "PASS" if record["passed"] else "FAIL"), flush=True)
+
+    return count
+
+
+def requeue(queue, stale_seconds):
+    """Move the units claimed by the dead workers (older than a limit) back to the queue"""
+
+    pending_directory, claimed_directory, _ = queue_directories(queue)
+    count = 0
+
+    for name in os.listdir(claimed_directory):
+        path = os.path.join(claimed_directory, name)
+        if time.time() - os.path.getmtime(path) < stale_seconds:
+            continue
+
+        with open(path, "r") as file:
+            unit = json.load(file)
+
+        try:
+            os.rename(path, os.path.join(pending_directory, unit["id"] + ".json"))
+            count = count + 1
+        except FileNotFoundError:
+            continue
+
+    return count
+
+
+def merge(queue):
+    """Merge the results of the workers, returns (rows, passed)"""
+
+    pending_directory, claimed_directory, results_directory = queue_directories(queue)
+    records = []
+
+    for path in sorted(glob.glob(os.path.join(results_directory, "*.json"))):
+        with open(path, "r") as file:
+            records.append(json.load(file))
+
+    rows = []
+    for record in records:
+        sim_cycles = sum(int(test["sim_time_ns"] // runner.CLOCK_PERIOD_NS) for test in record["tests"])
+        status = "CACHED" if record["cached"] else ("PASS" if record["passed"] else "FAIL")
+        rows.append([record["suite"], record["testcase"], record["seed"], record["scenario"], status,
+                     sim_cycles, "%.2f" % record["wall_time"], record["worker"]])
+
+    #
+    # The units that are not finished (yet) are reported as failures
+    #
+    unfinished = [name for name in os.listdir(pending_directory) + os.listdir(claimed_directory) if name.endswith(".json")]
+    passed = len(unfinished) == 0 and all(record["passed"] for record in records)
+
+    return rows, unfinished, passed
+
+
+HEADER = ["suite", "test", "seed", "scenario", "status", "sim cycles", "wall (s)", "worker"]
+
+
+def print_merged(queue):
+    rows, unfinished, passed = merge(queue)
+
+    print(sweep.format_table(HEADER, rows))
+
+    workers = sorted(set(row[-1] for row in rows))
+    print("[*] %d units by %d workers, %d unfinished" % (len(rows), len(workers), len(unfinished)))
+
+    return 0 if passed else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shard the regression across hosts through a shared directory queue")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="split the regression into the units of the queue")
+    local_parser = subparsers.add_parser("local", help="enqueue, run several workers on this host and merge")
+
+    for subparser in (enqueue_parser, local_parser):
+        subparser.add_argument("queue", help="directory of the queue (shared by the hosts)")
+        subparser.add_argument("--suite", action="append", choices=sorted(runner.SUITES), help="suite to run (default: all)")
+        subparser.add_argument("--seed", type=int, nargs="+", default=[regress.DEFAULT_SEED], help="random seeds of the testbenches")
+        subparser.add_argument("--scenario", type=parse_scenario, action="append",
+                               help="scenario of the testbenches, e.g., 'burst:HWDBG_STRESS_ARRIVAL=burst'")
+        subparser.add_argument("--simulator", default="icarus", help="cocotb simulator")
+        subparser.add_argument("--generated", default=runner.DEFAULT_GENERATED_DIRECTORY,
+                               help="directory of the generated files (should be visible to all of the hosts)")
+
+    local_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+
+    work_parser = subparsers.add_parser("work", help="claim and run the units of the queue until it's empty")
+    work_parser.add_argument("queue", help="directory of the queue")
+    work_parser.add_argument("--slot", type=int, default=0, help="slot of the worker on this host (its local builds)")
+    work_parser.add_argument("--no-cache", action="store_true", help="simulate all of the claimed units")
+
+    requeue_parser = subparsers.add_parser("requeue", help="return the units of the dead workers to the queue")
+    requeue_parser.add_argument("queue", help="directory of the queue")
+    requeue_parser.add_argument("--stale", type=int, default=3600, help="age (in seconds) of a stale claim")
+
+    merge_parser = subparsers.add_parser("merge", help="merge the results of the workers")
+    merge_parser.add_argument("queue", help="directory of the queue")
+
+    args = parser.parse_args()
+
+    if args.command in ("enqueue", "local"):
+        try:
+            count = enqueue(args.queue, args.suite or sorted(runner.SUITES), args.seed,
+                            args.scenario or [("default", {})], args.simulator, args.generated)
+        except ValueError as error:
+            print("[!] " + str(error))
+            return 1
+
+        print("[*] %d units are enqueued in %s" % (count, args.queue))
+
+        if args.command == "enqueue":
+            return 0
+
+        #
+        # The worker processes stand in for the hosts
+        #
+        workers = [
+            subprocess.Popen([sys.executable, "-m", "harness.shard", "work", args.queue, "--slot", str(slot)],
+                             cwd=runner.SIM_DIRECTORY)
+            for slot in range(max(1, args.workers))
+        ]
+        for worker in workers:
+            worker.wait()
+
+        return print_merged(args.queue)
+
+    if args.command == "work":
+        print("[*] %s: %d units are done" % (worker_name(), work(args.queue, args.slot, not args.no_cache)))
+        return 0
+
+    if args.command == "requeue":
+        print("[*] %d units are returned to the queue" % requeue(args.queue, args.stale))
+        return 0
+
+    return print_merged(args.queue)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
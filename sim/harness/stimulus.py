@@ -0,0 +1,235 @@
+##
+# @file stimulus.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Recording of the stimulus (the input ports) of a DUT
+#
+# @details The input ports of the toplevel (found in its generated SystemVerilog
+#          file) are sampled on each rising edge, before the registers of the
+#          design are updated, and only the changes are appended to a binary
+#          stream as (cycle delta, port, value) varint records. The output ports
+#          are recorded in the same way, so a replay (see replay.py) drives the
+#          same values into the DUT without any testbench logic and checks that
+#          the outputs are reproduced
+#
+#            HWDBG_STIMULUS_RECORD=1 make    (writes stimulus_<test>.stim)
+#            make MODULE=harness.replay HWDBG_STIMULUS=stimulus_<test>.stim
+#
+#          The memory cells that are written directly by a testbench (e.g., the
+#          co-simulation bridge) are not ports, so they are not recorded
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import functools
+import json
+import os
+import re
+import struct
+
+from harness import handles, manifest, runner
+from harness.capture import decode_varint, encode_varint
+
+#
+# Header of the stream (magic, version, clock period in ns, size of the port table)
+#
+STIMULUS_MAGIC = b"HWDBGSTM"
+STIMULUS_VERSION = 1
+HEADER = struct.Struct("<8sIII")
+
+#
+# Kinds of the recorded ports
+#
+KIND_INPUT = 0
+KIND_OUTPUT = 1
+
+#
+# Encoded value of the unresolvable (X or Z) samples (the other values are shifted)
+#
+UNRESOLVED = 1
+
+#
+# The clock is driven by the replay (not recorded)
+#
+CLOCK_PORT = "clock"
+
+#
+# Size of the buffer of the records before writing them to the file
+#
+WRITE_BUFFER_SIZE = 1 << 16
+
+#
+# A port of a module header of firtool (e.g., 'input  [31:0] io_rdData,')
+#
+PORT_PATTERN = re.compile(r"^\s*(input|output|inout)?\s*(\[[^\]]*\])?\s*([A-Za-z_]\w*)\s*(,|\)|$)")
+
+
+def toplevel_ports(module, generated_directory=None):
+    """The ports of a generated module as (name, kind) pairs"""
+
+    directory = generated_directory if generated_directory is not None else manifest.generated_directory()
+    ports = []
+    direction = None
+
+    with open(os.path.join(directory, module + ".sv"), "r") as file:
+        lines = iter(file)
+
+        for line in lines:
+            if re.match(r"^\s*module\s+" + re.escape(module) + r"\s*\(", line):
+                break
+
+        for line in lines:
+            result = PORT_PATTERN.match(line)
+            if result is None:
+                break
+
+            direction = result.group(1) or direction
+            ports.append((result.group(3), KIND_OUTPUT if direction == "output" else KIND_INPUT))
+
+            if line.rstrip().endswith(");"):
+                break
+
+    return ports
+
+
+def encode_value(handle):
+    value = handle.value
+    return (value.integer << 1) if value.is_resolvable else UNRESOLVED
+
+
+class StimulusWriter:
+    """Append the changes of the ports to a stimulus stream"""
+
+    def __init__(self, path, ports, clock_period_ns=runner.CLOCK_PERIOD_NS):
+        self.path = path
+        self.ports = ports
+
+        table = json.dumps(ports).encode()
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(STIMULUS_MAGIC, STIMULUS_VERSION, clock_period_ns, len(table)))
+        self._file.write(table)
+
+        self._buffer = bytearray()
+        self._last_cycle = 0
+        self.records = 0
+
+    def append(self, cycle, port, encoded_value):
+        self._buffer += encode_varint(cycle - self._last_cycle)
+        self._buffer += encode_varint(port)
+        self._buffer += encode_varint(encoded_value)
+        self._last_cycle = cycle
+        self.records = self.records + 1
+
+        if len(self._buffer) >= WRITE_BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        self._file.write(self._buffer)
+        self._buffer = bytearray()
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def read(path):
+    """Read a stimulus stream, returns (clock period in ns, ports, records of (cycle, port, value or None))"""
+
+    with open(path, "rb") as file:
+        data = file.read()
+
+    magic, version, clock_period_ns, table_size = HEADER.unpack_from(data, 0)
+    if magic != STIMULUS_MAGIC or version != STIMULUS_VERSION:
+        raise ValueError("not a stimulus stream (or a different version): " + path)
+
+    offset = HEADER.size
+    ports = [tuple(port) for port in json.loads(data[offset:offset + table_size].decode())]
+    offset = offset + table_size
+
+    records = []
+    cycle = 0
+
+    while offset < len(data):
+        delta, offset = decode_varint(data, offset)
+        port, offset = decode_varint(data, offset)
+        encoded_value, offset = decode_varint(data, offset)
+
+        cycle = cycle + delta
+        records.append((cycle, port, None if encoded_value == UNRESOLVED else encoded_value >> 1))
+
+    return clock_period_ns, ports, records
+
+
+class StimulusRecorder:
+    """Record the changes of the ports of a DUT on each rising edge"""
+
+    def __init__(self, dut, path, module=None):
+        hw = handles.registry(dut)
+
+        self.dut = dut
+        ports = [port for port in toplevel_ports(module or dut._name) if port[0] != CLOCK_PORT]
+
+        self.handles = [hw.get(name) for name, _ in ports]
+        self.writer = StimulusWriter(path, ports)
+        self._values = [None] * len(ports)
+        self._task = None
+
+    def sample(self, cycle):
+        for port, handle in enumerate(self.handles):
+            encoded_value = encode_value(handle)
+
+            if encoded_value != self._values[port]:
+                self._values[port] = encoded_value
+                self.writer.append(cycle, port, encoded_value)
+
+    async def _run(self):
+        from cocotb.triggers import RisingEdge
+        from cocotb.utils import get_sim_time
+
+        while True:
+            await RisingEdge(self.dut.clock)
+            self.sample(int(get_sim_time("ns") // runner.CLOCK_PERIOD_NS))
+
+    def start(self):
+        import cocotb
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stop the recording and close the stream"""
+
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+            self.writer.close()
+
+
+def start(dut, path, module=None):
+    """Start recording the ports of a DUT"""
+
+    return StimulusRecorder(dut, path, module).start()
+
+
+def recorded(test_function):
+    """Decorate a cocotb test to record its stimulus into 'stimulus_<test>.stim' (if 'HWDBG_STIMULUS_RECORD' is set)"""
+
+    @functools.wraps(test_function)
+    async def wrapper(dut, *args, **kwargs):
+        if os.environ.get("HWDBG_STIMULUS_RECORD", "0") == "0":
+            return await test_function(dut, *args, **kwargs)
+
+        recorder = start(dut, runner.output_path("stimulus_" + test_function.__name__ + ".stim"))
+        try:
+            await test_function(dut, *args, **kwargs)
+        finally:
+            recorder.stop()
+            dut._log.info("The stimulus (%d records) is recorded to %s" % (recorder.writer.records, recorder.writer.path))
+
+    return wrapper
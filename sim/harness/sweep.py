@@ -0,0 +1,299 @@
+##
+# @file sweep.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Parameter-sweep runner across the design parameters of configs.scala
+#
+# @details Each point of the grid is elaborated once (the generated SystemVerilog
+#          files are cached based on the parameters and the Scala sources), then
+#          the cocotb suites are run against all of the variants in parallel
+#
+#          Usage (from the 'sim' directory):
+#              python3 -m harness.sweep --param MAXIMUM_NUMBER_OF_STAGES 16 32 \
+#                                       --point NUMBER_OF_PINS=32 PORT_PINS_MAP=0:12,1:9,2:11 \
+#                                       --point NUMBER_OF_PINS=64 PORT_PINS_MAP=0:32,1:32
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import concurrent.futures
+import csv
+import hashlib
+import itertools
+import json
+import os
+import subprocess
+import sys
+
+from harness import runner
+
+#
+# The parameters that can be swept (overridden by -Dhwdbg.<NAME>=<VALUE>)
+#
+SWEEP_PARAMETERS = [
+    "NUMBER_OF_PINS",
+    "BLOCK_RAM_ADDR_WIDTH",
+    "DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE",
+    "MAXIMUM_NUMBER_OF_STAGES",
+    "PORT_PINS_MAP",
+]
+
+#
+# The defaults of the coupled parameters in configs.scala (the sum of the pins
+# of PORT_PINS_MAP must be equal to NUMBER_OF_PINS, see DebuggerMain)
+#
+DEFAULT_NUMBER_OF_PINS = "32"
+DEFAULT_PORT_PINS_MAP = "0:12,1:9,2:11"
+
+#
+# Cache of the elaborated variants
+#
+SWEEP_DIRECTORY = os.path.join(runner.SIM_DIRECTORY, "sweep_build")
+
+#
+# Files that affect the elaborated design
+#
+ELABORATION_INPUTS = [
+    os.path.join(runner.ROOT_DIRECTORY, "src", "main", "scala"),
+    os.path.join(runner.ROOT_DIRECTORY, "src", "test", "bram"),
+    os.path.join(runner.ROOT_DIRECTORY, "build.sbt"),
+]
+
+
+def hash_files(paths):
+    """Compute a hash of the content of the files (and the files inside the directories)"""
+
+    digest = hashlib.sha256()
+
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            files = []
+
+        for file_path in files:
+            digest.update(os.path.relpath(file_path, runner.ROOT_DIRECTORY).encode())
+            with open(file_path, "rb") as file:
+                digest.update(hashlib.sha256(file.read()).digest())
+
+    return digest.hexdigest()
+
+
+def point_error(point):
+    """The reason that a point can not be elaborated (or None), checked before running sbt"""
+
+    number_of_pins = point.get("NUMBER_OF_PINS", DEFAULT_NUMBER_OF_PINS)
+    port_pins_map = point.get("PORT_PINS_MAP", DEFAULT_PORT_PINS_MAP)
+
+    try:
+        pins_of_ports = sum(int(item.split(":", 1)[1]) for item in port_pins_map.split(",") if item)
+        number_of_pins = int(number_of_pins)
+    except (IndexError, ValueError):
+        return "invalid NUMBER_OF_PINS or PORT_PINS_MAP"
+
+    if pins_of_ports != number_of_pins:
+        return "the sum of PORT_PINS_MAP (%d) is not equal to NUMBER_OF_PINS (%d)" % (pins_of_ports, number_of_pins)
+
+    return None
+
+
+def parse_point(items):
+    """Parse the 'NAME=VALUE' items of an explicit point"""
+
+    point = {}
+
+    for item in items:
+        name, separator, value = item.partition("=")
+        if not separator or name not in SWEEP_PARAMETERS:
+            raise ValueError("invalid parameter of a point: " + item)
+        point[name] = value
+
+    return point
+
+
+def variant_key(point, sources_hash):
+    """Key of a variant in the cache"""
+
+    description = json.dumps(point, sort_keys=True) + sources_hash
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+
+def elaborate(point, variant_directory):
+    """Generate the SystemVerilog files of a variant (if not already cached)"""
+
+    generated_directory = os.path.join(variant_directory, "generated")
+    complete_marker = os.path.join(variant_directory, "elaborated.json")
+
+    if os.path.exists(complete_marker):
+        return True
+
+    os.makedirs(generated_directory, exist_ok=True)
+
+    command = ["sbt"]
+    for name, value in point.items():
+        command.append("-Dhwdbg." + name + "=" + str(value))
+    command.append("-Dhwdbg.GENERATED_FILES_DIRECTORY=" + generated_directory + "/")
+    command.append("runMain hwdbg.MainWithInitializedBRAM")
+
+    #
+    # The multi-instance top (DebuggerModuleTestingBRAMMulti) shares the other modules
+    #
+    command.append("runMain hwdbg.MainWithMultipleInitializedBRAM")
+
+    print("[*] elaborating variant: " + json.dumps(point, sort_keys=True))
+    result = subprocess.run(command, cwd=runner.ROOT_DIRECTORY, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    with open(os.path.join(variant_directory, "elaboration.log"), "wb") as file:
+        file.write(result.stdout)
+
+    if result.returncode != 0 or not os.path.exists(os.path.join(generated_directory, "DebuggerModuleTestingBRAM.sv")):
+        print("[x] elaboration failed, see: " + os.path.join(variant_directory, "elaboration.log"))
+        return False
+
+    with open(complete_marker, "w") as file:
+        json.dump(point, file, sort_keys=True)
+
+    return True
+
+
+def format_table(header, rows):
+    """Format rows as a text table"""
+
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    lines = ["  ".join(str(item).ljust(width) for item, width in zip(header, widths))]
+    lines.append("  ".join("-" * width for width in widths))
+
+    for row in rows:
+        lines.append("  ".join(str(item).ljust(width) for item, width in zip(row, widths)))
+
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the cocotb suites across a grid of design parameters")
+    parser.add_argument("--param", nargs="+", action="append", default=[], metavar=("NAME", "VALUE"),
+                        help="a swept parameter followed by its values (" + ", ".join(SWEEP_PARAMETERS) + ")")
+    parser.add_argument("--point", nargs="+", action="append", default=[], metavar="NAME=VALUE",
+                        help="an explicit point of coupled parameters (e.g., NUMBER_OF_PINS=64 PORT_PINS_MAP=0:32,1:32), "
+                             "combined with each point of the grid")
+    parser.add_argument("--suite", action="append", choices=sorted(runner.SUITES), help="suite to run (default: all)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="number of parallel simulations")
+    parser.add_argument("--simulator", default="icarus", help="cocotb simulator")
+    parser.add_argument("--seed", type=int, help="random seed of the testbenches")
+    parser.add_argument("--csv", help="also write the table to a CSV file")
+    args = parser.parse_args()
+
+    #
+    # Interpret the grid
+    #
+    grid = {}
+    for item in args.param:
+        if item[0] not in SWEEP_PARAMETERS or len(item) < 2:
+            parser.error("invalid parameter: " + " ".join(item))
+        grid[item[0]] = item[1:]
+
+    try:
+        explicit_points = [parse_point(items) for items in args.point] or [{}]
+    except ValueError as error:
+        parser.error(str(error))
+
+    grid_names = sorted(grid)
+    points = []
+
+    for values in itertools.product(*[grid[name] for name in grid_names]):
+        for explicit_point in explicit_points:
+            point = dict(zip(grid_names, values))
+            point.update(explicit_point)
+            points.append(point)
+
+    #
+    # The inconsistent points are dropped before they are elaborated (their
+    # elaboration fails after a full sbt run)
+    #
+    valid_points = []
+
+    for point in points:
+        error = point_error(point)
+        if error is not None:
+            print("[!] skipping " + json.dumps(point, sort_keys=True) + ": " + error)
+        else:
+            valid_points.append(point)
+
+    if not valid_points:
+        parser.error("no consistent point in the sweep")
+
+    points = valid_points
+    names = sorted(set(name for point in points for name in point))
+    suites = args.suite or sorted(runner.SUITES)
+
+    #
+    # Elaborate the variants (sequentially, sbt locks its build directory)
+    #
+    sources_hash = hash_files(ELABORATION_INPUTS)
+    variants = []
+
+    for point in points:
+        variant_directory = os.path.join(SWEEP_DIRECTORY, variant_key(point, sources_hash))
+        variants.append((point, variant_directory, elaborate(point, variant_directory)))
+
+    #
+    # Run every suite of every variant in parallel
+    #
+    rows = []
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {}
+
+        for point, variant_directory, elaborated in variants:
+            for suite in suites:
+                if not elaborated:
+                    rows.append([point.get(name, "") for name in names] + [suite, "ELAB-FAIL", "-", "-", "-"])
+                    continue
+
+                future = executor.submit(
+                    runner.run_suite,
+                    suite,
+                    os.path.join(variant_directory, suite),
+                    os.path.join(variant_directory, "generated"),
+                    args.simulator,
+                    args.seed,
+                )
+                futures[future] = point
+
+        for future in concurrent.futures.as_completed(futures):
+            point = futures[future]
+            result = future.result()
+            passed_tests = sum(1 for test in result.tests if test.passed)
+
+            rows.append([point.get(name, "") for name in names] + [
+                result.suite,
+                "PASS" if result.passed else "FAIL",
+                str(passed_tests) + "/" + str(len(result.tests)),
+                result.sim_cycles,
+                "%.2f" % result.wall_time,
+            ])
+
+    rows.sort(key=lambda row: [str(item) for item in row])
+    header = names + ["suite", "status", "tests", "sim cycles", "wall (s)"]
+
+    print(format_table(header, rows))
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+    return 0 if all(row[len(names) + 1] == "PASS" for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+##
+# @file toggle.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Toggle activity collector of the signal groups of a DUT
+#
+# @details The signals of the selected groups (by default: the stage registers
+#          of the script execution engine, the BRAM port and the pin banks) are
+#          sampled as packed integers on each rising edge into a NumPy buffer
+#          (one 64-bit column per 64 bits of a signal). Each buffer is XORed with
+#          itself shifted by one cycle and the bits of the differences are
+#          counted per bit (the toggle count, TC), as well as the cycles where
+#          each bit is high (T1). At the end of the run, a SAIF-like activity
+#          file is written and the groups and the signals that dominate the
+#          switching are reported
+#
+#            activity = toggle.start(dut); ...; report = activity.stop()
+#            toggle.write_saif(report, "activity.saif", "DebuggerModuleTestingBRAM")
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+import time
+
+import numpy as np
+
+from harness import handles, runner
+
+#
+# Number of the sampled cycles that are buffered before they are accumulated
+#
+CHUNK_CYCLES = 1024
+
+#
+# Bits of each column of the buffer
+#
+COLUMN_BITS = 64
+COLUMN_MASK = (1 << COLUMN_BITS) - 1
+
+#
+# The default signal groups (name -> name patterns of the signals), only the
+# shallowest matches of each pattern are sampled (the same net is usually
+# visible as the ports of the nested modules)
+#
+DEFAULT_GROUPS = {
+    "stage_registers": ["stageRegs_*"],
+    "bram_port": ["io_rdWrAddr", "io_wrEna", "io_wrData", "io_rdData"],
+    "input_pins": ["io_inputPin_*"],
+    "output_pins": ["io_outputPin_*"],
+}
+
+#
+# Number of the most active signals in the report
+#
+DEFAULT_TOP_SIGNALS = 10
+
+
+def shallowest(paths):
+    """The paths with the least depth in the hierarchy"""
+
+    if not paths:
+        return []
+
+    depth = min(path.count(".") for path in paths)
+    return [path for path in paths if path.count(".") == depth]
+
+
+def select_signals(hw, groups):
+    """The (group, path) pairs of the signals of the groups"""
+
+    signals = []
+    seen = set()
+
+    for group, patterns in groups.items():
+        for pattern in patterns:
+            for path in shallowest(hw.find(pattern)):
+                if path not in seen and not hw.is_hierarchy(path):
+                    seen.add(path)
+                    signals.append((group, path))
+
+    return signals
+
+
+def parse_groups(text):
+    """Parse the groups of 'name=pattern,pattern;name=pattern' (e.g., of HWDBG_TOGGLE_GROUPS)"""
+
+    groups = {}
+
+    for item in text.split(";"):
+        if item.strip():
+            name, patterns = item.split("=", 1)
+            groups[name.strip()] = [pattern.strip() for pattern in patterns.split(",") if pattern.strip()]
+
+    return groups
+
+
+class ToggleCounters:
+    """Accumulated toggle counts (TC) and high cycles (T1) of each bit of the signals"""
+
+    def __init__(self, widths):
+        self.widths = list(widths)
+        self.columns = [(width + COLUMN_BITS - 1) // COLUMN_BITS for width in self.widths]
+        self.first_columns = [sum(self.columns[:index]) for index in range(len(self.columns))]
+
+        number_of_bits = sum(self.columns) * COLUMN_BITS
+
+        self.cycles = 0
+        self.toggles = np.zeros(number_of_bits, dtype=np.int64)
+        self.ones = np.zeros(number_of_bits, dtype=np.int64)
+        self._last = None
+
+    @staticmethod
+    def _bits(values):
+        """The bits of the rows (cycles x columns) of 64-bit values, least significant first"""
+
+        return np.unpackbits(values.astype("<u8", copy=False).view(np.uint8), axis=1, bitorder="little")
+
+    def accumulate(self, samples):
+        """Accumulate a buffer of samples (cycles x columns)"""
+
+        if samples.shape[0] == 0:
+            return
+
+        #
+        # The first sample of the buffer is compared with the last sample of
+        # the previous buffer
+        #
+        rows = samples if self._last is None else np.concatenate((self._last[np.newaxis], samples))
+
+        self.toggles += self._bits(np.bitwise_xor(rows[1:], rows[:-1])).sum(axis=0, dtype=np.int64)
+        self.ones += self._bits(samples).sum(axis=0, dtype=np.int64)
+        self.cycles = self.cycles + samples.shape[0]
+        self._last = samples[-1].copy()
+
+    def bits_of_signal(self, index):
+        """The (first, last) bits of a signal in the counters"""
+
+        first = self.first_columns[index] * COLUMN_BITS
+        return first, first + self.widths[index]
+
+
+class ToggleCollector:
+    """Sample the signals of the groups on each rising edge and count their toggles"""
+
+    def __init__(self, dut, groups=None):
+        hw = handles.registry(dut)
+        signals = select_signals(hw, groups if groups is not None else DEFAULT_GROUPS)
+
+        if not signals:
+            raise LookupError("no signal of the toggle groups is found in the design")
+
+        self.dut = dut
+        self.groups = [group for group, _ in signals]
+        self.paths = [path for _, path in signals]
+        self.handles = [hw.get(path) for path in self.paths]
+
+        self.counters = ToggleCounters(len(handle) for handle in self.handles)
+        self._buffer = np.zeros((CHUNK_CYCLES, sum(self.counters.columns)), dtype=np.uint64)
+        self._values = [0] * len(self.handles)
+        self._rows = 0
+        self._task = None
+
+    def sample(self):
+        row = self._buffer[self._rows]
+        column = 0
+
+        for index, handle in enumerate(self.handles):
+
+            #
+            # The unresolvable values (X or Z) keep the previous value (no toggle)
+            #
+            value = handles.read_int(handle, None)
+            if value is None:
+                value = self._values[index]
+            self._values[index] = value
+
+            for _ in range(self.counters.columns[index]):
+                row[column] = value & COLUMN_MASK
+                value = value >> COLUMN_BITS
+                column = column + 1
+
+        self._rows = self._rows + 1
+        if self._rows == CHUNK_CYCLES:
+            self._accumulate()
+
+    def _accumulate(self):
+        if self._rows:
+            self.counters.accumulate(self._buffer[:self._rows])
+            self._rows = 0
+
+    async def _run(self):
+        from cocotb.triggers import RisingEdge
+
+        while True:
+            await RisingEdge(self.dut.clock)
+            self.sample()
+
+    def start(self):
+        import cocotb
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        """Stop the sampling, returns the activity report"""
+
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+        self._accumulate()
+        return report(self.counters, self.groups, self.paths)
+
+
+def report(counters, groups, paths):
+    """Activity of each signal (per bit) and of each group"""
+
+    signals = []
+    group_totals = {}
+
+    for index, (group, path) in enumerate(zip(groups, paths)):
+        first, last = counters.bits_of_signal(index)
+        toggles = counters.toggles[first:last].tolist()
+        ones = counters.ones[first:last].tolist()
+        width = last - first
+
+        signals.append({
+            "group": group,
+            "path": path,
+            "width": width,
+            "toggles": toggles,
+            "ones": ones,
+            "total_toggles": sum(toggles),
+            "activity": sum(toggles) / float(max(1, counters.cycles - 1) * width),
+        })
+
+        totals = group_totals.setdefault(group, {"signals": 0, "bits": 0, "total_toggles": 0})
+        totals["signals"] = totals["signals"] + 1
+        totals["bits"] = totals["bits"] + width
+        totals["total_toggles"] = totals["total_toggles"] + sum(toggles)
+
+    for totals in group_totals.values():
+        totals["activity"] = totals["total_toggles"] / float(max(1, counters.cycles - 1) * max(1, totals["bits"]))
+
+    return {"cycles": counters.cycles, "signals": signals, "groups": group_totals}
+
+
+def saif_name(name):
+    """Escape a name for a SAIF file"""
+
+    return "".join("\\" + character if character in "[]()" else character for character in name)
+
+
+def write_saif(activity, path, design, clock_period_ns=runner.CLOCK_PERIOD_NS):
+    """Write the activity as a SAIF-like file (T0, T1 and TC of each bit, in ns)"""
+
+    duration = activity["cycles"] * clock_period_ns
+    instances = {}
+
+    for signal in activity["signals"]:
+        instance, _, name = signal["path"].rpartition(".")
+        instances.setdefault(instance, []).append((name, signal))
+
+    lines = [
+        "(SAIFILE",
+        "(SAIFVERSION \"2.0\")",
+        "(DIRECTION \"backward\")",
+        "(DESIGN \"%s\")" % design,
+        "(DATE \"%s\")" % time.strftime("%Y-%m-%d %H:%M:%S"),
+        "(VENDOR \"hwdbg\")",
+        "(PROGRAM_NAME \"harness.toggle\")",
+        "(VERSION \"0.1\")",
+        "(DIVIDER . )",
+        "(TIMESCALE 1 ns)",
+        "(DURATION %d)" % duration,
+    ]
+
+    for instance, nets in sorted(instances.items()):
+        lines.append("(INSTANCE %s" % saif_name(design + ("." + instance if instance else "")))
+        lines.append("  (NET")
+
+        for name, signal in nets:
+            for bit in range(signal["width"]):
+                net = name if signal["width"] == 1 else "%s[%d]" % (name, bit)
+                high = signal["ones"][bit] * clock_period_ns
+
+                lines.append("    (%s" % saif_name(net))
+                lines.append("      (T0 %d) (T1 %d) (TX 0)" % (duration - high, high))
+                lines.append("      (TC %d) (IG 0)" % signal["toggles"][bit])
+                lines.append("    )")
+
+        lines.append("  )")
+        lines.append(")")
+
+    lines.append(")")
+
+    with open(path, "w") as file:
+        file.write("\n".join(lines) + "\n")
+
+
+def format_report(activity, top_signals=DEFAULT_TOP_SIGNALS):
+    """Lines of the report of the groups and the most active signals"""
+
+    total_toggles = sum(totals["total_toggles"] for totals in activity["groups"].values())
+    lines = ["%d cycles, %d toggles" % (activity["cycles"], total_toggles)]
+
+    for group, totals in sorted(activity["groups"].items(), key=lambda item: -item[1]["total_toggles"]):
+        lines.append("  %-16s %4d signals %6d bits  %10d toggles (%6.2f%%)  activity %.4f" % (
+            group, totals["signals"], totals["bits"], totals["total_toggles"],
+            100.0 * totals["total_toggles"] / max(1, total_toggles), totals["activity"]))
+
+    for signal in sorted(activity["signals"], key=lambda item: -item["total_toggles"])[:top_signals]:
+        lines.append("  %10d toggles  activity %.4f  %s (%s)" % (
+            signal["total_toggles"], signal["activity"], signal["path"], signal["group"]))
+
+    return lines
+
+
+def start(dut, groups=None):
+    """Start collecting the toggles of the signal groups"""
+
+    return ToggleCollector(dut, groups).start()
+
+
+def start_from_environment(dut):
+    """Start collecting the toggles if 'HWDBG_TOGGLE_SAIF' is set (the groups of 'HWDBG_TOGGLE_GROUPS', if set)"""
+
+    if not os.environ.get("HWDBG_TOGGLE_SAIF"):
+        return None
+
+    groups = os.environ.get("HWDBG_TOGGLE_GROUPS")
+    return start(dut, parse_groups(groups) if groups else None)
@@ -0,0 +1,100 @@
+##
+# @file traffic.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Arrival distributions and statistics of the stress (throughput) tests
+#
+# @details
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import math
+
+#
+# Supported arrival distributions
+#
+ARRIVAL_DISTRIBUTIONS = ["saturate", "fixed", "uniform", "poisson", "burst"]
+
+
+def arrival_cycles(distribution, count, mean_gap, rng, burst_length=4):
+    """Generate the (absolute) arrival cycles of 'count' requests
+
+    - saturate: all of the requests are pending from the first cycle
+    - fixed:    one request every 'mean_gap' cycles
+    - uniform:  gaps uniformly distributed in [0, 2 * mean_gap]
+    - poisson:  exponentially distributed gaps (Poisson process) with the mean of 'mean_gap'
+    - burst:    'burst_length' back-to-back requests, then a gap of 'burst_length * mean_gap'
+    """
+
+    cycles = []
+    cycle = 0
+
+    for index in range(count):
+
+        if distribution == "saturate":
+            gap = 0
+        elif distribution == "fixed":
+            gap = mean_gap
+        elif distribution == "uniform":
+            gap = rng.randint(0, 2 * mean_gap)
+        elif distribution == "poisson":
+            gap = int(round(rng.expovariate(1.0 / mean_gap))) if mean_gap > 0 else 0
+        elif distribution == "burst":
+            gap = burst_length * mean_gap if index != 0 and index % burst_length == 0 else 0
+        else:
+            raise ValueError("unknown arrival distribution: " + distribution)
+
+        cycle = cycle + gap
+        cycles.append(cycle)
+
+    return cycles
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+
+    if not sorted_values:
+        return 0
+
+    rank = max(1, int(math.ceil(fraction * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize(values):
+    """Summary (min, mean, percentiles, max) of a distribution"""
+
+    sorted_values = sorted(values)
+
+    if not sorted_values:
+        return {"count": 0, "min": 0, "mean": 0.0, "p50": 0, "p90": 0, "p99": 0, "max": 0}
+
+    return {
+        "count": len(sorted_values),
+        "min": sorted_values[0],
+        "mean": sum(sorted_values) / len(sorted_values),
+        "p50": percentile(sorted_values, 0.50),
+        "p90": percentile(sorted_values, 0.90),
+        "p99": percentile(sorted_values, 0.99),
+        "max": sorted_values[-1],
+    }
+
+
+def format_summary(name, summary):
+    """Format the summary of a distribution in one line"""
+
+    return "%s: count=%d min=%d mean=%.1f p50=%d p90=%d p99=%d max=%d" % (
+        name,
+        summary["count"],
+        summary["min"],
+        summary["mean"],
+        summary["p50"],
+        summary["p90"],
+        summary["p99"],
+        summary["max"],
+    )
@@ -0,0 +1,545 @@
+##
+# @file vcd.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Headless decoder of the BRAM transactions from the waveform dumps
+#
+# @details The VCD file (or FST file, through 'fst2vcd') is streamed, the BRAM
+#          port ('io_rdWrAddr', 'io_wrEna', 'io_wrData' and 'io_rdData') is sampled
+#          on the rising edges of the clock and the accesses are reconstructed into
+#          the HyperDbg remote packets (DEBUGGER_REMOTE_PACKET)
+#
+#          The result is saved as a columnar NumPy (.npz) file:
+#
+#            python3 -m harness.vcd waves.vcd -o transactions.npz
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import subprocess
+import sys
+
+from harness import manifest, packet
+
+#
+# Names of the signals of the BRAM port
+#
+PORT_SIGNALS = ["io_rdWrAddr", "io_wrEna", "io_wrData", "io_rdData"]
+
+#
+# State register of the synchronizer (or of the receiver or the sender, if they
+# are dumped on their own), all of them are idle in their first state
+#
+STATE_SIGNAL = "state"
+STATE_IDLE = 0
+
+#
+# Kinds of the accesses and directions of the packets (columns of the decoded file)
+#
+ACCESS_READ = 0
+ACCESS_WRITE = 1
+
+DIRECTION_PS_TO_PL = 0
+DIRECTION_PL_TO_PS = 1
+
+
+class VcdStream:
+    """Streaming reader of a VCD (or FST) file
+
+    The header is parsed on construction, then 'changes()' yields the value
+    changes of the selected signals grouped by their time
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._process = None
+
+        if path.endswith(".fst"):
+            self._process = subprocess.Popen(["fst2vcd", path], stdout=subprocess.PIPE, text=True)
+            self._file = self._process.stdout
+        else:
+            self._file = open(path, 'r')
+
+        self._tokens = self._tokenize()
+        self.timescale = ""
+        self.signals = {}
+        self.widths = {}
+        self._read_header()
+
+    def _tokenize(self):
+        for line in self._file:
+            for token in line.split():
+                yield token
+
+    def _read_header(self):
+        scope = []
+
+        for token in self._tokens:
+
+            if token == "$scope":
+                next(self._tokens)
+                scope.append(next(self._tokens))
+                self._skip_to_end()
+
+            elif token == "$upscope":
+                scope.pop()
+                self._skip_to_end()
+
+            elif token == "$var":
+                _ = next(self._tokens)
+                width = int(next(self._tokens))
+                identifier = next(self._tokens)
+                name = next(self._tokens)
+                self._skip_to_end()
+
+                full_name = ".".join(scope + [name])
+                self.signals[full_name] = identifier
+                self.widths[identifier] = width
+
+            elif token == "$timescale":
+                self.timescale = " ".join(self._collect_to_end())
+
+            elif token == "$enddefinitions":
+                self._skip_to_end()
+                return
+
+            elif token.startswith("$"):
+                self._skip_to_end()
+
+    def _collect_to_end(self):
+        values = []
+        for token in self._tokens:
+            if token == "$end":
+                break
+            values.append(token)
+        return values
+
+    def _skip_to_end(self):
+        self._collect_to_end()
+
+    def find_scope(self, signals, scope=None):
+        """Find the (shallowest) scope that contains all of the signals"""
+
+        candidates = []
+
+        for full_name in self.signals:
+            prefix, _, name = full_name.rpartition(".")
+            if name == signals[0] and all(prefix + "." + other in self.signals for other in signals[1:]):
+                if scope is None or prefix == scope or prefix.endswith("." + scope):
+                    candidates.append(prefix)
+
+        if not candidates:
+            return None
+
+        return min(candidates, key=lambda item: (item.count("."), item))
+
+    def changes(self, identifiers):
+        """Yield (time, {identifier: value}) of each time step (value is None if not resolvable)"""
+
+        time = 0
+        pending = {}
+
+        for token in self._tokens:
+
+            if token[0] == "#":
+                if pending:
+                    yield time, pending
+                    pending = {}
+                time = int(token[1:])
+                continue
+
+            if token[0] in "bBrR":
+                value = token[1:]
+                identifier = next(self._tokens)
+            elif token[0] in "01xXzZ":
+                value = token[0]
+                identifier = token[1:]
+            else:
+                # $dumpvars, $dumpall, $end, ...
+                continue
+
+            if identifier in identifiers:
+                pending[identifier] = parse_value(value)
+
+        if pending:
+            yield time, pending
+
+    def close(self):
+        self._file.close()
+        if self._process is not None:
+            self._process.wait()
+
+
+def parse_value(value):
+    """Interpret a (binary) value of the VCD file"""
+
+    try:
+        return int(value, 2)
+    except ValueError:
+        return None
+
+
+class TransactionDecoder:
+    """Reconstruct the BRAM accesses into packets
+
+    A PS to PL packet starts when the receiver moves from the checksum (the idle
+    address) to the indicator of the PS to PL area, and a PL to PS packet starts by
+    writing the checksum of the PL to PS area. The receiver and the sender park
+    the address at the idle address between the header and each data word, so
+    these samples are ignored while a packet is open, and a packet is finished
+    once the next packet starts or the state register returns to its idle state
+    """
+
+    def __init__(self, read_latency=1):
+        self.read_latency = read_latency
+        self.layout = packet.layout()
+
+        #
+        # Columns of the accesses
+        #
+        self.access_cycle = []
+        self.access_time = []
+        self.access_kind = []
+        self.access_address = []
+        self.access_data = []
+        self.access_resolved = []
+        self.access_packet = []
+
+        #
+        # Columns of the packets
+        #
+        self.packet_direction = []
+        self.packet_start_cycle = []
+        self.packet_end_cycle = []
+        self.packet_checksum = []
+        self.packet_indicator = []
+        self.packet_type = []
+        self.packet_requested_action = []
+        self.packet_payload_offset = []
+        self.packet_payload_length = []
+        self.payload = []
+
+        self._previous_address = None
+        self._previous_state = None
+        self._current = {DIRECTION_PS_TO_PL: None, DIRECTION_PL_TO_PS: None}
+        self._packet_words = []
+        self._pending_reads = []
+
+    def _area(self, address):
+        if self.layout.ps_to_pl_base <= address < self.layout.pl_to_ps_base:
+            return DIRECTION_PS_TO_PL
+        elif self.layout.pl_to_ps_base <= address < self.layout.memory_size:
+            return DIRECTION_PL_TO_PS
+        return None
+
+    def _open(self, direction, cycle):
+
+        #
+        # The synchronizer serves one packet at a time
+        #
+        for other in (DIRECTION_PS_TO_PL, DIRECTION_PL_TO_PS):
+            self._close(other, cycle)
+
+        self._current[direction] = len(self.packet_direction)
+        self._packet_words.append({})
+        self.packet_direction.append(direction)
+        self.packet_start_cycle.append(cycle)
+        self.packet_end_cycle.append(cycle)
+
+    def _close(self, direction, cycle):
+        if self._current[direction] is not None:
+            self.packet_end_cycle[self._current[direction]] = cycle
+            self._current[direction] = None
+
+    def _record(self, cycle, time, kind, address, data, direction):
+        self.access_cycle.append(cycle)
+        self.access_time.append(time)
+        self.access_kind.append(kind)
+        self.access_address.append(address)
+        self.access_data.append(data if data is not None else 0)
+        self.access_resolved.append(data is not None)
+        self.access_packet.append(self._current[direction] if direction is not None and self._current[direction] is not None else -1)
+
+        return len(self.access_cycle) - 1
+
+    def _store_word(self, packet_index, address, data):
+        if packet_index != -1 and data is not None:
+            self._packet_words[packet_index][address] = data
+
+    def edge(self, cycle, time, address, write, write_data, read_data, state=None):
+        """Sample the BRAM port (and the state register, if it's dumped) at a rising edge of the clock"""
+
+        #
+        # Complete the reads that their data is ready
+        #
+        while self._pending_reads and self._pending_reads[0][0] <= cycle:
+            _, index = self._pending_reads.pop(0)
+            self.access_data[index] = read_data if read_data is not None else 0
+            self.access_resolved[index] = read_data is not None
+            self._store_word(self.access_packet[index], self.access_address[index], read_data)
+
+        #
+        # The open packets are finished once the state machine returns to idle
+        #
+        if state == STATE_IDLE and self._previous_state not in (None, STATE_IDLE):
+            for direction in (DIRECTION_PS_TO_PL, DIRECTION_PL_TO_PS):
+                self._close(direction, cycle)
+
+        self._previous_state = state
+
+        if address is None:
+            self._previous_address = None
+            return
+
+        direction = self._area(address)
+
+        if write == 1:
+            if direction == DIRECTION_PL_TO_PS and address == self.layout.pl_to_ps_base + self.layout.offsets["checksum"]:
+                self._open(DIRECTION_PL_TO_PS, cycle)
+
+            index = self._record(cycle, time, ACCESS_WRITE, address, write_data, direction)
+            self._store_word(self.access_packet[index], address, write_data)
+
+        elif address != self._previous_address:
+
+            idle_address = self.layout.ps_to_pl_base + self.layout.offsets["checksum"]
+            packet_is_open = any(self._current[other] is not None for other in (DIRECTION_PS_TO_PL, DIRECTION_PL_TO_PS))
+
+            if address == idle_address and packet_is_open:
+
+                #
+                # The address is parked between the accesses of the packet
+                #
+                self._previous_address = address
+                return
+
+            if direction == DIRECTION_PS_TO_PL and address == self.layout.ps_to_pl_base + self.layout.offsets["indicator"] \
+                    and self._previous_address == idle_address:
+
+                #
+                # The checksum is read at the idle address (its data is on the read port now),
+                # so it's the first access of the packet
+                #
+                self._open(DIRECTION_PS_TO_PL, cycle - 1)
+                index = self._record(cycle - 1, time, ACCESS_READ, idle_address, read_data, direction)
+                self._store_word(self.access_packet[index], idle_address, read_data)
+
+            index = self._record(cycle, time, ACCESS_READ, address, None, direction)
+            self._pending_reads.append((cycle + self.read_latency, index))
+
+        self._previous_address = address
+
+    def finish(self, cycle):
+        """Close the open packets and interpret the fields of all of the packets"""
+
+        for direction in (DIRECTION_PS_TO_PL, DIRECTION_PL_TO_PS):
+            self._close(direction, cycle)
+
+        offsets = self.layout.offsets
+        word_size = self.layout.word_size
+
+        for index, words in enumerate(self._packet_words):
+
+            if self.packet_direction[index] == DIRECTION_PS_TO_PL:
+                base = self.layout.ps_to_pl_base
+            else:
+                base = self.layout.pl_to_ps_base
+
+            def word(offset):
+                return words.get(base + offset, 0)
+
+            self.packet_checksum.append(word(offsets["checksum"]) | (word(offsets["checksum"] + word_size) << 32))
+            self.packet_indicator.append(word(offsets["indicator"]) | (word(offsets["indicator"] + word_size) << 32))
+            self.packet_type.append(word(offsets["typeOfThePacket"]))
+            self.packet_requested_action.append(word(offsets["requestedActionOfThePacket"]))
+
+            payload = [words[address] for address in sorted(words) if address >= base + offsets["startOfDataBuffer"]]
+            self.packet_payload_offset.append(len(self.payload))
+            self.packet_payload_length.append(len(payload))
+            self.payload.extend(payload)
+
+    def columns(self):
+        """The decoded columns (as lists)"""
+
+        return {
+            "access_cycle": self.access_cycle,
+            "access_time": self.access_time,
+            "access_kind": self.access_kind,
+            "access_address": self.access_address,
+            "access_data": self.access_data,
+            "access_resolved": self.access_resolved,
+            "access_packet": self.access_packet,
+            "packet_direction": self.packet_direction,
+            "packet_start_cycle": self.packet_start_cycle,
+            "packet_end_cycle": self.packet_end_cycle,
+            "packet_checksum": self.packet_checksum,
+            "packet_indicator": self.packet_indicator,
+            "packet_type": self.packet_type,
+            "packet_requested_action": self.packet_requested_action,
+            "packet_payload_offset": self.packet_payload_offset,
+            "packet_payload_length": self.packet_payload_length,
+            "payload": self.payload,
+        }
+
+
+def decode(path, scope=None, clock="clock", read_latency=1):
+    """Decode the BRAM transactions of a waveform dump, returns the decoder"""
+
+    stream = VcdStream(path)
+
+    try:
+        port_scope = stream.find_scope(PORT_SIGNALS, scope)
+        if port_scope is None:
+            raise ValueError("no scope with the BRAM port (" + ", ".join(PORT_SIGNALS) + ") found in " + path)
+
+        identifiers = {name: stream.signals[port_scope + "." + name] for name in PORT_SIGNALS}
+        clock_identifier = stream.signals.get(port_scope + "." + clock)
+        if clock_identifier is None:
+            clock_scope = stream.find_scope([clock], None)
+            if clock_scope is None:
+                raise ValueError("clock signal '" + clock + "' not found in " + path)
+            clock_identifier = stream.signals[clock_scope + "." + clock]
+
+        #
+        # The state register (of the synchronizer, or of the receiver or the
+        # sender) finishes the packets, if it's dumped
+        #
+        state_scope = stream.find_scope(PORT_SIGNALS + [STATE_SIGNAL], scope)
+        state_identifier = stream.signals[state_scope + "." + STATE_SIGNAL] if state_scope is not None else None
+
+        tracked = set(identifiers.values()) | {clock_identifier}
+        if state_identifier is not None:
+            tracked.add(state_identifier)
+        values = {identifier: None for identifier in tracked}
+        decoder = TransactionDecoder(read_latency)
+        cycle = 0
+
+        for time, changes in stream.changes(tracked):
+
+            #
+            # The signals are sampled with their values before the rising edge
+            #
+            if clock_identifier in changes and changes[clock_identifier] == 1 and values[clock_identifier] == 0:
+                decoder.edge(
+                    cycle,
+                    time,
+                    values[identifiers["io_rdWrAddr"]],
+                    values[identifiers["io_wrEna"]],
+                    values[identifiers["io_wrData"]],
+                    values[identifiers["io_rdData"]],
+                    values[state_identifier] if state_identifier is not None else None,
+                )
+                cycle = cycle + 1
+
+            values.update(changes)
+
+        decoder.finish(cycle)
+        decoder.scope = port_scope
+        decoder.timescale = stream.timescale
+        decoder.cycles = cycle
+        return decoder
+
+    finally:
+        stream.close()
+
+
+def save(decoder, output_path):
+    """Save the decoded columns as a NumPy (.npz) file"""
+
+    import numpy as np
+
+    dtypes = {
+        "access_cycle": np.int64,
+        "access_time": np.int64,
+        "access_kind": np.uint8,
+        "access_address": np.uint32,
+        "access_data": np.uint32,
+        "access_resolved": np.bool_,
+        "access_packet": np.int32,
+        "packet_direction": np.uint8,
+        "packet_start_cycle": np.int64,
+        "packet_end_cycle": np.int64,
+        "packet_checksum": np.uint64,
+        "packet_indicator": np.uint64,
+        "packet_type": np.uint32,
+        "packet_requested_action": np.uint32,
+        "packet_payload_offset": np.int64,
+        "packet_payload_length": np.int64,
+        "payload": np.uint32,
+    }
+
+    arrays = {name: np.asarray(column, dtype=dtypes[name]) for name, column in decoder.columns().items()}
+    np.savez_compressed(output_path, timescale=np.asarray(decoder.timescale), scope=np.asarray(decoder.scope), **arrays)
+
+
+def load(path):
+    """Load a decoded (.npz) file as a dictionary of arrays"""
+
+    import numpy as np
+
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def format_packets(decoder):
+    """One line per decoded packet"""
+
+    lines = []
+    columns = decoder.columns()
+
+    for index, direction in enumerate(columns["packet_direction"]):
+        offset = columns["packet_payload_offset"][index]
+        payload = columns["payload"][offset:offset + columns["packet_payload_length"][index]]
+
+        lines.append("[%5d - %5d] %s type=%d action=%d indicator=%s payload=[%s]" % (
+            columns["packet_start_cycle"][index],
+            columns["packet_end_cycle"][index],
+            "PS -> PL" if direction == DIRECTION_PS_TO_PL else "PL -> PS",
+            columns["packet_type"][index],
+            columns["packet_requested_action"][index],
+            "valid" if columns["packet_indicator"][index] == packet.layout().indicator else hex(columns["packet_indicator"][index]),
+            " ".join("%08x" % word for word in payload),
+        ))
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode the BRAM transactions of a VCD (or FST) file")
+    parser.add_argument("dump", help="waveform dump (.vcd or .fst)")
+    parser.add_argument("-o", "--output", help="output file (.npz)")
+    parser.add_argument("--scope", help="scope of the BRAM port (default: the shallowest scope that has the port)")
+    parser.add_argument("--clock", default="clock", help="name of the clock signal")
+    parser.add_argument("--read-latency", type=int, default=1, help="cycles between the address and the read data")
+    parser.add_argument("--quiet", action="store_true", help="do not print the packets")
+    parser.add_argument("--generated", help="directory of the generated files (default: HWDBG_GENERATED_DIR or 'generated')")
+    args = parser.parse_args()
+
+    manifest.use_generated_directory(args.generated)
+
+    try:
+        decoder = decode(args.dump, args.scope, args.clock, args.read_latency)
+    except ValueError as error:
+        print("[x] " + str(error))
+        sys.exit(1)
+
+    print("[*] scope: %s, cycles: %d, accesses: %d, packets: %d" % (
+        decoder.scope, decoder.cycles, len(decoder.access_cycle), len(decoder.packet_direction)))
+
+    if not args.quiet:
+        for line in format_packets(decoder):
+            print(line)
+
+    if args.output is not None:
+        save(decoder, args.output)
+        print("[*] saved to: " + args.output)
+
+
+if __name__ == "__main__":
+    main()
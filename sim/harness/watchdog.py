@@ -0,0 +1,140 @@
+##
+# @file watchdog.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Watchdog of the hung (deadlocked or livelocked) simulations
+#
+# @details While the watchdog is armed, the state registers and the BRAM
+#          address/write lines are fingerprinted on every rising edge of the
+#          clock, the test fails (with a snapshot of the watched signals) once
+#          nothing is changed for a number of cycles
+#
+#          The limit is configured by 'HWDBG_WATCHDOG_CYCLES' (default: 50)
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+
+import cocotb
+from cocotb.triggers import Event, RisingEdge
+
+from harness import handles
+
+#
+# Default number of unchanged cycles before the watchdog fails the test
+#
+DEFAULT_LIMIT_CYCLES = 50
+
+#
+# Names of the watched signals (at any level of the hierarchy)
+#
+WATCHED_SIGNALS = ["state", "io_rdWrAddr", "io_wrEna", "io_wrData"]
+
+
+class WatchdogTimeout(AssertionError):
+    """Nothing is changed in the design for the limit of the watchdog"""
+
+
+class Watchdog:
+    """Fail the test if the watched signals are not changed while armed
+
+    The watchdog is disarmed by default, it should be armed around the loops
+    that wait for the design to make progress (a disarmed watchdog does not wake
+    up in every cycle, so it does not prevent the idle fast-forward)
+    """
+
+    def __init__(self, dut, limit_cycles=None, clock=None):
+        self.dut = dut
+        self.clock = clock if clock is not None else dut.clock
+        self.limit_cycles = limit_cycles if limit_cycles is not None else \
+            int(os.environ.get("HWDBG_WATCHDOG_CYCLES", str(DEFAULT_LIMIT_CYCLES)))
+
+        hw = handles.registry(dut)
+        self.signals = []
+        for name in WATCHED_SIGNALS:
+            self.signals.extend((path, hw.get(path)) for path in hw.find(name))
+
+        self.stalled_cycles = 0
+        self.cycles = 0
+        self._armed = False
+        self._armed_event = Event()
+        self._fingerprint = None
+        self._task = None
+
+    def fingerprint(self):
+        """Values of the watched signals (including the X and Z bits)"""
+
+        return tuple(str(handle.value) for _, handle in self.signals)
+
+    def snapshot(self):
+        """Compact (one signal per line) snapshot of the watched signals"""
+
+        lines = []
+        for path, handle in self.signals:
+            value = handle.value
+            lines.append("  %s = %s" % (path, hex(value.integer) if value.is_resolvable else str(value)))
+        return "\n".join(lines)
+
+    def start(self):
+        """Start the coroutine of the watchdog (disarmed)"""
+
+        if self._task is None:
+            self._task = cocotb.start_soon(self._run())
+        return self
+
+    def stop(self):
+        self.disarm()
+        if self._task is not None:
+            self._task.kill()
+            self._task = None
+
+    def arm(self):
+        """Start watching (the counter of the unchanged cycles is restarted)"""
+
+        self.stalled_cycles = 0
+        self._fingerprint = self.fingerprint()
+        self._armed = True
+        self._armed_event.set()
+
+    def disarm(self):
+        self._armed = False
+        self._armed_event.clear()
+
+    async def _run(self):
+        while True:
+
+            if not self._armed:
+                await self._armed_event.wait()
+                continue
+
+            await RisingEdge(self.clock)
+
+            if not self._armed:
+                continue
+
+            self.cycles = self.cycles + 1
+            fingerprint = self.fingerprint()
+
+            if fingerprint != self._fingerprint:
+                self._fingerprint = fingerprint
+                self.stalled_cycles = 0
+                continue
+
+            self.stalled_cycles = self.stalled_cycles + 1
+
+            if self.stalled_cycles >= self.limit_cycles:
+                self.dut._log.error("Watchdog: nothing is changed for %d cycles, snapshot:\n%s",
+                                    self.stalled_cycles, self.snapshot())
+                raise WatchdogTimeout("the design is hung for " + str(self.stalled_cycles) + " cycles")
+
+
+def start(dut, limit_cycles=None):
+    """Create and start a (disarmed) watchdog"""
+
+    return Watchdog(dut, limit_cycles).start()
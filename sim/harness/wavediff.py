@@ -0,0 +1,267 @@
+##
+# @file wavediff.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Streaming differential comparison of two waveform dumps
+#
+# @details Two VCD (or FST) files are walked in lockstep (only the current value
+#          of each compared signal is kept in memory), and the first divergent
+#          signals are reported with their time and clock cycle. Alternatively,
+#          the BRAM transactions of both dumps are decoded (see vcd.py) and the
+#          packets are compared in order, so the runs that are shifted in time
+#          are still aligned
+#
+#          The signals are selected by the syntax of 'modelsim.config' (a
+#          'module:' line, then one signal filter per line)
+#
+#            python3 -m harness.wavediff good.vcd bad.vcd --config ../modelsim/modelsim.config
+#            python3 -m harness.wavediff good.vcd bad.vcd --align transaction
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import argparse
+import fnmatch
+import sys
+
+from harness import manifest, vcd
+from modelsim import modelsim
+
+#
+# Default number of the reported divergences
+#
+DEFAULT_MAXIMUM_DIVERGENCES = 10
+
+
+def read_filters(config_path):
+    """Signal filters of a config file of the ModelSim viewer (its test module is not a filter)"""
+
+    _, filters = modelsim.read_config(config_path)
+    return filters
+
+
+def is_selected(name, filters):
+    """Check whether a signal is selected (the filters match like '{*filter*}' of the viewer)"""
+
+    return not filters or any(fnmatch.fnmatchcase(name, "*" + item + "*") for item in filters)
+
+
+def relative_name(full_name, strip_scopes):
+    return full_name.split(".", strip_scopes)[-1] if strip_scopes else full_name
+
+
+class Divergence:
+    """A signal that diverges between the two dumps"""
+
+    def __init__(self, name, time, cycle, value_a, value_b):
+        self.name = name
+        self.time = time
+        self.cycle = cycle
+        self.value_a = value_a
+        self.value_b = value_b
+
+    def __str__(self):
+        def text(value):
+            return "x" if value is None else hex(value)
+
+        return "cycle %-8d time %-12d %s: %s != %s" % (self.cycle, self.time, self.name, text(self.value_a), text(self.value_b))
+
+
+def lockstep(changes_a, changes_b):
+    """Merge the time steps of two streams, yields (time, changes of a, changes of b)"""
+
+    step_a = next(changes_a, None)
+    step_b = next(changes_b, None)
+
+    while step_a is not None or step_b is not None:
+        if step_b is None or (step_a is not None and step_a[0] < step_b[0]):
+            yield step_a[0], step_a[1], {}
+            step_a = next(changes_a, None)
+        elif step_a is None or step_b[0] < step_a[0]:
+            yield step_b[0], {}, step_b[1]
+            step_b = next(changes_b, None)
+        else:
+            yield step_a[0], step_a[1], step_b[1]
+            step_a = next(changes_a, None)
+            step_b = next(changes_b, None)
+
+
+def diff_by_time(path_a, path_b, filters=(), maximum=DEFAULT_MAXIMUM_DIVERGENCES, clock="clock", strip_scopes=0):
+    """Compare the values of the common signals at each time step
+
+    Returns (divergences, signals only in a, signals only in b), each signal is
+    reported once (at its first divergence) and the walk stops after 'maximum'
+    divergent signals
+    """
+
+    stream_a = vcd.VcdStream(path_a)
+    stream_b = vcd.VcdStream(path_b)
+
+    try:
+        names_a = {relative_name(name, strip_scopes): identifier for name, identifier in stream_a.signals.items()
+                   if is_selected(name, filters)}
+        names_b = {relative_name(name, strip_scopes): identifier for name, identifier in stream_b.signals.items()
+                   if is_selected(name, filters)}
+        common = sorted(set(names_a) & set(names_b))
+
+        #
+        # The names of each identifier (the identifiers of the aliases are shared)
+        #
+        aliases_a = {}
+        aliases_b = {}
+        for name in common:
+            aliases_a.setdefault(names_a[name], []).append(name)
+            aliases_b.setdefault(names_b[name], []).append(name)
+
+        clock_scope = stream_a.find_scope([clock])
+        clock_identifier = stream_a.signals.get(clock_scope + "." + clock) if clock_scope is not None else None
+
+        values_a = {}
+        values_b = {}
+        reported = set()
+        divergences = []
+        cycle = 0
+
+        #
+        # The changed signals of the current time (a time may be split into
+        # several steps, so they are compared once the time is advanced)
+        #
+        changed = set()
+        current_time = None
+
+        def compare():
+            for name in sorted(changed - reported):
+                if values_a.get(name) != values_b.get(name):
+                    reported.add(name)
+                    divergences.append(Divergence(name, current_time, cycle, values_a.get(name), values_b.get(name)))
+            changed.clear()
+
+        tracked_a = set(aliases_a) | ({clock_identifier} if clock_identifier is not None else set())
+
+        for time, changes_a, changes_b in lockstep(stream_a.changes(tracked_a), stream_b.changes(set(aliases_b))):
+
+            if time != current_time:
+                compare()
+                current_time = time
+
+                if len(divergences) >= maximum:
+                    break
+
+            if clock_identifier in changes_a and changes_a[clock_identifier] == 1:
+                cycle = cycle + 1
+
+            for identifier, value in changes_a.items():
+                for name in aliases_a.get(identifier, ()):
+                    values_a[name] = value
+                    changed.add(name)
+            for identifier, value in changes_b.items():
+                for name in aliases_b[identifier]:
+                    values_b[name] = value
+                    changed.add(name)
+        else:
+            compare()
+
+        return divergences[:maximum], sorted(set(names_a) - set(names_b)), sorted(set(names_b) - set(names_a))
+
+    finally:
+        stream_a.close()
+        stream_b.close()
+
+
+PACKET_FIELDS = ["packet_direction", "packet_checksum", "packet_indicator", "packet_type", "packet_requested_action"]
+
+
+def packets(decoder):
+    """The packets of a decoder as dictionaries"""
+
+    columns = decoder.columns()
+
+    for index in range(len(columns["packet_direction"])):
+        offset = columns["packet_payload_offset"][index]
+        fields = {name: columns[name][index] for name in PACKET_FIELDS}
+        fields["payload"] = list(columns["payload"][offset:offset + columns["packet_payload_length"][index]])
+        fields["start_cycle"] = columns["packet_start_cycle"][index]
+        yield fields
+
+
+def diff_by_transaction(path_a, path_b, maximum=DEFAULT_MAXIMUM_DIVERGENCES, scope=None):
+    """Compare the decoded packets of the two dumps in order
+
+    Returns the divergences (the name of a divergence is the index of the packet
+    and its field, the cycle is the start of the packet in the first dump)
+    """
+
+    packets_a = list(packets(vcd.decode(path_a, scope)))
+    packets_b = list(packets(vcd.decode(path_b, scope)))
+    divergences = []
+
+    for index in range(max(len(packets_a), len(packets_b))):
+        if index >= len(packets_a) or index >= len(packets_b):
+            present = packets_a[index] if index < len(packets_a) else packets_b[index]
+            divergences.append(Divergence("packet[%d] (missing in %s)" % (index, "b" if index < len(packets_a) else "a"),
+                                          0, present["start_cycle"], None, None))
+        else:
+            for field in PACKET_FIELDS + ["payload"]:
+                value_a = packets_a[index][field]
+                value_b = packets_b[index][field]
+                if value_a == value_b:
+                    continue
+
+                if field == "payload":
+                    position = next((word for word, (a, b) in enumerate(zip(value_a, value_b)) if a != b),
+                                    min(len(value_a), len(value_b)))
+                    field = "payload[%d]" % position
+                    value_a = value_a[position] if position < len(value_a) else None
+                    value_b = value_b[position] if position < len(value_b) else None
+
+                divergences.append(Divergence("packet[%d].%s" % (index, field), 0,
+                                              packets_a[index]["start_cycle"], value_a, value_b))
+
+        if len(divergences) >= maximum:
+            break
+
+    return divergences[:maximum]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two waveform dumps (VCD or FST)")
+    parser.add_argument("a", help="the reference dump")
+    parser.add_argument("b", help="the compared dump")
+    parser.add_argument("--align", choices=["time", "transaction"], default="time", help="alignment of the dumps")
+    parser.add_argument("--config", help="signal filters (with the syntax of modelsim.config)")
+    parser.add_argument("--signal", action="append", default=[], help="signal filter (in addition to the config)")
+    parser.add_argument("--max", type=int, default=DEFAULT_MAXIMUM_DIVERGENCES, help="number of the reported divergences")
+    parser.add_argument("--clock", default="clock", help="name of the clock (for the cycle numbers)")
+    parser.add_argument("--strip-scopes", type=int, default=0, help="number of the top scopes that are ignored in the names")
+    parser.add_argument("--scope", default=None, help="scope of the BRAM port (transaction alignment)")
+    parser.add_argument("--generated", help="directory of the generated files (default: HWDBG_GENERATED_DIR or 'generated')")
+    args = parser.parse_args()
+
+    manifest.use_generated_directory(args.generated)
+
+    if args.align == "transaction":
+        divergences = diff_by_transaction(args.a, args.b, args.max, args.scope)
+    else:
+        filters = (read_filters(args.config) if args.config else []) + args.signal
+        divergences, only_a, only_b = diff_by_time(args.a, args.b, filters, args.max, args.clock, args.strip_scopes)
+
+        if only_a or only_b:
+            print("[*] %d signals only in a, %d signals only in b (not compared)" % (len(only_a), len(only_b)))
+
+    if not divergences:
+        print("[*] no divergence")
+        return 0
+
+    for divergence in divergences:
+        print(divergence)
+
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
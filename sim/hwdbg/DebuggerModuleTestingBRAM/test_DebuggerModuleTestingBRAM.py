@@ -14,15 +14,43 @@
 # @copyright This project is released under the GNU Public License v3.
 #
 
+import json
+import os
 import random
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer
+from cocotb.triggers import ReadWrite, Timer
 from cocotb.types import LogicArray
 
+from harness import capture, checkpoint, cosim, eventlog, faults, handles, idle, journal, manifest, perfdb, profiler, runner, stimulus, toggle, traffic, watchdog
+
 maximum_number_of_clock_cycles = 1000
 
+#
+# Layout of the generated design (offsets, BRAM geometry, ...)
+#
+layout = manifest.load()
+
+#
+# Events of the testbench (kept in the event log instead of being printed)
+#
+EVENT_RESET = eventlog.define("Initialize and reset module")
+EVENT_ENABLE = eventlog.define("Enabling an interrupting chip to receive commands from BRAM")
+EVENT_WAITING = eventlog.define("Number of clock cycles spent in debuggee (PL): {0}")
+EVENT_INTERRUPTED = eventlog.define("Debuggee (PL) interrupted Debugger (PS) after {0} clock cycles")
+EVENT_MAXIMUM_CYCLES = eventlog.define("Maximum clock cycles reached ({0})")
+EVENT_BRAM_WORD = eventlog.define("mem_{0}: {1:08x}")
+EVENT_BRAM_SAVED = eventlog.define("Content of BRAM ({0} words) is saved to bram_content_after_emulation.txt")
+
+#
+# Initial values of the input pins (repeated for wider pin banks)
+#
+initial_input_pin_values = [
+    1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1,
+]
+
 '''
   input  clock,
          reset,
@@ -95,19 +123,13 @@ maximum_number_of_clock_cycles = 1000
   output io_psOutInterrupt
 '''
 
-#
-# Define a function to extract the numeric part of the string
-#
-def extract_number(s):
-    return int(s.split('_')[1])
-
-def print_bram_content(dut):
+def print_bram_content(dut, bram_journal=None):
     """Printing contents of Block RAM and saving them to a file"""
 
     #
     # Print the instances and signals (which includes the ports) of the design's toplevel
     #
-    print("===================================================================")
+    # print("===================================================================")
     # print("Onstances and signals (which includes the ports) of the design's toplevel:")
     # print(dir(dut))
     # print("===================================================================")
@@ -119,162 +141,144 @@ def print_bram_content(dut):
     # print("Onstances and signals of 'dataOut_initRegMemFromFileModule' under the toplevel:")
     # print(dir(dut.dataOut_initRegMemFromFileModule))
 
-    items_inside_bram_emulator = dir(dut.dataOut_initRegMemFromFileModule)
-    mem_items = []
+    #
+    # The registry discovers (and sorts) the memory cells only once per session
+    #
+    hw = handles.registry(dut)
+    sorted_list = hw.indexed_names("mem", "dataOut_initRegMemFromFileModule")
+    sorted_handles = hw.indexed("mem", "dataOut_initRegMemFromFileModule")
+
+    #
+    # If the writes are journaled, the content is the initial image plus the
+    # journal (instead of reading every memory cell of the simulator)
+    #
+    journaled_words = bram_journal.image() if bram_journal is not None else None
 
-    for item in items_inside_bram_emulator:
-        if item.startswith("mem_"):
-            mem_items.append(item)
+    #
+    # The lines are written to the file at once (and the words are kept in the
+    # event log instead of being printed)
+    #
+    lines = ["Content of BRAM after emulation:"]
 
     #
-    # Sort the list using the custom key function
+    # The addresses of the PS to PL and PL to PS areas (and their fields) are
+    # taken from the layout manifest of the generated design
     #
-    sorted_list = sorted(mem_items, key=extract_number)
+    def mem_name(address, word=0):
+        return "mem_" + str(layout.word_index(address) + word)
+
+    address_of_ps_to_pl_communication = mem_name(layout.ps_to_pl_base)
+    address_of_ps_to_pl_communication_checksum1 = mem_name(layout.ps_to_pl_address("checksum"))
+    address_of_ps_to_pl_communication_checksum2 = mem_name(layout.ps_to_pl_address("checksum"), 1)
+    address_of_ps_to_pl_communication_indicator1 = mem_name(layout.ps_to_pl_address("indicator"))
+    address_of_ps_to_pl_communication_indicator2 = mem_name(layout.ps_to_pl_address("indicator"), 1)
+    address_of_ps_to_pl_communication_type_of_packet = mem_name(layout.ps_to_pl_address("typeOfThePacket"))
+    address_of_ps_to_pl_communication_requested_action_of_the_packet = mem_name(layout.ps_to_pl_address("requestedActionOfThePacket"))
+    address_of_ps_to_pl_communication_start_of_data = mem_name(layout.ps_to_pl_address("startOfDataBuffer"))
+
+    address_of_pl_to_ps_communication = mem_name(layout.pl_to_ps_base)
+    address_of_pl_to_ps_communication_checksum1 = mem_name(layout.pl_to_ps_address("checksum"))
+    address_of_pl_to_ps_communication_checksum2 = mem_name(layout.pl_to_ps_address("checksum"), 1)
+    address_of_pl_to_ps_communication_indicator1 = mem_name(layout.pl_to_ps_address("indicator"))
+    address_of_pl_to_ps_communication_indicator2 = mem_name(layout.pl_to_ps_address("indicator"), 1)
+    address_of_pl_to_ps_communication_type_of_packet = mem_name(layout.pl_to_ps_address("typeOfThePacket"))
+    address_of_pl_to_ps_communication_requested_action_of_the_packet = mem_name(layout.pl_to_ps_address("requestedActionOfThePacket"))
+    address_of_pl_to_ps_communication_start_of_data = mem_name(layout.pl_to_ps_address("startOfDataBuffer"))
+
+    for item, element in zip(sorted_list, sorted_handles):
+
+        #
+        # Print the target register in binary format
+        #
+        # print(str(element))
 
-    with open("bram_content_after_emulation.txt", "w") as file:
-        file.write("Content of BRAM after emulation:\n")
-        print("Content of BRAM after emulation:")
+        #
+        # Convert binary to int
+        #
+        if journaled_words is not None:
+            int_content = journaled_words[handles.extract_number(item)]
+        else:
+            int_content = int(str(element.value), 2)
 
         #
-        # The second half of the BRAM is used for PL to PS communication
+        # Convert integer to hexadecimal string with at least 8 characters
         #
-        address_of_ps_to_pl_communication = "mem_0"
-        address_of_ps_to_pl_communication_checksum1 = "mem_0"
-        address_of_ps_to_pl_communication_checksum2 = "mem_1"
-        address_of_ps_to_pl_communication_indicator1 = "mem_2"
-        address_of_ps_to_pl_communication_indicator2 = "mem_3"
-        address_of_ps_to_pl_communication_type_of_packet = "mem_4"
-        address_of_ps_to_pl_communication_requested_action_of_the_packet = "mem_5"
-        address_of_ps_to_pl_communication_start_of_data = "mem_6"
+        hex_string = f'{int_content:08x}'
+
+        final_string = ""
+        if len(item) == 5:
+            final_string = item + ":   " + hex_string
+        elif len(item) == 6:
+            final_string = item + ":  " + hex_string
+        else:
+            final_string = item + ": " + hex_string
+
+        #
+        # Make a separation between PS and PL area
+        #
+        if item == address_of_ps_to_pl_communication:
+            lines.append("\nPS to PL area:")
+        elif item == address_of_pl_to_ps_communication:
+            lines.append("\nPL to PS area:")
         
-        len_of_sorted_list_div_by_2 = int(len(sorted_list) / 2)
-        address_of_pl_to_ps_communication = "mem_" + str(len_of_sorted_list_div_by_2)
-        address_of_pl_to_ps_communication_checksum1 = "mem_" + str(len_of_sorted_list_div_by_2 + 0)
-        address_of_pl_to_ps_communication_checksum2 = "mem_" + str(len_of_sorted_list_div_by_2 + 1)
-        address_of_pl_to_ps_communication_indicator1 = "mem_" + str(len_of_sorted_list_div_by_2 + 2)
-        address_of_pl_to_ps_communication_indicator2 = "mem_" + str(len_of_sorted_list_div_by_2 + 3)
-        address_of_pl_to_ps_communication_type_of_packet = "mem_" + str(len_of_sorted_list_div_by_2 + 4)
-        address_of_pl_to_ps_communication_requested_action_of_the_packet = "mem_" + str(len_of_sorted_list_div_by_2 + 5)
-        address_of_pl_to_ps_communication_start_of_data = "mem_" + str(len_of_sorted_list_div_by_2 + 6)
+        if item == address_of_ps_to_pl_communication_checksum1 or \
+        item == address_of_ps_to_pl_communication_checksum2 or \
+        item == address_of_pl_to_ps_communication_checksum1 or \
+        item == address_of_pl_to_ps_communication_checksum2:
+            final_string = final_string + "   | Checksum"
+        elif item == address_of_ps_to_pl_communication_indicator1 or \
+        item == address_of_ps_to_pl_communication_indicator2 or \
+        item == address_of_pl_to_ps_communication_indicator1 or \
+        item == address_of_pl_to_ps_communication_indicator2:
+            final_string = final_string + "   | Indicator"
+        elif item == address_of_ps_to_pl_communication_type_of_packet or \
+        item == address_of_pl_to_ps_communication_type_of_packet:
+            final_string = final_string + "   | TypeOfThePacket"
+        elif item == address_of_ps_to_pl_communication_requested_action_of_the_packet or \
+        item == address_of_pl_to_ps_communication_requested_action_of_the_packet:
+            final_string = final_string + "   | RequestedActionOfThePacket"
+        elif item == address_of_ps_to_pl_communication_start_of_data or \
+        item == address_of_pl_to_ps_communication_start_of_data:
+            final_string = final_string + "   | Start of Optional Data"
+
+        #
+        # Keep contents of BRAM
+        #
+        lines.append(final_string)
+        eventlog.log(EVENT_BRAM_WORD, handles.extract_number(item), int_content)
 
-        print("Address of PL to PS communication: " + address_of_pl_to_ps_communication)
+    with open(runner.output_path("bram_content_after_emulation.txt"), "w") as file:
+        file.write("\n".join(lines) + "\n")
 
-        for item in sorted_list:
-            element = getattr(dut.dataOut_initRegMemFromFileModule, item)
+    eventlog.log(EVENT_BRAM_SAVED, len(sorted_list))
 
-            #
-            # Print the target register in binary format
-            #
-            # print(str(element))
 
-            #
-            # Convert binary to int
-            #
-            int_content = int(str(element.value), 2)
+def requested_action_name():
+    """Name of the action that is requested by the BRAM initialization file"""
 
-            #
-            # Convert integer to hexadecimal string with at least 8 characters
-            #
-            hex_string = f'{int_content:08x}'
+    image = journal.initial_image(layout)
+    requested_action = image[layout.ps_to_pl_address("requestedActionOfThePacket") // layout.word_size]
+    names = {value: name for name, value in layout.actions.items()}
 
-            final_string = ""
-            if len(item) == 5:
-                final_string = item + ":   " + hex_string
-            elif len(item) == 6:
-                final_string = item + ":  " + hex_string
-            else:
-                final_string = item + ": " + hex_string
+    return names.get(requested_action, "0x%x" % requested_action)
 
-            #
-            # Make a separation between PS and PL area
-            #
-            if item == address_of_ps_to_pl_communication:
-                file.write("\nPS to PL area:\n")
-                print("\nPS to PL area:")
-            elif item == address_of_pl_to_ps_communication:
-                file.write("\nPL to PS area:\n")
-                print("\nPL to PS area:")
-            
-            if item == address_of_ps_to_pl_communication_checksum1 or \
-            item == address_of_ps_to_pl_communication_checksum2 or \
-            item == address_of_pl_to_ps_communication_checksum1 or \
-            item == address_of_pl_to_ps_communication_checksum2:
-                final_string = final_string + "   | Checksum"
-            elif item == address_of_ps_to_pl_communication_indicator1 or \
-            item == address_of_ps_to_pl_communication_indicator2 or \
-            item == address_of_pl_to_ps_communication_indicator1 or \
-            item == address_of_pl_to_ps_communication_indicator2:
-                final_string = final_string + "   | Indicator"
-            elif item == address_of_ps_to_pl_communication_type_of_packet or \
-            item == address_of_pl_to_ps_communication_type_of_packet:
-                final_string = final_string + "   | TypeOfThePacket"
-            elif item == address_of_ps_to_pl_communication_requested_action_of_the_packet or \
-            item == address_of_pl_to_ps_communication_requested_action_of_the_packet:
-                final_string = final_string + "   | RequestedActionOfThePacket"
-            elif item == address_of_ps_to_pl_communication_start_of_data or \
-            item == address_of_pl_to_ps_communication_start_of_data:
-                final_string = final_string + "   | Start of Optional Data"
 
-            #
-            # Print contents of BRAM
-            #
-            file.write(final_string + "\n")
-            print(final_string)
+def warm_start_inputs(dut):
+    """Inputs that are driven by the reset sequence"""
 
-    print("===================================================================")
+    return ["reset", "io_en", "io_plInSignal"] + handles.registry(dut).indexed_names("io_inputPin")
 
 
-@cocotb.test()
-async def DebuggerModuleTestingBRAM_test(dut):
-    """Test hwdbg module (with pre-defined BRAM)"""
+async def reset_and_enable(dut):
+    """Reset the module, enable it and set the initial values of the input pins"""
 
     #
     # Assert initial output is unknown
     #
-    assert LogicArray(dut.io_outputPin_0.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_1.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_2.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_3.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_4.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_5.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_6.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_7.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_8.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_9.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_10.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_11.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_12.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_13.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_14.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_15.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_16.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_17.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_18.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_19.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_20.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_21.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_22.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_23.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_24.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_25.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_26.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_27.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_28.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_29.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_30.value) == LogicArray("X")
-    assert LogicArray(dut.io_outputPin_31.value) == LogicArray("X")
+    for output_pin in handles.registry(dut).indexed("io_outputPin"):
+        assert LogicArray(output_pin.value) == LogicArray("X")
 
-    #
-    # Create a 10ns period clock on port clock
-    #
-    clock = Clock(dut.clock, 10, units="ns")
-    
-    #
-    # Start the clock. Start it low to avoid issues on the first RisingEdge
-    #
-    cocotb.start_soon(clock.start(start_high=False))
-    
-    dut._log.info("Initialize and reset module")
+    eventlog.log(EVENT_RESET)
 
     #
     # Initial values
@@ -290,7 +294,7 @@ async def DebuggerModuleTestingBRAM_test(dut):
         await Timer(10, units="ns")
     dut.reset.value = 0
 
-    dut._log.info("Enabling an interrupting chip to receive commands from BRAM")
+    eventlog.log(EVENT_ENABLE)
 
     #
     # Enable chip
@@ -300,97 +304,205 @@ async def DebuggerModuleTestingBRAM_test(dut):
     #
     # Set initial input value to prevent it from floating
     #
-    dut.io_inputPin_0.value = 1
-    dut.io_inputPin_1.value = 0
-    dut.io_inputPin_2.value = 1
-    dut.io_inputPin_3.value = 0
-    dut.io_inputPin_4.value = 1
-    dut.io_inputPin_5.value = 0
-    dut.io_inputPin_6.value = 1
-    dut.io_inputPin_7.value = 0
-    dut.io_inputPin_8.value = 1
-    dut.io_inputPin_9.value = 0
-    dut.io_inputPin_10.value = 1
-    dut.io_inputPin_11.value = 0
-    dut.io_inputPin_12.value = 1
-    dut.io_inputPin_13.value = 0
-    dut.io_inputPin_14.value = 1
-    dut.io_inputPin_15.value = 0
-    dut.io_inputPin_16.value = 0
-    dut.io_inputPin_17.value = 0
-    dut.io_inputPin_18.value = 0
-    dut.io_inputPin_19.value = 0
-    dut.io_inputPin_20.value = 0
-    dut.io_inputPin_21.value = 0
-    dut.io_inputPin_22.value = 0
-    dut.io_inputPin_23.value = 0
-    dut.io_inputPin_24.value = 0
-    dut.io_inputPin_25.value = 1
-    dut.io_inputPin_26.value = 1
-    dut.io_inputPin_27.value = 1
-    dut.io_inputPin_28.value = 1
-    dut.io_inputPin_29.value = 1
-    dut.io_inputPin_30.value = 1
-    dut.io_inputPin_31.value = 1
-
-    #
-    # Tell the hwdbg to receive BRAM results
-    #
-    dut.io_plInSignal.value = 1
-    await Timer(10, units="ns")
-    dut.io_plInSignal.value = 0
+    for index, input_pin in enumerate(handles.registry(dut).indexed("io_inputPin")):
+        input_pin.value = initial_input_pin_values[index % len(initial_input_pin_values)]
+
+
+@cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
+async def DebuggerModuleTestingBRAM_test(dut):
+    """Test hwdbg module (with pre-defined BRAM)"""
+
+    #
+    # Create a 10ns period clock on port clock
+    #
+    clock = Clock(dut.clock, 10, units="ns")
+
+    #
+    # Start the clock. Start it low to avoid issues on the first RisingEdge
+    #
+    cocotb.start_soon(clock.start(start_high=False))
 
     #
-    # Synchronize with the clock. This will regisiter the initial `inputPinX` value
+    # Capture the output pins (if HWDBG_CAPTURE_PINS is set)
     #
-    await Timer(10, units="ns")
+    pin_capture = capture.start_from_environment(dut)
 
     #
-    # Wait until the debuggee sends an interrupt to debugger
+    # Journal the writes of the BRAM (if HWDBG_BRAM_JOURNAL is set)
     #
-    clock_counter = 0
-    interrupt_not_delivered = False
+    bram_journal = journal.start_from_environment(dut)
+
+    try:
+        #
+        # Profile the stages of the script execution engine (if HWDBG_STAGE_PROFILE
+        # is set), the section is named after the BRAM initialization file
+        #
+        stage_profiler = profiler.start_from_environment(dut)
+        if stage_profiler is not None:
+            stage_profiler.section(os.path.basename(layout.configurations["BRAM_INITIALIZATION_FILE_PATH"]))
+
+        #
+        # Count the toggles of the signal groups (if HWDBG_TOGGLE_SAIF is set)
+        #
+        toggle_collector = toggle.start_from_environment(dut)
+
+        #
+        # Reset and enable the module (or restore the state after the reset
+        # if it's already done in this simulation)
+        #
+        await checkpoint.warm_start(dut, "reset", lambda: reset_and_enable(dut), warm_start_inputs(dut))
+
+        #
+        # Tell the hwdbg to receive BRAM results
+        #
+        dut.io_plInSignal.value = 1
+        await Timer(10, units="ns")
+        dut.io_plInSignal.value = 0
+
+        #
+        # Synchronize with the clock. This will regisiter the initial `inputPinX` value
+        #
+        await Timer(10, units="ns")
+
+        #
+        # Fail early if the debuggee stops making progress (e.g., a hung handshake)
+        #
+        hang_watchdog = watchdog.start(dut)
+        hang_watchdog.arm()
 
-    while str(dut.io_psOutInterrupt) != "1":
+        #
+        # Wait until the debuggee sends an interrupt to debugger
+        #
+        clock_counter = 0
+        interrupt_not_delivered = False
+
+        while str(dut.io_psOutInterrupt) != "1":
         
-        # print("State of interrupt: '" + str(dut.io_psOutInterrupt)+ "'")
+            # print("State of interrupt: '" + str(dut.io_psOutInterrupt)+ "'")
 
-        if clock_counter % 10 == 0:
-            print("Number of clock cycles spent in debuggee (PL): " + str(clock_counter))
+            if clock_counter % 10 == 0:
+                eventlog.log(EVENT_WAITING, clock_counter)
         
-        clock_counter = clock_counter + 1
+            clock_counter = clock_counter + 1
+            await Timer(10, units="ns")
+
+            #
+            # Apply a limitation to the number of clock cycles that
+            # can be executed to avoid infinite time
+            #
+            if (clock_counter >= maximum_number_of_clock_cycles):
+                interrupt_not_delivered = True
+                break
+
+        hang_watchdog.disarm()
+
+        #
+        # Being here means either the debuggee sent an interrupt to the PS
+        # or the maximum clock cycles reached
+        #
+        if interrupt_not_delivered:
+            eventlog.log(EVENT_MAXIMUM_CYCLES, clock_counter)
+        else:
+            eventlog.log(EVENT_INTERRUPTED, clock_counter)
+            perfdb.metric("cycles." + requested_action_name(), clock_counter)
+
+        #
+        # Run one more clock cycle to apply the latest BRAM modifications
+        #
         await Timer(10, units="ns")
 
         #
-        # Apply a limitation to the number of clock cycles that
-        # can be executed to avoid infinite time
+        # Print contents of BRAM
         #
-        if (clock_counter >= maximum_number_of_clock_cycles):
-            interrupt_not_delivered = True
-            break
+        print_bram_content(dut, bram_journal)
 
-    #
-    # Being here means either the debuggee sent an interrupt to the PS
-    # or the maximum clock cycles reached
-    #
-    if interrupt_not_delivered:
-        print("Maximum clock cycles reached")
-    else:    
-        print("Debuggee (PL) interrupted Debugger (PS)")
+        #
+        # Check the final input on the next clock and run the circuit for a couple
+        # of more clock cycles
+        #
+        await idle.wait_cycles(dut, 10)
 
-    #
-    # Run one more clock cycle to apply the latest BRAM modifications
-    #
-    await Timer(10, units="ns")
+        if stage_profiler is not None:
+            stage_reports = stage_profiler.stop()
+
+            for line in profiler.format_report(stage_reports):
+                dut._log.info(line)
+
+            with open(runner.output_path("stage_profile.json"), "w") as file:
+                json.dump(stage_reports, file, indent=2)
+
+        if toggle_collector is not None:
+            activity = toggle_collector.stop()
+
+            for line in toggle.format_report(activity):
+                dut._log.info(line)
+
+            toggle.write_saif(activity, os.environ["HWDBG_TOGGLE_SAIF"], dut._name)
+
+    finally:
+        #
+        # Stop the capture and the journal even if the test fails, so their files are complete
+        #
+        if pin_capture is not None:
+            pin_capture.stop()
+
+        if bram_journal is not None:
+            bram_journal.stop()
+
+
+@cocotb.test(skip="HWDBG_COSIM_MAILBOX" not in os.environ)
+async def DebuggerModuleTestingBRAM_cosim_test(dut):
+    """Serve the requests of a local PS process through the co-simulation mailbox"""
+
+    clock = Clock(dut.clock, 10, units="ns")
+    cocotb.start_soon(clock.start(start_high=False))
+
+    await checkpoint.warm_start(dut, "reset", lambda: reset_and_enable(dut), warm_start_inputs(dut))
 
     #
-    # Print contents of BRAM
+    # Serve the requests until the PS stops the bridge (or it's idle for
+    # HWDBG_COSIM_IDLE_SECONDS)
     #
-    print_bram_content(dut)
+    bridge = cosim.Bridge(dut, os.environ["HWDBG_COSIM_MAILBOX"])
+    dut._log.info("Waiting for the requests of the PS on " + bridge.mailbox.path)
+
+    latencies = await bridge.run()
+    dut._log.info(traffic.format_summary("Request latency (cycles)", traffic.summarize(latencies)))
+
+
+@cocotb.test(skip="HWDBG_FAULT_MUTANTS" not in os.environ)
+async def DebuggerModuleTestingBRAM_fault_test(dut):
+    """Run a batch of the mutated requests of the fault-injection campaign"""
+
+    clock = Clock(dut.clock, 10, units="ns")
+    cocotb.start_soon(clock.start(start_high=False))
+
+    await checkpoint.warm_start(dut, "reset", lambda: reset_and_enable(dut), warm_start_inputs(dut))
 
     #
-    # Check the final input on the next clock and run the circuit for a couple
-    # of more clock cycles
+    # Each mutant starts from the same post-reset state (captured once the
+    # writes of the reset are applied)
     #
-    for _ in range(10):
-        await Timer(10, units="ns")
+    await ReadWrite()
+    post_reset = checkpoint.capture(dut, warm_start_inputs(dut))
+
+    with open(os.environ["HWDBG_FAULT_MUTANTS"], "r") as file:
+        mutants = json.load(file)
+
+    model = faults.PacketModel(layout)
+    cells = handles.registry(dut).indexed("mem", "dataOut_initRegMemFromFileModule")
+    limit_cycles = int(os.environ.get("HWDBG_FAULT_LIMIT_CYCLES", str(faults.DEFAULT_LIMIT_CYCLES)))
+    results = []
+
+    for mutant in mutants:
+        await checkpoint.restore(dut, post_reset)
+
+        outcome, latency, response = await faults.run_mutant(dut, model, cells, mutant, limit_cycles)
+        results.append(dict(mutant, outcome=outcome, latency=latency, response=response))
+
+    with open(os.environ.get("HWDBG_FAULT_RESULTS", runner.output_path("fault_results.json")), "w") as file:
+        json.dump(results, file)
+
+    dut._log.info("Fault-injection batch:\n" + faults.format_summary(faults.summarize(results)))
@@ -0,0 +1 @@
+make SIM=icarus WAVES=1
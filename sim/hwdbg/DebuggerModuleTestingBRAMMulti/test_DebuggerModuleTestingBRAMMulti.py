@@ -0,0 +1,128 @@
+##
+# @file test_DebuggerModuleTestingBRAMMulti.py
+#
+# @author Sina Karvandi (sina@hyperdbg.org)
+#
+# @brief Testing module for DebuggerModuleTestingBRAMMulti
+#
+# @details
+#
+# @version 0.1
+#
+# @date 2026-10-19
+#
+# @copyright This project is released under the GNU Public License v3.
+#
+
+import os
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer
+
+from harness import eventlog, multi, packet, perfdb, stimulus
+
+#
+# Number of the requests of each core (and the idle cycles between them)
+#
+number_of_requests = int(os.environ.get("HWDBG_MULTI_REQUESTS", "8"))
+gap_cycles = int(os.environ.get("HWDBG_MULTI_GAP_CYCLES", "0"))
+
+#
+# Events of the testbench (kept in the event log instead of being printed)
+#
+EVENT_RESET = eventlog.define("Initialize and reset {0} cores")
+EVENT_RESPONSE = eventlog.define("core_{0}: response {1} to the request {2}")
+
+#
+# Initial values of the input pins (repeated for wider pin banks)
+#
+initial_input_pin_values = [
+    1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0, 1, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1,
+]
+
+'''
+  input  clock,
+         reset,
+         io_cores_0_en,
+         io_cores_0_inputPin_0,
+         ...
+  output io_cores_0_outputPin_0,
+         ...
+  input  io_cores_0_plInSignal,
+  output io_cores_0_psOutInterrupt,
+         ... (the same ports for each core)
+'''
+
+@cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
+async def DebuggerModuleTestingBRAMMulti_test(dut):
+    """Test the cores of hwdbg concurrently (each with its own PS driver)"""
+
+    #
+    # Create a 10ns period clock on port clock
+    #
+    clock = Clock(dut.clock, 10, units="ns")
+
+    #
+    # Start the clock. Start it low to avoid issues on the first RisingEdge
+    #
+    cocotb.start_soon(clock.start(start_high=False))
+
+    core_drivers = multi.drivers(dut)
+    assert core_drivers, "no core (core_N) is found in the design"
+
+    eventlog.log(EVENT_RESET, len(core_drivers))
+
+    #
+    # Reset all of the cores, then enable them
+    #
+    for driver in core_drivers:
+        driver.idle(initial_input_pin_values)
+
+    dut.reset.value = 1
+    for _ in range(10):
+        await Timer(10, units="ns")
+    dut.reset.value = 0
+
+    for driver in core_drivers:
+        driver.enable()
+
+    await Timer(10, units="ns")
+
+    #
+    # The cores start with different actions, so different requests are
+    # served at the same time
+    #
+    actions = sorted(multi.EXPECTED_RESPONSES)
+    requests_of_each_core = [[actions[(core + request) % len(actions)] for request in range(number_of_requests)]
+                             for core in range(len(core_drivers))]
+
+    results = await multi.run_concurrently(core_drivers, requests_of_each_core, gap_cycles)
+
+    errors = []
+    for driver, core_results in zip(core_drivers, results):
+        for action, response in core_results:
+            error = multi.check_response(action, response)
+
+            if error is not None:
+                errors.append("core_%d (%s): %s" % (driver.index, action, error))
+            else:
+                eventlog.log(EVENT_RESPONSE, driver.index, response["requested_action"], packet.layout().actions[action])
+
+    for line in multi.format_report(core_drivers):
+        dut._log.info(line)
+
+    #
+    # Mean latency of each action (while all of the cores are busy)
+    #
+    for action in actions:
+        latencies = [latency for driver in core_drivers for latency in driver.action_latencies.get(action, [])]
+
+        if latencies:
+            perfdb.metric("cycles." + action, sum(latencies) / len(latencies))
+
+    assert not errors, "\n".join(errors)
+
@@ -14,13 +14,46 @@
 # @copyright This project is released under the GNU Public License v3.
 #
 
+import os
 import random
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer
+from cocotb.triggers import FallingEdge, Timer
 from cocotb.types import LogicArray
 
+from harness import drivers, eventlog, handles, idle, manifest, packet, stimulus, traffic
+from harness.bram import BramModel
+
+#
+# Events of the testbench (kept in the event log instead of being printed)
+#
+EVENT_ROUND = eventlog.define("Enable receiving data on the chip ({0})")
+
+#
+# Layout of the generated design (offsets, BRAM geometry, ...)
+#
+layout = manifest.load()
+
+#
+# Data of the PS to PL area (returned to the reads of the receiver)
+#
+ps_to_pl_read_data = {
+    layout.ps_to_pl_address("checksum"): 0x00001234,
+    layout.ps_to_pl_address("indicator"): 0x48595045, # first 32 bits of the indicator
+    layout.ps_to_pl_address("typeOfThePacket"): layout.packet_types["DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL"],
+    layout.ps_to_pl_address("requestedActionOfThePacket"): 0x14141414,
+}
+
+#
+# General output (e.g., 0x18181818 at the offset 0x18)
+#
+number_of_general_output_words = 15
+
+for index in range(number_of_general_output_words):
+    offset = layout.offsets["startOfDataBuffer"] + index * layout.word_size
+    ps_to_pl_read_data[layout.ps_to_pl_base + offset] = offset * 0x01010101
+
 '''
   input         clock,
                 reset,
@@ -38,17 +71,19 @@ from cocotb.types import LogicArray
 '''
 
 @cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
 async def DebuggerPacketReceiver_test(dut):
     """Test DebuggerPacketReceiver module"""
 
     #
     # Assert initial output is unknown
     #
-    assert LogicArray(dut.io_rdWrAddr.value) == LogicArray("XXXXXXXXXXXXX")
-    assert LogicArray(dut.io_requestedActionOfThePacketOutput.value) == LogicArray("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
+    assert LogicArray(dut.io_rdWrAddr.value) == LogicArray("X" * len(dut.io_rdWrAddr))
+    assert LogicArray(dut.io_requestedActionOfThePacketOutput.value) == LogicArray("X" * layout.widths["RequestedActionOfThePacket"])
     assert LogicArray(dut.io_requestedActionOfThePacketOutputValid.value) == LogicArray("X")
     assert LogicArray(dut.io_dataValidOutput.value) == LogicArray("X")
-    assert LogicArray(dut.io_receivingData.value) == LogicArray("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
+    assert LogicArray(dut.io_receivingData.value) == LogicArray("X" * layout.configurations["BLOCK_RAM_DATA_WIDTH"])
     assert LogicArray(dut.io_finishedReceivingBuffer.value) == LogicArray("X")
 
     clock = Clock(dut.clock, 10, units="ns")  # Create a 10ns period clock on port clock
@@ -85,7 +120,7 @@ async def DebuggerPacketReceiver_test(dut):
 
     for test_number in range(10):
 
-        dut._log.info("Enable receiving data on the chip (" + str(test_number) + ")")
+        eventlog.log(EVENT_ROUND, test_number)
 
         #
         # Tell the receiver to start receiving data (This mainly operates based on
@@ -103,47 +138,12 @@ async def DebuggerPacketReceiver_test(dut):
             if (dut.io_finishedReceivingBuffer.value == 1):
                 break
             else:
-                match dut.io_rdWrAddr.value:
-                    case 0x0: # checksum
-                        dut.io_rdData.value = 0x00001234
-                    case 0x8: # indicator
-                        dut.io_rdData.value = 0x48595045 # first 32 bits of the indicator
-                    case 0x10: # type
-                        dut.io_rdData.value = 0x4 # debugger to hardware packet (DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL)
-                    case 0x14: # requested action
-                        dut.io_rdData.value = 0x14141414
-                    case 0x18: # General output
-                        dut.io_rdData.value = 0x18181818
-                    case 0x1c: # General output
-                        dut.io_rdData.value = 0x1c1c1c1c
-                    case 0x20: # General output
-                        dut.io_rdData.value = 0x20202020
-                    case 0x24: # General output
-                        dut.io_rdData.value = 0x24242424
-                    case 0x28: # General output
-                        dut.io_rdData.value = 0x28282828
-                    case 0x2c: # General output
-                        dut.io_rdData.value = 0x2c2c2c2c
-                    case 0x30: # General output
-                        dut.io_rdData.value = 0x30303030
-                    case 0x34: # General output
-                        dut.io_rdData.value = 0x34343434
-                    case 0x38: # General output
-                        dut.io_rdData.value = 0x38383838
-                    case 0x3c: # General output
-                        dut.io_rdData.value = 0x3c3c3c3c
-                    case 0x40: # General output
-                        dut.io_rdData.value = 0x40404040
-                    case 0x44: # General output
-                        dut.io_rdData.value = 0x44444444
-                    case 0x48: # General output
-                        dut.io_rdData.value = 0x48484848
-                    case 0x4c: # General output
-                        dut.io_rdData.value = 0x4c4c4c4c
-                    case 0x50: # General output
-                        dut.io_rdData.value = 0x50505050
-                    case _:
-                        assert "invalid address in the address line"
+                #
+                # Return the data of the address (other addresses are not changed)
+                #
+                address = handles.read_int(dut.io_rdWrAddr, None)
+                if address in ps_to_pl_read_data:
+                    dut.io_rdData.value = ps_to_pl_read_data[address]
 
             if dut.io_requestedActionOfThePacketOutputValid.value == 1:
 
@@ -176,12 +176,149 @@ async def DebuggerPacketReceiver_test(dut):
             dut.io_noNewDataReceiver.value = 0
 
         #
-        # Run extra waiting clocks
+        # Run extra waiting clocks (the idle cycles are fast-forwarded)
         #
-        for _ in range(10):
-            await Timer(10, units="ns")
+        await idle.wait_cycles(dut, 10)
 
         #
         # Check the final input on the next clock
         #
         await Timer(10, units="ns")
+
+
+#
+# Configuration of the bandwidth mode (the number of the words of the action
+# buffers, default: up to the capacity of the PS to PL area, and the number of
+# the packets of each size)
+#
+bandwidth_words = [int(words) for words in os.environ.get("HWDBG_RECEIVER_STREAM_WORDS", "").split(",") if words]
+bandwidth_number_of_packets = int(os.environ.get("HWDBG_RECEIVER_PACKETS", "4"))
+
+#
+# Number of the action buffer words that fit in the PS to PL area
+#
+action_buffer_capacity_in_words = (layout.pl_to_ps_base - layout.ps_to_pl_base -
+                                   layout.offsets["startOfDataBuffer"]) // layout.word_size
+
+
+@cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
+async def DebuggerPacketReceiver_bandwidth_test(dut):
+    """Measure the cycles per received word (the readNextData handshake) over large action buffers"""
+
+    clock = Clock(dut.clock, 10, units="ns")  # Create a 10ns period clock on port clock
+
+    #
+    # Start the clock. Start it low to avoid issues on the first RisingEdge
+    #
+    cocotb.start_soon(clock.start(start_high=False))
+
+    #
+    # The consumer toggles 'io_readNextData' in every cycle (the fastest rate of
+    # its rising-edge detector) and the BRAM is served by the model
+    #
+    consumer = drivers.ReceiveConsumer(dut)
+    bram = BramModel(dut, layout.word_index(layout.memory_size))
+
+    #
+    # Initial values
+    #
+    dut.io_en.value = 0
+    dut.io_plInSignal.value = 0
+    consumer.idle()
+
+    #
+    # Reset DUT
+    #
+    dut.reset.value = 1
+    for _ in range(10):
+        await Timer(10, units="ns")
+    dut.reset.value = 0
+
+    dut.io_en.value = 1
+    bram.start()
+
+    sizes = bandwidth_words or [1, 16, action_buffer_capacity_in_words]
+    results = []
+
+    dut._log.info("Bandwidth mode: %s words per packet, %d packets of each size" % (
+        ",".join(str(size) for size in sizes), bandwidth_number_of_packets))
+
+    for size in sizes:
+
+        #
+        # An empty action buffer has no word to measure
+        #
+        assert size >= 1, "the action buffers of the bandwidth mode need at least one word"
+        assert size <= action_buffer_capacity_in_words, \
+            "%d words do not fit in the PS to PL area (%d words)" % (size, action_buffer_capacity_in_words)
+
+        packet_cycles = []
+        word_cycles = []
+
+        for _ in range(bandwidth_number_of_packets):
+
+            payload = [random.randint(0, 0xffffffff) for _ in range(size)]
+            bram.load(layout.ps_to_pl_base, packet.build_packet(0x14141414, payload))
+
+            #
+            # Tell the receiver to start receiving data (on the rising edge of the signal)
+            #
+            await FallingEdge(dut.clock)
+            dut.io_plInSignal.value = 1
+            await FallingEdge(dut.clock)
+            dut.io_plInSignal.value = 0
+
+            consumer.begin(size)
+
+            cycle = 1
+            first_request_cycle = None
+            last_word_cycle = None
+            maximum_number_of_cycles = 4 * (size + 10)
+
+            while dut.io_finishedReceivingBuffer.value != 1:
+
+                #
+                # Drive and sample between the rising edges of the clock
+                #
+                if first_request_cycle is None and dut.io_requestedActionOfThePacketOutputValid.value == 1:
+                    first_request_cycle = cycle
+
+                number_of_words = len(consumer.words)
+                consumer.step()
+
+                if len(consumer.words) != number_of_words:
+                    last_word_cycle = cycle
+
+                await FallingEdge(dut.clock)
+                cycle = cycle + 1
+
+                assert cycle < maximum_number_of_cycles, "the receiver stopped receiving the action buffer (%d words)" % size
+
+            consumer.end()
+
+            assert consumer.action == 0x14141414
+            assert consumer.words == payload
+
+            #
+            # Cycles from the pulse of the interrupt to the end of the receiving, and
+            # from the first request of the data (the requested action is valid) to the last
+            # received word, i.e., the interval is measured from the request edge, so it
+            # includes the fetch of the first word and is divided by all of the words
+            #
+            packet_cycles.append(cycle)
+            word_cycles.append((last_word_cycle - first_request_cycle) / size)
+
+            await idle.wait_cycles(dut, 10)
+
+        results.append((size, packet_cycles, word_cycles))
+
+    bram.stop()
+
+    for size, packet_cycles, word_cycles in results:
+        cycles_per_word = sum(word_cycles) / len(word_cycles)
+
+        dut._log.info("%3d words: %.2f cycles per word, %s, header and finishing overhead: %d cycles" % (
+            size, cycles_per_word, traffic.format_summary("cycles per packet", traffic.summarize(packet_cycles)),
+            min(packet_cycles) - round(cycles_per_word * size)))
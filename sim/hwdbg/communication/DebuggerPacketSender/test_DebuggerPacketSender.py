@@ -14,13 +14,40 @@
 # @copyright This project is released under the GNU Public License v3.
 #
 
+import os
 import random
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer
+from cocotb.triggers import FallingEdge, Timer
 from cocotb.types import LogicArray
 
+from harness import drivers, eventlog, idle, manifest, packet, stimulus, watchdog
+from harness.bram import BramModel
+
+#
+# Events of the testbench (kept in the event log instead of being printed)
+#
+EVENT_ROUND = eventlog.define("Enable sending data on the chip ({0})")
+
+#
+# Layout of the generated design (offsets, BRAM geometry, ...)
+#
+layout = manifest.load()
+
+#
+# Configuration of the streaming mode (the stall pattern of the producer and
+# the number of the words of each packet, default: around the capacity)
+#
+streaming_stall_pattern = os.environ.get("HWDBG_SENDER_STALL", "none")
+streaming_words = [int(words) for words in os.environ.get("HWDBG_SENDER_STREAM_WORDS", "").split(",") if words]
+
+#
+# Number of the payload words that fit in the PL to PS area (up to the end of the BRAM)
+#
+payload_capacity_in_words = (layout.memory_size - layout.pl_to_ps_base -
+                             layout.offsets["startOfDataBuffer"]) // layout.word_size
+
 '''
   input         clock,
                 reset,
@@ -39,6 +66,8 @@ from cocotb.types import LogicArray
 '''
 
 @cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
 async def DebuggerPacketSender_test(dut):
     """Test DebuggerPacketSender module"""
 
@@ -46,9 +75,9 @@ async def DebuggerPacketSender_test(dut):
     # Assert initial output is unknown
     #
     assert LogicArray(dut.io_psOutInterrupt.value) == LogicArray("X")
-    assert LogicArray(dut.io_rdWrAddr.value) == LogicArray("XXXXXXXXXXXXX")
+    assert LogicArray(dut.io_rdWrAddr.value) == LogicArray("X" * len(dut.io_rdWrAddr))
     assert LogicArray(dut.io_wrEna.value) == LogicArray("X")
-    assert LogicArray(dut.io_wrData.value) == LogicArray("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
+    assert LogicArray(dut.io_wrData.value) == LogicArray("X" * layout.configurations["BLOCK_RAM_DATA_WIDTH"])
     assert LogicArray(dut.io_sendWaitForBuffer.value) == LogicArray("X")
     assert LogicArray(dut.io_finishedSendingBuffer.value) == LogicArray("X")
 
@@ -82,9 +111,14 @@ async def DebuggerPacketSender_test(dut):
     #
     dut.io_en.value = 1
 
+    #
+    # Watchdog of the hung handshakes (armed around the waiting loops)
+    #
+    hang_watchdog = watchdog.start(dut)
+
     for test_number in range(10):
 
-        dut._log.info("Enable sending data on the chip (" + str(test_number) + ")")
+        eventlog.log(EVENT_ROUND, test_number)
 
         #
         # Still there is data to send
@@ -115,6 +149,11 @@ async def DebuggerPacketSender_test(dut):
         #
         await Timer(10, units="ns")
         
+        #
+        # Fail early if the sender stops making progress
+        #
+        hang_watchdog.arm()
+
         #
         # This will change the behavior of the data producer to only
         # generate extra data for 2 of the test case rounds, the third
@@ -152,14 +191,148 @@ async def DebuggerPacketSender_test(dut):
             
             await Timer(10, units="ns")
 
+        hang_watchdog.disarm()
 
         #
-        # Run extra waiting clocks
+        # Run extra waiting clocks (the idle cycles are fast-forwarded)
         #
-        for _ in range(10):
-            await Timer(10, units="ns")
+        await idle.wait_cycles(dut, 10)
 
         #
         # Check the final input on the next clock
         #
         await Timer(10, units="ns")
+
+
+@cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
+async def DebuggerPacketSender_streaming_test(dut):
+    """Stream large payloads (up to and beyond the capacity of the PL to PS area) to the sender"""
+
+    clock = Clock(dut.clock, 10, units="ns")  # Create a 10ns period clock on port clock
+
+    #
+    # Start the clock. Start it low to avoid issues on the first RisingEdge
+    #
+    cocotb.start_soon(clock.start(start_high=False))
+
+    producer = drivers.SendProducer(dut)
+    stall = drivers.stall_pattern(streaming_stall_pattern, random)
+    bram = BramModel(dut, layout.word_index(layout.memory_size))
+
+    #
+    # Initial values
+    #
+    dut.io_en.value = 0
+    dut.io_beginSendingBuffer.value = 0
+    dut.io_requestedActionOfThePacketInput.value = 0
+    dut.io_sendingData.value = 0
+    producer.idle()
+
+    #
+    # Reset DUT
+    #
+    dut.reset.value = 1
+    for _ in range(10):
+        await Timer(10, units="ns")
+    dut.reset.value = 0
+
+    dut.io_en.value = 1
+    bram.start()
+
+    sizes = streaming_words or [payload_capacity_in_words - 1, payload_capacity_in_words, payload_capacity_in_words + 1]
+    words_per_cycle = []
+
+    dut._log.info("Streaming mode: %s words per packet, '%s' stalls, capacity of the PL to PS area: %d words" % (
+        ",".join(str(size) for size in sizes), streaming_stall_pattern, payload_capacity_in_words))
+
+    for size in sizes:
+
+        bram.mem = [0] * len(bram.mem)
+        bram.writes = []
+        bram.out_of_range = []
+
+        #
+        # Tell the sender to start sending data (on the rising edge of the signal)
+        #
+        await FallingEdge(dut.clock)
+        dut.io_beginSendingBuffer.value = 1
+        await FallingEdge(dut.clock)
+        dut.io_beginSendingBuffer.value = 0
+
+        producer.begin(0x55859555, (random.randint(0, 0xffffffff) for _ in range(size)), words_to_send=size, stall=stall)
+
+        cycle = 0
+        first_wait_cycle = None
+        last_word_cycle = None
+        maximum_number_of_cycles = 20 * (size + 10)
+
+        while sending_finished(dut) is False:
+
+            #
+            # Drive and sample between the rising edges of the clock
+            #
+            await FallingEdge(dut.clock)
+            cycle = cycle + 1
+
+            assert cycle < maximum_number_of_cycles, "the sender stopped requesting the data (%d words)" % size
+
+            if first_wait_cycle is None and dut.io_sendWaitForBuffer.value == 1:
+                first_wait_cycle = cycle
+
+            producer.step(cycle)
+
+            if producer.active:
+                last_word_cycle = cycle
+
+        producer.idle()
+
+        #
+        # Sustained bandwidth (from the first request of the data to the last word)
+        #
+        streaming_cycles = max(1, (last_word_cycle or cycle) - (first_wait_cycle or 0) + 1)
+        words_per_cycle.append(len(producer.words) / streaming_cycles)
+
+        dut._log.info("%d words in %d cycles: %.3f words per cycle (%d stall cycles of the producer)" % (
+            len(producer.words), streaming_cycles, words_per_cycle[-1], producer.stall_cycles))
+
+        #
+        # The words that fit in the PL to PS area are stored in order
+        #
+        in_range = min(size, payload_capacity_in_words)
+        response = packet.parse_packet(bram.read_words(
+            layout.pl_to_ps_base,
+            layout.word_index(layout.offsets["startOfDataBuffer"]) + in_range
+        ))
+
+        assert len(producer.words) == size
+        assert response["type"] == layout.packet_types["DEBUGGEE_TO_DEBUGGER_HARDWARE_LEVEL"]
+        assert response["requested_action"] == 0x55859555
+        assert response["payload"] == producer.words[:in_range]
+
+        #
+        # The words beyond the capacity are written past the end of the BRAM
+        # (never wrapped into the PS to PL area)
+        #
+        overflow_writes = [address for _, address, wrote in bram.out_of_range if wrote]
+        assert all(address >= layout.pl_to_ps_base for _, address, _, _ in bram.writes)
+        assert len(overflow_writes) == size - in_range, \
+            "%d words are written beyond the BRAM (expected %d)" % (len(overflow_writes), size - in_range)
+
+        if overflow_writes:
+            dut._log.warning("%d words (from the address 0x%x) are written beyond the end of the BRAM" % (
+                len(overflow_writes), overflow_writes[0]))
+
+        await idle.wait_cycles(dut, 10)
+
+    bram.stop()
+
+    dut._log.info("Sustained bandwidth: %.3f words per cycle (min: %.3f), the largest response: %d words" % (
+        sum(words_per_cycle) / len(words_per_cycle), min(words_per_cycle), payload_capacity_in_words))
+
+
+def sending_finished(dut):
+    """Check whether the sender finished sending the buffer (or interrupted the PS)"""
+
+    return dut.io_finishedSendingBuffer.value == 1 or dut.io_psOutInterrupt.value == 1
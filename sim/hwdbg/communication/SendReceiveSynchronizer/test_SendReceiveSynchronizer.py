@@ -14,13 +14,65 @@
 # @copyright This project is released under the GNU Public License v3.
 #
 
+import os
 import random
 
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer
+from cocotb.triggers import FallingEdge, Timer
 from cocotb.types import LogicArray
 
+from harness import drivers, eventlog, handles, idle, packet, stimulus, traffic, watchdog
+from harness.bram import BramModel
+
+#
+# Events of the testbench (kept in the event log instead of being printed)
+#
+EVENT_RECEIVING_ROUND = eventlog.define("Enable receiving data on the chip ({0})")
+EVENT_SENDING_ROUND = eventlog.define("Enable sending data on the chip ({0})")
+
+#
+# Layout of the generated design (offsets, BRAM geometry, ...)
+#
+layout = packet.layout()
+
+#
+# Number of the general output words of each area
+#
+number_of_general_output_words = 15
+
+#
+# Data of the PS to PL area (e.g., 0x18181818 at the offset 0x18)
+#
+read_data_of_address = {
+    layout.ps_to_pl_address("checksum"): 0x00001234,
+    layout.ps_to_pl_address("indicator"): 0x48595045, # first 32 bits of the indicator
+    layout.ps_to_pl_address("typeOfThePacket"): layout.packet_types["DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL"],
+    layout.ps_to_pl_address("requestedActionOfThePacket"): 0x14141414,
+}
+
+for index in range(number_of_general_output_words):
+    offset = layout.offsets["startOfDataBuffer"] + index * layout.word_size
+    read_data_of_address[layout.ps_to_pl_base + offset] = offset * 0x01010101
+
+#
+# Data of the PL to PS area (e.g., 0x10181018 at the address 0x1018)
+#
+def pl_to_ps_pattern(address):
+    return ((address << 16) | address) & 0xffffffff
+
+read_data_of_address.update({
+    layout.pl_to_ps_address("checksum"): pl_to_ps_pattern(layout.pl_to_ps_address("checksum")),
+    layout.pl_to_ps_address("indicator"): 0x48595045, # The first 32 bits of the indicator
+    layout.pl_to_ps_address("indicator") + layout.word_size: pl_to_ps_pattern(layout.pl_to_ps_address("indicator") + layout.word_size),
+    layout.pl_to_ps_address("typeOfThePacket"): layout.packet_types["DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL"],
+    layout.pl_to_ps_address("requestedActionOfThePacket"): pl_to_ps_pattern(layout.pl_to_ps_address("requestedActionOfThePacket")),
+})
+
+for index in range(number_of_general_output_words):
+    address = layout.pl_to_ps_address("startOfDataBuffer") + index * layout.word_size
+    read_data_of_address[address] = pl_to_ps_pattern(address)
+
 '''
   input         clock,
                 reset,
@@ -46,6 +98,8 @@ from cocotb.types import LogicArray
 '''
 
 @cocotb.test()
+@eventlog.flush_on_failure
+@stimulus.recorded
 async def SendReceiveSynchronizer_test(dut):
     """Test SendReceiveSynchronizer module"""
 
@@ -55,13 +109,13 @@ async def SendReceiveSynchronizer_test(dut):
     # Assert initial output is unknown
     #
     assert LogicArray(dut.io_psOutInterrupt.value) == LogicArray("X")
-    assert LogicArray(dut.io_rdWrAddr.value) == LogicArray("XXXXXXXXXXXXX")
+    assert LogicArray(dut.io_rdWrAddr.value) == LogicArray("X" * len(dut.io_rdWrAddr))
     assert LogicArray(dut.io_wrEna.value) == LogicArray("X")
-    assert LogicArray(dut.io_wrData.value) == LogicArray("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
-    assert LogicArray(dut.io_requestedActionOfThePacketOutput.value) == LogicArray("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
+    assert LogicArray(dut.io_wrData.value) == LogicArray("X" * layout.configurations["BLOCK_RAM_DATA_WIDTH"])
+    assert LogicArray(dut.io_requestedActionOfThePacketOutput.value) == LogicArray("X" * layout.widths["RequestedActionOfThePacket"])
     assert LogicArray(dut.io_requestedActionOfThePacketOutputValid.value) == LogicArray("X")
     assert LogicArray(dut.io_dataValidOutput.value) == LogicArray("X")
-    assert LogicArray(dut.io_receivingData.value) == LogicArray("XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX")
+    assert LogicArray(dut.io_receivingData.value) == LogicArray("X" * layout.configurations["BLOCK_RAM_DATA_WIDTH"])
     assert LogicArray(dut.io_sendWaitForBuffer.value) == LogicArray("X")
 
     clock = Clock(dut.clock, 10, units="ns")  # Create a 10ns period clock on port clock
@@ -101,6 +155,11 @@ async def SendReceiveSynchronizer_test(dut):
     #
     dut.io_en.value = 1
 
+    #
+    # Watchdog of the hung handshakes (armed around the waiting loops)
+    #
+    hang_watchdog = watchdog.start(dut)
+
     for test_number in range(10):
 
         ###############################################################
@@ -109,7 +168,7 @@ async def SendReceiveSynchronizer_test(dut):
         #                                                             #
         ###############################################################
 
-        dut._log.info("Enable receiving data on the chip (" + str(test_number) + ")")
+        eventlog.log(EVENT_RECEIVING_ROUND, test_number)
 
         #
         # Tell the receiver to start receiving data (This mainly operates based on
@@ -131,95 +190,12 @@ async def SendReceiveSynchronizer_test(dut):
         #
         for i in range(30):
 
-            match dut.io_rdWrAddr.value:
-
-                #
-                # For the PS data range
-                #
-                case 0x0: # checksum
-                    dut.io_rdData.value = 0x00001234
-                case 0x8: # indicator
-                    dut.io_rdData.value = 0x48595045 # first 32 bits of the indicator
-                case 0x10: # type
-                    dut.io_rdData.value = 0x4 # debugger to hardware packet (DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL)
-                case 0x14: # requested action
-                    dut.io_rdData.value = 0x14141414
-                case 0x18: # General output
-                    dut.io_rdData.value = 0x18181818
-                case 0x1c: # General output
-                    dut.io_rdData.value = 0x1c1c1c1c
-                case 0x20: # General output
-                    dut.io_rdData.value = 0x20202020
-                case 0x24: # General output
-                    dut.io_rdData.value = 0x24242424
-                case 0x28: # General output
-                    dut.io_rdData.value = 0x28282828
-                case 0x2c: # General output
-                    dut.io_rdData.value = 0x2c2c2c2c
-                case 0x30: # General output
-                    dut.io_rdData.value = 0x30303030
-                case 0x34: # General output
-                    dut.io_rdData.value = 0x34343434
-                case 0x38: # General output
-                    dut.io_rdData.value = 0x38383838
-                case 0x3c: # General output
-                    dut.io_rdData.value = 0x3c3c3c3c
-                case 0x40: # General output
-                    dut.io_rdData.value = 0x40404040
-                case 0x44: # General output
-                    dut.io_rdData.value = 0x44444444
-                case 0x48: # General output
-                    dut.io_rdData.value = 0x48484848
-                case 0x4c: # General output
-                    dut.io_rdData.value = 0x4c4c4c4c
-                case 0x50: # General output
-                    dut.io_rdData.value = 0x50505050
-
-                #
-                # For the PL data range
-                #
-                case 0x1000: # checksum
-                    dut.io_rdData.value = 0x10001000
-                case 0x1008: # indicator 1
-                    dut.io_rdData.value = 0x48595045 # The first 32 bits of the indicator
-                case 0x100c: # indicator 2
-                    dut.io_rdData.value = 0x100c100c # The second 32 bits of the indicator
-                case 0x1010: # type
-                    dut.io_rdData.value = 0x4 # debugger to hardware packet (DEBUGGER_TO_DEBUGGEE_HARDWARE_LEVEL)
-                case 0x1014: # requested action
-                    dut.io_rdData.value = 0x10141014
-                case 0x1018: # General output
-                    dut.io_rdData.value = 0x10181018
-                case 0x101c: # General output
-                    dut.io_rdData.value = 0x101c101c
-                case 0x1020: # General output
-                    dut.io_rdData.value = 0x10201020
-                case 0x1024: # General output
-                    dut.io_rdData.value = 0x10241024
-                case 0x1028: # General output
-                    dut.io_rdData.value = 0x10281028
-                case 0x102c: # General output
-                    dut.io_rdData.value = 0x102c102c
-                case 0x1030: # General output
-                    dut.io_rdData.value = 0x10301030
-                case 0x1034: # General output
-                    dut.io_rdData.value = 0x10341034
-                case 0x1038: # General output
-                    dut.io_rdData.value = 0x10381038
-                case 0x103c: # General output
-                    dut.io_rdData.value = 0x103c103c
-                case 0x1040: # General output
-                    dut.io_rdData.value = 0x10401040
-                case 0x1044: # General output
-                    dut.io_rdData.value = 0x10441044
-                case 0x1048: # General output
-                    dut.io_rdData.value = 0x10481048
-                case 0x104c: # General output
-                    dut.io_rdData.value = 0x104c104c
-                case 0x1050: # General output
-                    dut.io_rdData.value = 0x10501050
-                case _:
-                    assert 1 == 2, "invalid address in the address line"
+            #
+            # Return the data of the address (both of the PS and PL areas)
+            #
+            address = handles.read_int(dut.io_rdWrAddr, None)
+            assert address in read_data_of_address, "invalid address in the address line"
+            dut.io_rdData.value = read_data_of_address[address]
 
             if dut.io_requestedActionOfThePacketOutputValid.value == 1:
 
@@ -252,10 +228,9 @@ async def SendReceiveSynchronizer_test(dut):
             dut.io_noNewDataReceiver.value = 0
 
         #
-        # Run extra waiting clocks
+        # Run extra waiting clocks (the idle cycles are fast-forwarded)
         #
-        for _ in range(10):
-            await Timer(10, units="ns")
+        await idle.wait_cycles(dut, 10)
 
         ###############################################################
         #                                                             #
@@ -263,7 +238,7 @@ async def SendReceiveSynchronizer_test(dut):
         #                                                             #
         ###############################################################
 
-        dut._log.info("Enable sending data on the chip (" + str(test_number) + ")")
+        eventlog.log(EVENT_SENDING_ROUND, test_number)
 
         #
         # There is data to send
@@ -302,6 +277,11 @@ async def SendReceiveSynchronizer_test(dut):
         #
         await Timer(10, units="ns")
         
+        #
+        # Fail early if the sender stops making progress
+        #
+        hang_watchdog.arm()
+
         #
         # This will change the behavior of the data producer to only
         # generate extra data for 2 of the test case rounds, the third
@@ -339,14 +319,202 @@ async def SendReceiveSynchronizer_test(dut):
             
             await Timer(10, units="ns")
 
+        hang_watchdog.disarm()
 
         #
-        # Run extra waiting clocks
+        # Run extra waiting clocks (the idle cycles are fast-forwarded)
         #
-        for _ in range(10):
-            await Timer(10, units="ns")
+        await idle.wait_cycles(dut, 10)
 
         #
         # Check the final input on the next clock
         #
         await Timer(10, units="ns")
+
+
+#
+# Configuration of the throughput (stress) mode
+#
+stress_number_of_packets = int(os.environ.get("HWDBG_STRESS_PACKETS", "40"))
+stress_arrival_distribution = os.environ.get("HWDBG_STRESS_ARRIVAL", "poisson")
+stress_mean_gap = int(os.environ.get("HWDBG_STRESS_MEAN_GAP", "20"))
+stress_payload_words = int(os.environ.get("HWDBG_STRESS_PAYLOAD_WORDS", "4"))
+stress_send_ratio = float(os.environ.get("HWDBG_STRESS_SEND_RATIO", "0.5"))
+
+#
+# States of the synchronizer (SendReceiveSynchronizerEnums)
+#
+STATE_IDLE = 0
+STATE_RECEIVER = 1
+STATE_SENDER = 2
+
+
+@cocotb.test()
+async def SendReceiveSynchronizer_throughput_test(dut):
+    """Saturate the synchronizer with back-to-back send and receive requests"""
+
+    clock = Clock(dut.clock, 10, units="ns")  # Create a 10ns period clock on port clock
+
+    #
+    # Start the clock. Start it low to avoid issues on the first RisingEdge
+    #
+    cocotb.start_soon(clock.start(start_high=False))
+
+    hw = handles.registry(dut)
+    synchronizer_state = hw.get("state")
+
+    consumer = drivers.ReceiveConsumer(dut)
+    producer = drivers.SendProducer(dut)
+
+    #
+    # The PS to PL area contains a valid packet that is read by every receive request
+    #
+    bram = BramModel(dut, layout.word_index(layout.memory_size))
+    bram.load(
+        layout.ps_to_pl_base,
+        packet.build_packet(
+            layout.actions["hwdbgActionSendVersion"],
+            [random.randint(0, 0xffffffff) for _ in range(stress_payload_words)]
+        )
+    )
+
+    #
+    # Initial values
+    #
+    dut.io_en.value = 0
+    dut.io_plInSignal.value = 0
+    dut.io_beginSendingBuffer.value = 0
+    dut.io_requestedActionOfThePacketInput.value = 0
+    dut.io_sendingData.value = 0
+    consumer.idle()
+    producer.idle()
+
+    #
+    # Reset DUT
+    #
+    dut.reset.value = 1
+    for _ in range(10):
+        await Timer(10, units="ns")
+    dut.reset.value = 0
+
+    dut.io_en.value = 1
+    bram.start()
+
+    #
+    # Create the queue of the requests (each direction has its own requester)
+    #
+    arrivals = traffic.arrival_cycles(stress_arrival_distribution, stress_number_of_packets, stress_mean_gap, random)
+    requests = [(cycle, "send" if random.random() < stress_send_ratio else "receive") for cycle in arrivals]
+    pending = {"receive": [], "send": []}
+
+    dut._log.info("Throughput mode: " + str(stress_number_of_packets) + " packets, '" + stress_arrival_distribution +
+                  "' arrivals (mean gap: " + str(stress_mean_gap) + " cycles), " + str(stress_payload_words) + " words per packet")
+
+    queueing_latencies = {"receive": [], "send": []}
+    service_times = {"receive": [], "send": []}
+    stall_cycles = {"busy": 0, "priority": 0}
+
+    active = None
+    accepted_cycle = 0
+    asserted = {"receive": False, "send": False}
+    previous_state = STATE_IDLE
+    completed = 0
+    next_request = 0
+    cycle = 0
+    maximum_number_of_cycles = (arrivals[-1] if arrivals else 0) + 200 * (stress_number_of_packets + 1)
+
+    while completed < stress_number_of_packets:
+
+        #
+        # Drive and sample between the rising edges of the clock
+        #
+        await FallingEdge(dut.clock)
+        cycle = cycle + 1
+        state = handles.read_int(synchronizer_state)
+
+        assert cycle < maximum_number_of_cycles, "the synchronizer stopped serving the requests"
+
+        #
+        # Account the requests that were asserted on the last edge, but were not accepted
+        #
+        for direction, accepted_state in (("receive", STATE_RECEIVER), ("send", STATE_SENDER)):
+            if asserted[direction] and state != accepted_state:
+                if previous_state == STATE_IDLE:
+                    stall_cycles["priority"] = stall_cycles["priority"] + 1
+                else:
+                    stall_cycles["busy"] = stall_cycles["busy"] + 1
+
+        #
+        # Track the transitions of the synchronizer
+        #
+        if previous_state == STATE_IDLE and state in (STATE_RECEIVER, STATE_SENDER):
+            active = "receive" if state == STATE_RECEIVER else "send"
+            arrival_cycle = pending[active].pop(0)
+            queueing_latencies[active].append(cycle - arrival_cycle)
+            accepted_cycle = cycle
+
+            if active == "receive":
+                consumer.begin(stress_payload_words)
+            else:
+                producer.begin(
+                    0x55859555,
+                    (random.randint(0, 0xffffffff) for _ in range(stress_payload_words))
+                )
+
+        elif previous_state in (STATE_RECEIVER, STATE_SENDER) and state == STATE_IDLE:
+            service_times[active].append(cycle - accepted_cycle)
+            completed = completed + 1
+
+            #
+            # Check the packet that is written to the PL to PS area
+            #
+            if active == "send":
+                response = packet.parse_packet(bram.read_words(
+                    layout.pl_to_ps_base,
+                    layout.word_index(layout.offsets["startOfDataBuffer"]) + len(producer.words)
+                ))
+                assert response["type"] == layout.packet_types["DEBUGGEE_TO_DEBUGGER_HARDWARE_LEVEL"]
+                assert response["requested_action"] == 0x55859555
+                assert response["payload"] == producer.words
+
+            consumer.end()
+            active = None
+
+        previous_state = state
+
+        #
+        # New arrivals
+        #
+        while next_request < len(requests) and requests[next_request][0] <= cycle:
+            arrival_cycle, direction = requests[next_request]
+            pending[direction].append(arrival_cycle)
+            next_request = next_request + 1
+
+        #
+        # Each requester keeps its line asserted until the request is accepted
+        #
+        asserted["receive"] = len(pending["receive"]) != 0 and active != "receive"
+        asserted["send"] = len(pending["send"]) != 0 and active != "send"
+        dut.io_plInSignal.value = 1 if asserted["receive"] else 0
+        dut.io_beginSendingBuffer.value = 1 if asserted["send"] else 0
+
+        consumer.step()
+        producer.step(cycle)
+
+    #
+    # Report the results
+    #
+    first_arrival = arrivals[0] if arrivals else 0
+    elapsed_cycles = max(1, cycle - first_arrival)
+
+    dut._log.info("Sustained throughput: %.2f packets per kilocycle (%d packets in %d cycles)" % (
+        completed * 1000.0 / elapsed_cycles, completed, elapsed_cycles))
+    dut._log.info("Arbitration stall cycles: %d (synchronizer busy: %d, lost priority: %d)" % (
+        stall_cycles["busy"] + stall_cycles["priority"], stall_cycles["busy"], stall_cycles["priority"]))
+
+    for direction in ("receive", "send"):
+        dut._log.info(traffic.format_summary("Queueing latency (" + direction + ")", traffic.summarize(queueing_latencies[direction])))
+        dut._log.info(traffic.format_summary("Service time (" + direction + ")", traffic.summarize(service_times[direction])))
+
+    dut._log.info(traffic.format_summary("Queueing latency (all)",
+                                         traffic.summarize(queueing_latencies["receive"] + queueing_latencies["send"])))
@@ -1,157 +1,383 @@
+import argparse
+import glob
+import hashlib
 import os
+import shutil
 import subprocess
-import glob
-
-MODELSIM = "/home/sina/intelFPGA/20.1/modelsim_ase/bin"
+import sys
+import threading
+import time
 
 #
-# Check modelsim directory
+# Get the current script's directory
 #
-if not os.path.exists(MODELSIM):
-    print("[x] Error: The path mdoes not exist")
-    exit()
-else:
-    print("[*] Oh, the modelsim path found :)")
-
-MODELSIM_VCD2WLF = MODELSIM + "/vcd2wlf"
-MODELSIM_VSIM = MODELSIM + "/vsim"
+current_script_path = os.path.dirname(os.path.abspath(__file__))
 
 #
-# Config file variables
+# Default paths
 #
-CONFIG_TEST_MODULE_CLASS = ""
-CONFIG_SHOW_ALL_WAVES = True
-CONFIG_WAVES_LIST = []
+DEFAULT_MODELSIM = "/home/sina/intelFPGA/20.1/modelsim_ase/bin"
+WAVE_OUTPUT_FILES_PATH = os.path.join(current_script_path, "..", "..", "test_run_dir", "DUT_should_pass")
+CONFIG_FILE_PATH = os.path.join(current_script_path, "modelsim.config")
+TCL_FILE_PATH = os.path.join(current_script_path, "modelsim.tcl")
+WLF_CACHE_PATH = os.path.join(current_script_path, "wlf_cache")
+SOURCES_PATH = os.path.join(current_script_path, "..", "..", "src")
 
 #
-# Check if user is root or not
+# Suffix of the file that keeps the name of the module of a generated VCD file
 #
-if os.geteuid() != 0:
-    print("[x] you should run this script with root (sudo) user permission")
-    exit()
-else:
-    print("[*] user is root")
+MODULE_STAMP_SUFFIX = ".modelsim_module"
 
 #
-# Get the current script's directory
+# Size of the chunks for hashing and streaming the VCD files
 #
-current_script_path = os.path.dirname(os.path.abspath(__file__))
+CHUNK_SIZE = 1024 * 1024
 
-WAVE_OUTPUT_FILES_PATH = current_script_path + \
-    "/../test_run_dir/DUT_should_pass/"
-CONFIG_FILE_PATH = current_script_path + "/modelsim.config"
-print("[*] current script path:", WAVE_OUTPUT_FILES_PATH)
 
-#
-# Check config file
-#
-if os.path.exists(CONFIG_FILE_PATH) == False:
-    print("[x] config file not found")
-    exit()
+def find_modelsim(path_argument):
+    """Find the directory of ModelSim (argument, MODELSIM_PATH, PATH, then the default path)"""
 
-#
-# Interpreting config file
-#
-with open(CONFIG_FILE_PATH, 'r') as file:
-    for line in file:
+    candidates = [path_argument, os.environ.get("MODELSIM_PATH")]
+
+    vsim_in_path = shutil.which("vsim")
+    if vsim_in_path is not None:
+        candidates.append(os.path.dirname(vsim_in_path))
+
+    candidates.append(DEFAULT_MODELSIM)
+
+    for candidate in candidates:
+        if candidate and os.path.exists(os.path.join(candidate, "vsim")):
+            return candidate
 
-        if line.lower().startswith("module:") or line.lower().startswith("module :"):
-            # it's the test module name
-            CONFIG_TEST_MODULE_CLASS = line.split(":")[1]
-            print("[*] found module name:", CONFIG_TEST_MODULE_CLASS)
+    return None
+
+
+def read_config(config_file_path):
+    """Interpret the config file, returns the test module and the list of signal filters"""
+
+    test_module_class = ""
+    waves_list = []
+
+    with open(config_file_path, 'r') as file:
+        for line in file:
+
+            if line.lower().startswith("module:") or line.lower().startswith("module :"):
+                # it's the test module name
+                test_module_class = line.split(":", 1)[1].strip()
+                print("[*] found module name:", test_module_class)
+            elif line.isspace() == False and line != "":
+                # it's a wave, so no longer need to show all waves
+                waves_list.append(line.strip())
+                print("[*] signal filter for:", line.strip())
+
+    return test_module_class, waves_list
+
+
+def write_tcl(waves_list):
+    """Create the TCL file that adds the (filtered) signals to the wave window"""
+
+    print("[*] writing to TCL config file: " + TCL_FILE_PATH)
+
+    with open(TCL_FILE_PATH, 'w') as f:
+        if not waves_list:
+            # add the clock at top of the signals by default
+            f.write("add wave -position insertpoint clock\n")
+            f.write("add wave -position insertpoint *\n")
         else:
-            # it's a wave, so no longer need to show all waves
-            if line.isspace() == False:
-                CONFIG_SHOW_ALL_WAVES = False
-                CONFIG_WAVES_LIST.append(line)
-                print("[*] signal filter for:", line)
+            for item in waves_list:
+                f.write("add wave -position insertpoint {*" + item + '*}\n')
 
-#
-# Show message if all signals need to be shown
-#
-if CONFIG_SHOW_ALL_WAVES == True:
-    print("[*] no signal filter found, assuming all signals to be shown!")
 
-#
-# Check if test module is empty or not
-#
-if CONFIG_TEST_MODULE_CLASS.isspace() == True:
-    print("[x] main test module not found, please add 'module:' to the config file")
-    exit()
+def newest_source_time():
+    """Modification time of the newest Scala source (or BRAM initialization file)"""
 
-#
-# Set the current working directory
-#
-os.chdir(current_script_path + "/..")
-print("[*] current working directory: " + format(os.getcwd()))
+    newest = 0
+    for root, _, names in os.walk(SOURCES_PATH):
+        for name in names:
+            newest = max(newest, os.path.getmtime(os.path.join(root, name)))
 
-#
-# Create TCL config file
-#
-print("[*] writing to TCL config file: " +
-      current_script_path + '/modelsim.tcl')
-if CONFIG_SHOW_ALL_WAVES:
-    with open(current_script_path + '/modelsim.tcl', 'w') as f:
-    	# add the clock at top of the signals by default
-        f.write("add wave -position insertpoint clock\n")
-        f.write("add wave -position insertpoint *\n")
-else:
-    with open(current_script_path + '/modelsim.tcl', 'w') as f:
-        for item in CONFIG_WAVES_LIST:
-            f.write("add wave -position insertpoint {*" + item.replace('\n','').replace('\r', '') + '*}\n')
+    return newest
 
-#
-# Remove all the previous *.wlf, *.vcd, *.fir files
-#
-print("[*] removing previously generated files")
-for file_name in os.listdir(WAVE_OUTPUT_FILES_PATH):
-    if file_name.endswith('.wlf') or file_name.endswith('.vcd') or file_name.endswith('.fir'):
-        os.remove(os.path.join(WAVE_OUTPUT_FILES_PATH, file_name))
 
-#
-# Run the VCD wave generator
-#
-print("[*] running chisel VCD file generator for module: " +
-      CONFIG_TEST_MODULE_CLASS)
-print("running command: '" + "sbt testOnly " + CONFIG_TEST_MODULE_CLASS + " -- -DwriteVcd=1" + "'")
-result = subprocess.run(
-    ["sbt", "testOnly " + CONFIG_TEST_MODULE_CLASS + " -- -DwriteVcd=1"], stdout=subprocess.PIPE)
-print(result.stdout.decode())
+def latest_vcd_file():
+    """The latest generated VCD file (or None)"""
 
-#
-# Get all files in directory
-#
-files = glob.glob(WAVE_OUTPUT_FILES_PATH + "/*")
+    files = glob.glob(os.path.join(WAVE_OUTPUT_FILES_PATH, "*.vcd"))
 
-#
-# Sort files by last modified time
-#
-files.sort(key=lambda x: os.path.getmtime(x))
+    if not files:
+        return None
 
-#
-# Check if the list is empty or not
-#
-if not files or not files[-1].endswith('.vcd') :
-    print("[x] there was an error in generating VCD files")
-    exit()
+    return max(files, key=os.path.getmtime)
 
-#
-# Get the latest modified file
-#
-latest_vcd_file = files[-1]
-print("[*] latest generated VCD file: " + latest_vcd_file)
 
-#
-# Converting VCD to WLF
-#
-print("[*] converting VCD file to WLF file")
-result = subprocess.run(
-    [MODELSIM_VCD2WLF, latest_vcd_file, latest_vcd_file + ".wlf"], stdout=subprocess.PIPE)
-print(result.stdout.decode())
+def module_stamp_path(vcd_file):
+    """The file that keeps the name of the module of a VCD file"""
 
-#
-# Run the generated WLF file
-#
-print("[*] openning file in vsim: " + latest_vcd_file + ".wlf")
-subprocess.run([MODELSIM_VSIM, latest_vcd_file + ".wlf",
-               "-do", current_script_path + '/modelsim.tcl'])
+    return vcd_file + MODULE_STAMP_SUFFIX
+
+
+def is_vcd_up_to_date(test_module_class):
+    """Check whether the latest VCD file is generated for the module and newer than the sources"""
+
+    vcd_file = latest_vcd_file()
+
+    if vcd_file is None or not os.path.exists(module_stamp_path(vcd_file)):
+        return False
+
+    with open(module_stamp_path(vcd_file), 'r') as file:
+        if file.read().strip() != test_module_class:
+            return False
+
+    return os.path.getmtime(vcd_file) > newest_source_time()
+
+
+def hash_file(path):
+    """Hash of the content of a file"""
+
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def cached_wlf_path(content_hash):
+    return os.path.join(WLF_CACHE_PATH, content_hash + ".wlf")
+
+
+def convert_vcd(vcd2wlf, vcd_file, wlf_file):
+    """Convert a VCD file to a WLF file (written to a temporary file, then renamed)"""
+
+    temporary_file = wlf_file + ".tmp"
+    result = subprocess.run([vcd2wlf, vcd_file, temporary_file], stdout=subprocess.PIPE)
+    print(result.stdout.decode())
+
+    if result.returncode != 0 or not os.path.exists(temporary_file):
+        print("[x] there was an error in converting the VCD file")
+        if os.path.exists(temporary_file):
+            os.remove(temporary_file)
+        return False
+
+    os.replace(temporary_file, wlf_file)
+    return True
+
+
+def run_sbt_with_streaming_conversion(vcd2wlf, test_module_class):
+    """Run the chisel VCD generator, the VCD file is converted while the simulation writes it
+
+    The growing VCD file is followed and fed (through a named pipe) to vcd2wlf while
+    it is hashed, so the WLF file is ready shortly after the simulation finishes
+    """
+
+    os.makedirs(WAVE_OUTPUT_FILES_PATH, exist_ok=True)
+    os.makedirs(WLF_CACHE_PATH, exist_ok=True)
+    start_time = time.time()
+
+    print("[*] running chisel VCD file generator for module: " + test_module_class)
+    print("running command: '" + "sbt testOnly " + test_module_class + " -- -DwriteVcd=1" + "'")
+    sbt = subprocess.Popen(["sbt", "testOnly " + test_module_class + " -- -DwriteVcd=1"], stdout=subprocess.PIPE)
+
+    #
+    # Print the output of sbt in the background
+    #
+    def print_output():
+        for line in sbt.stdout:
+            sys.stdout.write(line.decode(errors="replace"))
+
+    output_thread = threading.Thread(target=print_output, daemon=True)
+    output_thread.start()
+
+    #
+    # Wait for the simulation to create the new VCD file
+    #
+    vcd_file = None
+    while vcd_file is None and sbt.poll() is None:
+        candidate = latest_vcd_file()
+        if candidate is not None and os.path.getmtime(candidate) >= start_time:
+            vcd_file = candidate
+        else:
+            time.sleep(0.1)
+
+    if vcd_file is None:
+        candidate = latest_vcd_file()
+        if candidate is not None and os.path.getmtime(candidate) >= start_time:
+            vcd_file = candidate
+
+    wlf_file = None
+    content_hash = None
+
+    if vcd_file is not None and hasattr(os, "mkfifo"):
+        print("[*] converting VCD file to WLF file while the simulation is running: " + vcd_file)
+
+        fifo_path = os.path.join(WLF_CACHE_PATH, "stream-" + str(os.getpid()) + ".vcd")
+        os.mkfifo(fifo_path)
+        temporary_file = os.path.join(WLF_CACHE_PATH, "stream-" + str(os.getpid()) + ".wlf")
+
+        #
+        # The output of the converter is not read, so it's printed directly (a full pipe would block it)
+        #
+        converter = subprocess.Popen([vcd2wlf, fifo_path, temporary_file])
+        digest = hashlib.sha256()
+
+        #
+        # Wait for the converter to open the pipe (it's not blocking, so a failed converter is detected)
+        #
+        fifo_descriptor = None
+        while fifo_descriptor is None and converter.poll() is None:
+            try:
+                fifo_descriptor = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+            except OSError:
+                time.sleep(0.05)
+
+        try:
+            if fifo_descriptor is None:
+                raise BrokenPipeError
+
+            os.set_blocking(fifo_descriptor, True)
+
+            with os.fdopen(fifo_descriptor, 'wb') as fifo, open(vcd_file, 'rb') as vcd:
+
+                #
+                # Follow the file until the simulation is finished and the whole file is read
+                #
+                while True:
+                    chunk = vcd.read(CHUNK_SIZE)
+                    if chunk:
+                        digest.update(chunk)
+                        fifo.write(chunk)
+                    elif sbt.poll() is not None:
+                        break
+                    else:
+                        time.sleep(0.05)
+        except BrokenPipeError:
+            print("[x] the converter stopped reading the VCD file")
+
+        converter.wait()
+        os.remove(fifo_path)
+        content_hash = digest.hexdigest()
+
+        if converter.returncode == 0 and os.path.exists(temporary_file):
+            wlf_file = cached_wlf_path(content_hash)
+            os.replace(temporary_file, wlf_file)
+        elif os.path.exists(temporary_file):
+            os.remove(temporary_file)
+
+    sbt.wait()
+    output_thread.join()
+
+    if sbt.returncode != 0 or latest_vcd_file() is None:
+        print("[x] there was an error in generating VCD files")
+        return None, None
+
+    vcd_file = latest_vcd_file()
+
+    #
+    # Keep the module of the VCD file, so the next run can skip the simulation
+    #
+    with open(module_stamp_path(vcd_file), 'w') as file:
+        file.write(test_module_class)
+
+    #
+    # The streamed conversion is only valid if the file is not changed after it is streamed
+    #
+    if wlf_file is not None and hash_file(vcd_file) != content_hash:
+        wlf_file = None
+
+    return vcd_file, wlf_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Automated ModelSim viewer")
+    parser.add_argument("--modelsim", help="directory of the ModelSim binaries (or set MODELSIM_PATH)")
+    parser.add_argument("--vcd", help="open this VCD file (e.g., from a cocotb run) instead of running sbt")
+    parser.add_argument("--rerun", action="store_true", help="always rerun the simulation")
+    parser.add_argument("--no-gui", action="store_true", help="only convert (and cache) the WLF file")
+    args = parser.parse_args()
+
+    #
+    # Check modelsim directory
+    #
+    modelsim = find_modelsim(args.modelsim)
+    if modelsim is None:
+        print("[x] Error: The modelsim path does not exist (use --modelsim or MODELSIM_PATH)")
+        exit()
+    else:
+        print("[*] Oh, the modelsim path found :) " + modelsim)
+
+    modelsim_vcd2wlf = os.path.join(modelsim, "vcd2wlf")
+    modelsim_vsim = os.path.join(modelsim, "vsim")
+
+    #
+    # Check config file
+    #
+    if os.path.exists(CONFIG_FILE_PATH) == False:
+        print("[x] config file not found")
+        exit()
+
+    test_module_class, waves_list = read_config(CONFIG_FILE_PATH)
+
+    #
+    # Show message if all signals need to be shown
+    #
+    if not waves_list:
+        print("[*] no signal filter found, assuming all signals to be shown!")
+
+    #
+    # Check if test module is empty or not
+    #
+    if args.vcd is None and test_module_class == "":
+        print("[x] main test module not found, please add 'module:' to the config file")
+        exit()
+
+    #
+    # Set the current working directory
+    #
+    os.chdir(os.path.join(current_script_path, "..", ".."))
+    print("[*] current working directory: " + format(os.getcwd()))
+
+    write_tcl(waves_list)
+
+    #
+    # Find (or generate) the VCD file
+    #
+    wlf_file = None
+
+    if args.vcd is not None:
+        vcd_file = os.path.abspath(args.vcd)
+    elif not args.rerun and is_vcd_up_to_date(test_module_class):
+        vcd_file = latest_vcd_file()
+        print("[*] the VCD file is up-to-date, skipping the simulation: " + vcd_file)
+    else:
+        vcd_file, wlf_file = run_sbt_with_streaming_conversion(modelsim_vcd2wlf, test_module_class)
+        if vcd_file is None:
+            exit()
+
+    #
+    # Converting VCD to WLF (if it's not already converted)
+    #
+    if wlf_file is None:
+        wlf_file = cached_wlf_path(hash_file(vcd_file))
+
+        if os.path.exists(wlf_file):
+            print("[*] using the cached WLF file: " + wlf_file)
+        else:
+            print("[*] converting VCD file to WLF file")
+            os.makedirs(WLF_CACHE_PATH, exist_ok=True)
+            if not convert_vcd(modelsim_vcd2wlf, vcd_file, wlf_file):
+                exit()
+
+    if args.no_gui:
+        print("[*] WLF file: " + wlf_file)
+        return
+
+    #
+    # Run the generated WLF file
+    #
+    print("[*] openning file in vsim: " + wlf_file)
+    subprocess.run([modelsim_vsim, wlf_file, "-do", TCL_FILE_PATH])
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,49 @@ package hwdbg.configs
 import chisel3._
 import chisel3.util._
 
+/**
+ * @brief
+ *   Overriding the design constants at elaboration time
+ * @details
+ *   Each constant can be overridden by a JVM system property with the "hwdbg." prefix,
+ *   for example: sbt -Dhwdbg.NUMBER_OF_PINS=64 -Dhwdbg.PORT_PINS_MAP=0:32,1:32 "runMain hwdbg.MainWithInitializedBRAM"
+ */
+object ConfigurationOverrides {
+
+  //
+  // Prefix of the system properties
+  //
+  val PROPERTY_PREFIX: String = "hwdbg."
+
+  def getInt(name: String, default: Int): Int = {
+    sys.props.get(PROPERTY_PREFIX + name).map(_.trim.toInt).getOrElse(default)
+  }
+
+  def getString(name: String, default: String): String = {
+    sys.props.get(PROPERTY_PREFIX + name).map(_.trim).getOrElse(default)
+  }
+
+  def getPortPinsMap(name: String, default: Map[Int, Int]): Map[Int, Int] = {
+
+    //
+    // The map is formatted as "port:pins" items separated by commas (e.g., "0:12,1:9,2:11")
+    //
+    sys.props.get(PROPERTY_PREFIX + name) match {
+      case Some(value) =>
+        value
+          .split(",")
+          .map(_.trim)
+          .filter(_.nonEmpty)
+          .map { item =>
+            val Array(port, pins) = item.split(":").map(_.trim)
+            port.toInt -> pins.toInt
+          }
+          .toMap
+      case None => default
+    }
+  }
+}
+
 /**
  * @brief
  *   The configuration of ports and pins
@@ -31,7 +74,7 @@ object DebuggerPorts {
   //                port 0 (in) -> contains 12 pins
   //                port 1 (in) -> contains 9 pins
   //
-  val PORT_PINS_MAP: Map[Int, Int] = Map(0 -> 12, 1 -> 9, 2 -> 11)
+  val PORT_PINS_MAP: Map[Int, Int] = ConfigurationOverrides.getPortPinsMap("PORT_PINS_MAP", Map(0 -> 12, 1 -> 9, 2 -> 11))
 
 }
 
@@ -49,18 +92,23 @@ object DebuggerConfigurations {
   //
   // Number of input/output pins
   //
-  val NUMBER_OF_PINS: Int = 32
+  val NUMBER_OF_PINS: Int = ConfigurationOverrides.getInt("NUMBER_OF_PINS", 32)
 
   //
   // Address width of the Block RAM (BRAM)
   //
-  val BLOCK_RAM_ADDR_WIDTH: Int = 13
+  val BLOCK_RAM_ADDR_WIDTH: Int = ConfigurationOverrides.getInt("BLOCK_RAM_ADDR_WIDTH", 13)
 
   //
   // Data width of the Block RAM (BRAM)
   //
   val BLOCK_RAM_DATA_WIDTH: Int = 32
 
+  //
+  // Directory of the generated (System)Verilog files
+  //
+  val GENERATED_FILES_DIRECTORY: String = ConfigurationOverrides.getString("GENERATED_FILES_DIRECTORY", "generated/")
+
 }
 
 /**
@@ -72,7 +120,7 @@ object ScriptEngineConfigurations {
   //
   // Maximum number of stages
   //
-  val MAXIMUM_NUMBER_OF_STAGES: Int = 10
+  val MAXIMUM_NUMBER_OF_STAGES: Int = ConfigurationOverrides.getInt("MAXIMUM_NUMBER_OF_STAGES", 10)
 
   //
   // Maximum number of stages
@@ -95,7 +143,8 @@ object MemoryCommunicationConfigurations {
   //
   // Default number of bytes used in initialized SRAM memory
   //
-  val DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE: Int = 8192 / 8 // 8 Kilobits
+  val DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE: Int =
+    ConfigurationOverrides.getInt("DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE", 8192 / 8) // 8 Kilobits
 
   //
   // Base address of PS to PL SRAM communication memory
@@ -25,6 +25,12 @@ import chisel3.util._
 object TestingConfigurations {
 
   // val BRAM_INITIALIZATION_FILE_PATH: String = "./src/test/bram/send_version.hex.txt"
-  val BRAM_INITIALIZATION_FILE_PATH: String = "./src/test/bram/port_information.hex.txt"
+  val BRAM_INITIALIZATION_FILE_PATH: String =
+    ConfigurationOverrides.getString("BRAM_INITIALIZATION_FILE_PATH", "./src/test/bram/port_information.hex.txt")
+
+  //
+  // Number of the debugger cores (each with its own BRAM) of the multi-instance testing module
+  //
+  val NUMBER_OF_INSTANCES: Int = ConfigurationOverrides.getInt("NUMBER_OF_INSTANCES", 4)
 
 }
@@ -0,0 +1,130 @@
+/**
+ * @file
+ *   manifest.scala
+ * @author
+ *   Sina Karvandi (sina@hyperdbg.org)
+ * @brief
+ *   Machine-readable layout manifest of the generated design
+ * @details
+ *   The manifest (JSON) is written next to the generated (System)Verilog files, so the
+ *   simulation harness uses the same configurations, offsets and enums as the design
+ * @version 0.1
+ * @date
+ *   2026-10-19
+ *
+ * @copyright
+ *   This project is released under the GNU Public License v3.
+ */
+package hwdbg.utils
+
+import java.io.{File, PrintWriter}
+
+import hwdbg.configs._
+import hwdbg.constants._
+import hwdbg.types._
+import hwdbg.version._
+
+object LayoutManifest {
+
+  //
+  // Name of the manifest file (in the directory of the generated files)
+  //
+  val MANIFEST_FILE_NAME: String = "hwdbg_layout.json"
+
+  private def quote(value: String): String = {
+    "\"" + value.replace("\\", "\\\\").replace("\"", "\\\"") + "\""
+  }
+
+  private def toJson(value: Any, indent: Int): String = {
+
+    val padding = "  " * (indent + 1)
+    val closing = "  " * indent
+
+    value match {
+      case map: Seq[(String, Any)] @unchecked =>
+        map
+          .map { case (key, item) => padding + quote(key) + ": " + toJson(item, indent + 1) }
+          .mkString("{\n", ",\n", "\n" + closing + "}")
+      case string: String => quote(string)
+      case boolean: Boolean => boolean.toString
+      case number: Int => number.toString
+      case number: Long => number.toString
+      case other => throw new IllegalArgumentException("unsupported value in the manifest: " + other)
+    }
+  }
+
+  private def enumValues(enumeration: Enumeration): Seq[(String, Any)] = {
+    enumeration.values.toSeq.map(value => value.toString -> value.id)
+  }
+
+  /**
+   * @brief
+   *   Content of the manifest
+   */
+  def content: String = {
+
+    val packet = new DebuggerRemotePacket()
+
+    val manifest: Seq[(String, Any)] = Seq(
+      "version" -> Seq(
+        "VERSION_MAJOR" -> Version.VERSION_MAJOR,
+        "VERSION_MINOR" -> Version.VERSION_MINOR,
+        "VERSION_PATCH" -> Version.VERSION_PATCH,
+        "ENCODED_VERSION" -> Version.getEncodedVersion
+      ),
+      "configurations" -> Seq(
+        "NUMBER_OF_PINS" -> DebuggerConfigurations.NUMBER_OF_PINS,
+        "BLOCK_RAM_ADDR_WIDTH" -> DebuggerConfigurations.BLOCK_RAM_ADDR_WIDTH,
+        "BLOCK_RAM_DATA_WIDTH" -> DebuggerConfigurations.BLOCK_RAM_DATA_WIDTH,
+        "MAXIMUM_NUMBER_OF_STAGES" -> ScriptEngineConfigurations.MAXIMUM_NUMBER_OF_STAGES,
+        "MAXIMUM_NUMBER_OF_SUPPORTED_OPERATORS" -> ScriptEngineConfigurations.MAXIMUM_NUMBER_OF_SUPPORTED_OPERATORS,
+        "ENABLE_BLOCK_RAM_DELAY" -> MemoryCommunicationConfigurations.ENABLE_BLOCK_RAM_DELAY,
+        "DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE" -> MemoryCommunicationConfigurations.DEFAULT_CONFIGURATION_INITIALIZED_MEMORY_SIZE,
+        "BASE_ADDRESS_OF_PS_TO_PL_COMMUNICATION" -> MemoryCommunicationConfigurations.BASE_ADDRESS_OF_PS_TO_PL_COMMUNICATION,
+        "BASE_ADDRESS_OF_PL_TO_PS_COMMUNICATION" -> MemoryCommunicationConfigurations.BASE_ADDRESS_OF_PL_TO_PS_COMMUNICATION,
+        "BRAM_INITIALIZATION_FILE_PATH" -> TestingConfigurations.BRAM_INITIALIZATION_FILE_PATH,
+        "NUMBER_OF_INSTANCES" -> TestingConfigurations.NUMBER_OF_INSTANCES
+      ),
+      "PORT_PINS_MAP" -> DebuggerPorts.PORT_PINS_MAP.toSeq.sortBy(_._1).map { case (port, pins) => port.toString -> pins },
+      "DebuggerRemotePacket" -> Seq(
+        "Offset" -> Seq(
+          "checksum" -> packet.Offset.checksum,
+          "indicator" -> packet.Offset.indicator,
+          "typeOfThePacket" -> packet.Offset.typeOfThePacket,
+          "requestedActionOfThePacket" -> packet.Offset.requestedActionOfThePacket,
+          "startOfDataBuffer" -> packet.Offset.startOfDataBuffer
+        ),
+        "Width" -> Seq(
+          "Checksum" -> packet.Checksum.getWidth,
+          "Indicator" -> packet.Indicator.getWidth,
+          "TypeOfThePacket" -> packet.TypeOfThePacket.getWidth,
+          "RequestedActionOfThePacket" -> packet.RequestedActionOfThePacket.getWidth
+        )
+      ),
+      "INDICATOR_OF_HYPERDBG_PACKET" -> HyperDbgSharedConstants.INDICATOR_OF_HYPERDBG_PACKET,
+      "DebuggerRemotePacketType" -> enumValues(DebuggerRemotePacketType),
+      "HwdbgActionEnums" -> enumValues(HwdbgActionEnums),
+      "HwdbgResponseEnums" -> enumValues(HwdbgResponseEnums),
+      "HwdbgErrorEnums" -> enumValues(HwdbgErrorEnums)
+    )
+
+    toJson(manifest, 0) + "\n"
+  }
+
+  /**
+   * @brief
+   *   Write the manifest to the directory of the generated files
+   */
+  def write(directory: String = DebuggerConfigurations.GENERATED_FILES_DIRECTORY): Unit = {
+
+    val file = new File(directory, MANIFEST_FILE_NAME)
+    file.getParentFile.mkdirs()
+
+    val writer = new PrintWriter(file)
+    try {
+      writer.write(content)
+    } finally {
+      writer.close()
+    }
+  }
+}
@@ -20,6 +20,7 @@ import circt.stage.ChiselStage
 
 import hwdbg._
 import hwdbg.configs._
+import hwdbg.utils._
 
 class DebuggerModule(
     debug: Boolean = DebuggerConfigurations.ENABLE_DEBUG,
@@ -107,8 +108,13 @@ object Main extends App {
         // "-strip-debug-info",
         "--split-verilog", // The intention for this argument (and next argument) is to separate generated files.
         "-o",
-        "generated/"
+        DebuggerConfigurations.GENERATED_FILES_DIRECTORY
       )
     )
   )
+
+  //
+  // Generate the layout manifest (used by the simulation harness)
+  //
+  LayoutManifest.write(DebuggerConfigurations.GENERATED_FILES_DIRECTORY)
 }
@@ -20,6 +20,7 @@ import circt.stage.ChiselStage
 
 import hwdbg._
 import hwdbg.configs._
+import hwdbg.utils._
 import hwdbg.libs.mem._
 
 class DebuggerModuleTestingBRAM(
@@ -140,8 +141,13 @@ object MainWithInitializedBRAM extends App {
         "--lowering-options=disallowLocalVariables", // because icarus doesn't support 'automatic logic', this option prevents such logics
         "--split-verilog", // The intention for this argument (and next argument) is to separate generated files.
         "-o",
-        "generated/"
+        DebuggerConfigurations.GENERATED_FILES_DIRECTORY
       )
     )
   )
+
+  //
+  // Generate the layout manifest (used by the simulation harness)
+  //
+  LayoutManifest.write(DebuggerConfigurations.GENERATED_FILES_DIRECTORY)
 }
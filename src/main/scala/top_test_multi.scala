@@ -0,0 +1,126 @@
+/**
+ * @file
+ *   top_test_multi.scala
+ * @author
+ *   Sina Karvandi (sina@hyperdbg.org)
+ * @brief
+ *   hwdbg's top module with multiple debugger cores (each with its own BRAM) for testing
+ * @details
+ *   Each core is an independent DebuggerModuleTestingBRAM (named core_N), so the cores
+ *   are simulated (and driven by their own PS drivers) in one simulator process
+ * @version 0.1
+ * @date
+ *   2026-10-19
+ *
+ * @copyright
+ *   This project is released under the GNU Public License v3.
+ */
+package hwdbg
+
+import chisel3._
+import circt.stage.ChiselStage
+
+import hwdbg._
+import hwdbg.configs._
+import hwdbg.utils._
+
+class DebuggerModuleTestingBRAMMulti(
+    numberOfInstances: Int = TestingConfigurations.NUMBER_OF_INSTANCES,
+    debug: Boolean = DebuggerConfigurations.ENABLE_DEBUG,
+    numberOfPins: Int = DebuggerConfigurations.NUMBER_OF_PINS,
+    maximumNumberOfStages: Int = ScriptEngineConfigurations.MAXIMUM_NUMBER_OF_STAGES,
+    maximumNumberOfSupportedScriptOperators: Int = ScriptEngineConfigurations.MAXIMUM_NUMBER_OF_SUPPORTED_OPERATORS,
+    bramAddrWidth: Int = DebuggerConfigurations.BLOCK_RAM_ADDR_WIDTH,
+    bramDataWidth: Int = DebuggerConfigurations.BLOCK_RAM_DATA_WIDTH,
+    portsConfiguration: Map[Int, Int] = DebuggerPorts.PORT_PINS_MAP
+) extends Module {
+  val io = IO(new Bundle {
+
+    //
+    // Signals of each core (io_cores_N_*)
+    //
+    val cores = Vec(
+      numberOfInstances,
+      new Bundle {
+
+        //
+        // Chip signals
+        //
+        val en = Input(Bool()) // chip enable signal
+
+        //
+        // Input/Output signals
+        //
+        val inputPin = Input(Vec(numberOfPins, UInt(1.W))) // input pins
+        val outputPin = Output(Vec(numberOfPins, UInt(1.W))) // output pins
+
+        //
+        // Interrupt signals (lines)
+        //
+        val plInSignal = Input(Bool()) // PS to PL signal
+        val psOutInterrupt = Output(Bool()) // PL to PS interrupt
+      }
+    )
+  })
+
+  for (i <- 0 until numberOfInstances) {
+
+    //
+    // Instantiate the debugger core (with its BRAM)
+    //
+    val core = Module(
+      new DebuggerModuleTestingBRAM(
+        debug,
+        numberOfPins,
+        maximumNumberOfStages,
+        maximumNumberOfSupportedScriptOperators,
+        bramAddrWidth,
+        bramDataWidth,
+        portsConfiguration
+      )
+    ).suggestName(s"core_$i")
+
+    //
+    // Connect I/O pins of the core
+    //
+    core.io.en := io.cores(i).en
+    core.io.inputPin := io.cores(i).inputPin
+    core.io.plInSignal := io.cores(i).plInSignal
+
+    io.cores(i).outputPin := core.io.outputPin
+    io.cores(i).psOutInterrupt := core.io.psOutInterrupt
+  }
+}
+
+object MainWithMultipleInitializedBRAM extends App {
+
+  //
+  // Generate hwdbg verilog files
+  //
+  println(
+    ChiselStage.emitSystemVerilog(
+      new DebuggerModuleTestingBRAMMulti(
+        TestingConfigurations.NUMBER_OF_INSTANCES,
+        DebuggerConfigurations.ENABLE_DEBUG,
+        DebuggerConfigurations.NUMBER_OF_PINS,
+        ScriptEngineConfigurations.MAXIMUM_NUMBER_OF_STAGES,
+        ScriptEngineConfigurations.MAXIMUM_NUMBER_OF_SUPPORTED_OPERATORS,
+        DebuggerConfigurations.BLOCK_RAM_ADDR_WIDTH,
+        DebuggerConfigurations.BLOCK_RAM_DATA_WIDTH,
+        DebuggerPorts.PORT_PINS_MAP
+      ),
+      firtoolOpts = Array(
+        "-disable-all-randomization",
+        "--lowering-options=disallowLocalVariables", // because icarus doesn't support 'automatic logic', this option prevents such logics
+        "--split-verilog", // The intention for this argument (and next argument) is to separate generated files.
+        "-o",
+        DebuggerConfigurations.GENERATED_FILES_DIRECTORY
+      )
+    )
+  )
+
+  //
+  // Generate the layout manifest (used by the simulation harness)
+  //
+  LayoutManifest.write(DebuggerConfigurations.GENERATED_FILES_DIRECTORY)
+}